@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark time-to-first-detection of the motion recorder from a cold process start.
+
+Runs motion_recording.py headless for a single frame several times and reports the
+median time (ms since process start) of each startup milestone.
+
+Usage:
+    python bench_startup.py --source 0 --backend dshow --runs 5
+    python bench_startup.py --source sample.mp4
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "motion_recording.py")
+MILESTONES = ("imports", "camera_open", "first_frame", "first_detection")
+
+
+def run_once(source, backend):
+    fd, report = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = [sys.executable, SCRIPT, "--no-windows", "--duration", "0",
+               "--source", str(source), "--backend", backend, "--startup-report", report]
+        subprocess.run(cmd, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(report, "r", encoding="utf-8") as fp:
+            content = fp.read()
+        return json.loads(content) if content else {}
+    finally:
+        os.remove(report)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--source", default="0", help="Camera index or video file (default 0)")
+    p.add_argument("--backend", default="any", help="Backend passed to motion_recording.py (default any)")
+    p.add_argument("--runs", type=int, default=5, help="Number of cold starts (default 5)")
+    args = p.parse_args()
+
+    results = [run_once(args.source, args.backend) for _ in range(args.runs)]
+    print(f"Startup benchmark: source={args.source} backend={args.backend} runs={args.runs}")
+    for name in MILESTONES:
+        values = [r[name] * 1000 for r in results if name in r]
+        if not values:
+            print(f"  {name:16s} not reached")
+            continue
+        print(f"  {name:16s} median={statistics.median(values):8.1f}ms  max={max(values):8.1f}ms  (n={len(values)})")
+    return 0 if all("first_detection" in r for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import logging
+import os
+import time
+
+import cv2
+
+try:
+    from .segments import SegmentedRecorder
+except ImportError:  # run as a script from this folder
+    from segments import SegmentedRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class ContinuousRecorder:
+    """Low-resolution, low-fps rolling recording that runs alongside the event clips.
+
+    `offer(proc)` is called with every preprocessed frame (the gray, lightly blurred and
+    possibly downscaled frame the detector sees), so the stream costs no extra color
+    conversion. At most `fps` frames per second are kept, downscaled to `width` if still
+    wider, and written as gray `segment_seconds`-long segments through SegmentedRecorder
+    into <root>/<dd_mm_yyyy>/ (one manifest per day and recorder run).
+
+    Storage is bounded: every `check_interval` seconds, finished segments older than
+    `keep_days`, then the oldest ones while the folder exceeds `max_mb`, are deleted.
+    `stats()` reports frames, bytes on disk and the time/CPU spent encoding.
+    """
+
+    def __init__(self, root, fps=2.0, width=320, segment_seconds=300, max_mb=2048, keep_days=7.0,
+                 fourcc="mp4v", closer=None, check_interval=60.0):
+        self.root = root
+        self.fps = fps
+        self.width = width
+        self.segment_seconds = segment_seconds
+        self.max_bytes = max_mb * 1024 * 1024 if max_mb else None
+        self.keep_days = keep_days
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.closer = closer
+        self.check_interval = check_interval
+        self.frame_size = None
+        self.frames = 0
+        self.bytes_on_disk = 0
+        self.deleted = 0
+        self._recorder = None
+        self._day = None
+        self._next_frame = 0.0
+        self._next_check = 0.0
+        self._started = time.monotonic()
+        self._encode_wall = 0.0
+        self._encode_cpu = 0.0
+
+    def offer(self, proc):
+        """Write `proc` if the stream is due for a frame. Returns True if written."""
+        now = time.monotonic()
+        if now < self._next_frame:
+            return False
+        # Stay on the fps grid, but don't try to catch up after a stall
+        self._next_frame = max(self._next_frame + 1.0 / self.fps, now)
+
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        if self.frame_size is None:
+            h, w = proc.shape[:2]
+            scale = min(1.0, self.width / float(w)) if self.width else 1.0
+            # Even dimensions keep every codec happy
+            self.frame_size = (max(2, int(w * scale) // 2 * 2), max(2, int(h * scale) // 2 * 2))
+        if (proc.shape[1], proc.shape[0]) != self.frame_size:
+            proc = cv2.resize(proc, self.frame_size, interpolation=cv2.INTER_AREA)
+        day = time.strftime("%d_%m_%Y")
+        if self._recorder is None or day != self._day:
+            self._start_recorder(day)
+        self._recorder.write(proc)
+        self._encode_wall += time.perf_counter() - wall0
+        self._encode_cpu += time.thread_time() - cpu0
+        self.frames += 1
+
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.enforce_limits()
+        return True
+
+    def _start_recorder(self, day):
+        if self._recorder is not None:
+            self._recorder.release()
+        self._day = day
+        folder = os.path.join(self.root, day)
+        self._recorder = SegmentedRecorder(folder, time.strftime("%H-%M-%S"), self.fourcc, self.fps, self.frame_size,
+                                           segment_seconds=self.segment_seconds, closer=self.closer, max_peaks=0,
+                                           is_color=False)
+        logger.info("Continuous stream %dx%d @ %.1f fps -> %s", self.frame_size[0], self.frame_size[1], self.fps,
+                    self._recorder.manifest_path)
+
+    def _active_segment(self):
+        if self._recorder is None or not self._recorder.manifest["segments"]:
+            return None
+        return os.path.normpath(os.path.join(self._recorder.folder, self._recorder.manifest["segments"][-1]["file"]))
+
+    def enforce_limits(self):
+        """Delete old segments per keep_days / max_mb and refresh `bytes_on_disk`."""
+        segments = []
+        try:
+            with os.scandir(self.root) as days:
+                for day in days:
+                    if not day.is_dir():
+                        continue
+                    with os.scandir(day.path) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(".mp4") and entry.is_file():
+                                st = entry.stat()
+                                segments.append((st.st_mtime, st.st_size, os.path.normpath(entry.path)))
+        except OSError:
+            return
+        segments.sort()
+        total = sum(size for _, size, _ in segments)
+        cutoff = time.time() - self.keep_days * 86400 if self.keep_days else None
+        active = self._active_segment()
+        emptied = set()
+        for mtime, size, path in segments:  # oldest first
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_big):
+                break
+            if path == active:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.deleted += 1
+            emptied.add(os.path.dirname(path))
+        for folder in emptied:
+            self._remove_if_done(folder)
+        self.bytes_on_disk = total
+
+    def _remove_if_done(self, folder):
+        """Remove a day folder whose segments are all gone (its manifests describe nothing left)."""
+        if self._recorder is not None and os.path.normpath(self._recorder.folder) == folder:
+            return
+        try:
+            if any(name.endswith(".mp4") for name in os.listdir(folder)):
+                return
+            for name in os.listdir(folder):
+                os.remove(os.path.join(folder, name))
+            os.rmdir(folder)
+        except OSError:
+            pass
+
+    def stats(self):
+        elapsed = time.monotonic() - self._started
+        return {
+            "frames": self.frames,
+            "frame_size": list(self.frame_size) if self.frame_size else None,
+            "fps": self.fps,
+            "bytes_on_disk": self.bytes_on_disk,
+            "deleted_segments": self.deleted,
+            "encode_ms": round(self._encode_wall * 1000.0 / self.frames, 2) if self.frames else None,
+            "encode_cpu_percent": round(self._encode_cpu * 100.0 / elapsed, 2) if elapsed > 0 else None,
+        }
+
+    def summary(self):
+        s = self.stats()
+        encode = f"{s['encode_ms']:.1f}ms/frame" if s["encode_ms"] is not None else "n/a"
+        return (f"frames={s['frames']} on_disk={s['bytes_on_disk'] / (1024 * 1024):.1f}MB "
+                f"deleted={s['deleted_segments']} encode={encode} cpu={s['encode_cpu_percent']:.2f}%")
+
+    def release(self):
+        """Finalize the active segment (in the background) and apply the limits once more."""
+        if self._recorder is not None:
+            self._recorder.release()
+            self._recorder = None
+        self.enforce_limits()
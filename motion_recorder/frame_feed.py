@@ -0,0 +1,240 @@
+"""Publish the recorder's latest frame through shared memory for other local processes.
+
+Only one process can reliably hold a USB camera (DirectShow often refuses a second
+open), so the recorder owns the device and publishes every frame it reads into a named
+shared-memory block. Readers such as the health monitor attach by name and copy out the
+newest frame; they never touch the device.
+
+Layout: a fixed header, a JSON stats area and the raw frame bytes. The header's
+sequence number is a seqlock: odd while the writer is mid-update, even afterwards.
+A reader retries if the sequence was odd or changed while it copied, so it never
+returns a torn frame. Frame number = sequence // 2.
+"""
+
+import json
+import logging
+import os
+import re
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CMFF"
+VERSION = 1
+# magic, version, reserved, seq, timestamp, pid, width, height, channels, stats_len
+HEADER = struct.Struct("<4sHHQdIIIII")
+STATS_SIZE = 1024
+DATA_OFFSET = 1088  # header + stats area, rounded up to a 64-byte boundary
+SEQ_OFFSET = 8
+
+
+def default_feed_name(source) -> str:
+    """Shared-memory name used for a capture source unless one is given."""
+    return "camera_feed_" + re.sub(r"[^A-Za-z0-9_.-]", "_", str(source))
+
+
+class FeedFrame(NamedTuple):
+    seq: int
+    timestamp: float  # time.time() when the recorder read the frame
+    frame: np.ndarray
+    stats: dict
+    pid: int
+
+    @property
+    def number(self) -> int:
+        return self.seq // 2
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class FramePublisher:
+    """Writer side: `publish(frame, stats)` after every read. One publisher per name.
+
+    The block is created on the first publish, sized for that frame (or `max_bytes`),
+    and recreated if a larger frame arrives. A block left under the same name (a
+    previous recorder run, still mapped by a reader on Windows where it can't be
+    unlinked) is reused when it is big enough, continuing its sequence so attached
+    readers keep working. `publish()` never raises; if no usable block can be had,
+    publishing is disabled with a warning. `close()` removes the block.
+    """
+
+    def __init__(self, name: str, max_bytes: int | None = None) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.published = 0
+        self._shm = None
+        self._data = None
+        self._seq = 0
+        self.disabled = False
+
+    def _create(self, nbytes: int) -> bool:
+        self.close()
+        size = DATA_OFFSET + max(nbytes, self.max_bytes or 0)
+        seq = 0
+        try:
+            shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            shm = self._take_over(size)
+            if shm is None:
+                return False
+            # Carry on from the old sequence (rounded up to even) so readers see newer frames
+            seq = struct.unpack_from("<Q", shm.buf, SEQ_OFFSET)[0] if bytes(shm.buf[:4]) == MAGIC else 0
+            seq += seq % 2
+        self._shm = shm
+        self._data = np.ndarray((shm.size - DATA_OFFSET,), dtype=np.uint8, buffer=shm.buf, offset=DATA_OFFSET)
+        self._seq = seq
+        logger.info("Publishing frames to shared memory '%s' (%d KB)", self.name, shm.size // 1024)
+        return True
+
+    def _take_over(self, size: int):
+        """Reuse a block left under our name if it fits, else replace it (POSIX only)."""
+        try:
+            existing = shared_memory.SharedMemory(name=self.name)
+        except (FileNotFoundError, OSError, ValueError):
+            existing = None
+        if existing is not None:
+            if existing.size >= size:
+                return existing
+            existing.close()
+            try:
+                existing.unlink()  # no-op on Windows, where the mapping lives while anyone holds it
+            except OSError:
+                pass
+        try:
+            return shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except (FileExistsError, OSError) as e:
+            logger.warning("Frame feed '%s' is held by another process and too small for %d KB frames (%s); "
+                           "not publishing", self.name, size // 1024, e)
+            return None
+
+    def publish(self, frame: np.ndarray, stats: dict | None = None) -> bool:
+        """Copy `frame` (HxW or HxWxC uint8) and `stats` into the block. Returns False if skipped."""
+        if self.disabled or frame is None or frame.dtype != np.uint8:
+            return False
+        try:
+            return self._publish(frame, stats)
+        except Exception as e:
+            # A feed problem must never stop the capture loop
+            logger.warning("Disabling frame feed '%s': %s", self.name, e)
+            self.disabled = True
+            self.close()
+            return False
+
+    def _publish(self, frame: np.ndarray, stats: dict | None) -> bool:
+        if self._shm is None or frame.nbytes > self._data.nbytes:
+            if not self._create(frame.nbytes):
+                self.disabled = True
+                return False
+        stats_bytes = json.dumps(stats or {}, default=str).encode("utf-8")
+        if len(stats_bytes) > STATS_SIZE:
+            stats_bytes = b"{}"
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        buf = self._shm.buf
+
+        self._seq += 1  # odd: update in progress
+        struct.pack_into("<Q", buf, SEQ_OFFSET, self._seq)
+        self._data[:frame.nbytes] = np.ascontiguousarray(frame).reshape(-1)
+        buf[HEADER.size:HEADER.size + len(stats_bytes)] = stats_bytes
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, 0, self._seq, time.time(), os.getpid(),
+                         width, height, channels, len(stats_bytes))
+        self._seq += 1  # even: complete; written last so readers never pair it with old fields
+        struct.pack_into("<Q", buf, SEQ_OFFSET, self._seq)
+        self.published += 1
+        return True
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self._data = None
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except (OSError, BufferError):
+            pass
+        self._shm = None
+
+
+class FrameFeedReader:
+    """Reader side: attach to a published feed by name and copy out frames."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._shm = None
+
+    def attach(self) -> bool:
+        """Map the block if it exists and carries a valid header. Safe to call repeatedly."""
+        if self._shm is not None:
+            return True
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except (FileNotFoundError, OSError, ValueError):
+            return False
+        if os.name == "posix":
+            # The resource tracker would otherwise unlink the publisher's block when we exit
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        if shm.size < DATA_OFFSET or bytes(shm.buf[:4]) != MAGIC:
+            shm.close()
+            return False
+        self._shm = shm
+        return True
+
+    def header(self) -> dict | None:
+        """Current header fields without copying the frame, or None if not attached."""
+        if self._shm is None:
+            return None
+        magic, version, _, seq, timestamp, pid, width, height, channels, _ = HEADER.unpack_from(self._shm.buf, 0)
+        return {"seq": seq, "timestamp": timestamp, "pid": pid, "width": width, "height": height,
+                "channels": channels, "version": version}
+
+    def current_seq(self) -> int:
+        return struct.unpack_from("<Q", self._shm.buf, SEQ_OFFSET)[0] if self._shm is not None else 0
+
+    def read(self, after_seq: int = 0, timeout: float = 1.0) -> FeedFrame | None:
+        """Return the newest frame with a sequence number above `after_seq`.
+
+        Polls until one is published or `timeout` seconds pass (None on timeout, or if
+        the feed is not attached).
+        """
+        if self._shm is None:
+            return None
+        deadline = time.monotonic() + timeout
+        buf = self._shm.buf
+        while True:
+            seq = self.current_seq()
+            if seq % 2 == 0 and seq > after_seq:
+                _, _, _, _, timestamp, pid, width, height, channels, stats_len = HEADER.unpack_from(buf, 0)
+                nbytes = width * height * channels
+                if DATA_OFFSET + nbytes <= self._shm.size:
+                    data = np.frombuffer(buf, dtype=np.uint8, count=nbytes, offset=DATA_OFFSET).copy()
+                    stats_bytes = bytes(buf[HEADER.size:HEADER.size + stats_len])
+                    if self.current_seq() == seq:
+                        shape = (height, width, channels) if channels > 1 else (height, width)
+                        try:
+                            stats = json.loads(stats_bytes) if stats_bytes else {}
+                        except ValueError:
+                            stats = {}
+                        return FeedFrame(seq, timestamp, data.reshape(shape), stats, pid)
+                    continue  # overwritten while copying; retry at once
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.005)
+
+    def close(self) -> None:
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                pass
+            self._shm = None
@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _optional_width(value):
+    # TOML has no null, so 0 also means "process at native resolution"
+    if value is None or int(value) == 0:
+        return None
+    return int(value)
+
+
+# Settings that capture_video can change at a frame boundary, with their converters
+RELOADABLE = {
+    "thresh": int,
+    "min_area": int,
+    "min_frames": int,
+    "width": _optional_width,
+    "record_delay": float,
+    "segment_seconds": float,
+}
+
+# Zero would mean "record on a single noisy frame" / "a new segment every frame"
+POSITIVE = {"min_frames", "segment_seconds"}
+
+# Narrower processing widths round the frame height down to nothing and crash cv2.resize
+MIN_WIDTH = 16
+
+
+def load_config(path):
+    """Read a JSON or TOML (by extension) config file into a dict."""
+    if path.lower().endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as fp:
+            return tomllib.load(fp)
+    with open(path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def validate(raw):
+    """Return only the known settings from `raw`, converted to their types.
+
+    Raises ValueError on a bad value so a half-edited file never reaches the loop.
+    """
+    values = {}
+    for key, value in raw.items():
+        key = key.replace("-", "_")
+        if key not in RELOADABLE:
+            logger.warning("Ignoring unknown config key: %s", key)
+            continue
+        try:
+            values[key] = RELOADABLE[key](value)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid value for {key}: {value!r}")
+        if values[key] is not None and values[key] < 0:
+            raise ValueError(f"{key} must not be negative")
+        if key in POSITIVE and values[key] <= 0:
+            raise ValueError(f"{key} must be positive, got {value!r}")
+        if key == "width" and values[key] is not None and values[key] < MIN_WIDTH:
+            raise ValueError(f"width must be 0 (full resolution) or at least {MIN_WIDTH}, got {value!r}")
+    return values
+
+
+class ConfigWatcher:
+    """Poll a config file's mtime and return new settings when it changes.
+
+    `poll()` is meant to be called every frame; it only touches the filesystem once per
+    `poll_interval` seconds and only parses the file when its mtime or size changed.
+    """
+
+    def __init__(self, path, poll_interval=1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._next_check = 0.0
+        self._signature = None
+        self.current = {}
+
+    def poll(self):
+        """Return a dict of changed settings, or None if nothing changed."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.poll_interval
+
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return None
+        self._signature = signature
+
+        try:
+            values = validate(load_config(self.path))
+        except Exception as e:
+            logger.warning("Config reload from %s failed, keeping current settings: %s", self.path, e)
+            return None
+
+        changed = {k: v for k, v in values.items() if self.current.get(k, object()) != v}
+        self.current.update(values)
+        return changed or None
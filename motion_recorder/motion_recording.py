@@ -1,11 +1,39 @@
 import time
+
+try:
+    from .startup_timing import StartupTimer
+except ImportError:  # run as a script from this folder
+    from startup_timing import StartupTimer
+
+# Counts from process creation; also created before the heavy imports so the
+# import-time fallback (no psutil) still includes them
+startup = StartupTimer()
+
 import argparse
+import importlib
 import logging
 import os
 import signal
+import sys
 from pathlib import Path
 
+# Media Foundation's hardware transforms make camera open take seconds on many devices;
+# must be set before cv2 is imported
+os.environ.setdefault("OPENCV_VIDEOIO_MSMF_ENABLE_HW_TRANSFORMS", "0")
+
 import cv2
+import numpy as np
+
+try:
+    from .continuous import ContinuousRecorder
+    from .frame_feed import FramePublisher, default_feed_name
+    from .segments import SegmentedRecorder, default_closer
+except ImportError:  # run as a script from this folder
+    from continuous import ContinuousRecorder
+    from frame_feed import FramePublisher, default_feed_name
+    from segments import SegmentedRecorder, default_closer
+
+startup.mark("imports")
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +54,23 @@ signal.signal(signal.SIGINT, signal_handler)  # Ctrl+C
 signal.signal(signal.SIGTERM, signal_handler)  # Termination signal
 
 
+def _monitor_module(name):
+    """Import a module shared with the health monitor (ptz_camera_health_check)."""
+    try:
+        return importlib.import_module(f"ptz_camera_health_check.{name}")
+    except ImportError:  # run as a script from this folder
+        monitor_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ptz_camera_health_check")
+        if monitor_dir not in sys.path:
+            sys.path.append(monitor_dir)
+        return importlib.import_module(name)
+
+
+FrameClock = _monitor_module("frame_clock").FrameClock
+
+# Seconds between "Capture timing" log lines
+TIMING_LOG_INTERVAL = 60.0
+
+
 def preprocess(frame, width=None, blur_ksize=(5, 5)):
     """Resize (optional), convert to gray and blur to reduce noise."""
     if width is not None:
@@ -57,17 +102,121 @@ def detect_motion(prev_frame, curr_frame, thresh_val=15, min_area=500):
     return len(large_contours) > 0, diff, thresh, large_contours
 
 
-def capture_video(source=0, duration=None, show_windows=True, min_area=500, width=None, thresh=15, min_frames=2):
+def detect_motion_batch(frames, thresh_val=15, min_area=500):
+    """Vectorized `detect_motion` over a stack of preprocessed frames.
+
+    `frames` is an (N, H, W) uint8 array (e.g. `preprocess` output stacked with np.stack).
+    Frame i is compared with frame i-1, so entry 0 never reports motion. Results match
+    calling `detect_motion` on every consecutive pair.
+
+    Returns (motion_flags, changed_pixels, boxes):
+    - motion_flags: (N,) bool array
+    - changed_pixels: (N,) int array of pixels over the threshold, before filtering
+    - boxes: list of N lists of (x, y, w, h) for regions with area >= min_area
+
+    Consecutive pairs are diffed, thresholded, filtered and contoured in chunks laid out
+    as one tall image, with padding rows between frames so regions never bleed across
+    frames, instead of paying per-frame Python and call overhead.
+    """
+    frames = np.ascontiguousarray(frames, dtype=np.uint8)
+    if frames.ndim != 3:
+        raise ValueError(f"expected an (N, H, W) stack, got shape {frames.shape}")
+    n, h, w = frames.shape
+    motion_flags = np.zeros(n, dtype=bool)
+    changed_pixels = np.zeros(n, dtype=np.int64)
+    boxes = [[] for _ in range(n)]
+    if n < 2:
+        return motion_flags, changed_pixels, boxes
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+    # detect_motion opens (erode + dilate) then dilates twice; the pad only needs to
+    # separate frames and cover the 2-row kernel radius since it is cleared between steps
+    pad = 4
+    stride = h + pad
+    # Keep each tall image around 4 MP so it stays cache friendly
+    chunk = max(1, (4 * 1024 * 1024) // (stride * w))
+
+    for first in range(1, n, chunk):
+        last = min(n, first + chunk)
+        count = last - first
+        diff = cv2.absdiff(frames[first:last].reshape(-1, w), frames[first - 1:last - 1].reshape(-1, w))
+        _, mask = cv2.threshold(diff, thresh_val, 255, cv2.THRESH_BINARY)
+        mask = mask.reshape(count, h, w)
+        changed_pixels[first:last] = mask.reshape(count, -1).sum(axis=1, dtype=np.int64) // 255
+
+        # Erosion treats pixels outside a frame as set and dilation treats them as unset,
+        # so the pad is 255 for the erode and cleared after every step to clip like a frame
+        tall = np.full((count, stride, w), 255, dtype=np.uint8)
+        tall[:, :h] = mask
+        tall = cv2.erode(tall.reshape(-1, w), kernel).reshape(count, stride, w)
+        for _ in range(3):
+            tall[:, h:] = 0
+            tall = cv2.dilate(tall.reshape(-1, w), kernel).reshape(count, stride, w)
+        tall[:, h:] = 0
+
+        contours, _ = cv2.findContours(tall.reshape(-1, w), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for c in contours:
+            if cv2.contourArea(c) < min_area:
+                continue
+            x, y, bw, bh = cv2.boundingRect(c)
+            i = first + y // stride
+            boxes[i].append((x, y % stride, bw, bh))
+            motion_flags[i] = True
+    return motion_flags, changed_pixels, boxes
+
+
+def capture_video(source=0, duration=None, show_windows=True, min_area=500, width=None, thresh=15, min_frames=2,
+                  segment_seconds=30, postprocessor=None, record_delay=20, config_path=None, backend=None,
+                  capture_backend=None, publish_feed=None, telemetry=None, continuous=None):
     """Capture from `source` for `duration` seconds (None = until 'q').
 
-    Draws a red dot when motion is detected, blue otherwise. Returns True on normal exit.
+    Draws a red dot when motion is detected, blue otherwise. Each motion event is written
+    as `segment_seconds`-long mp4 segments listed in a JSON manifest, so a forced kill
+    loses at most the active segment. Finished events are handed to `postprocessor`
+    (a `PostProcessor`) when one is given.
+
+    If `config_path` names a JSON/TOML file, it is polled for changes to thresh, min_area,
+    min_frames, width, record_delay and segment_seconds, which are applied between frames
+    without reopening the camera. `backend` is an optional cv2.CAP_* API preference.
+    `capture_backend` is any object with `open(source, api)` returning a
+    cv2.VideoCapture-like handle (e.g. a FakeBackend for headless tests); by default
+    cv2.VideoCapture is used.
+
+    With `publish_feed` (a shared-memory name), every frame is published, undrawn, with
+    capture stats so the health monitor can check it without opening the device.
+
+    `continuous` (a `ContinuousRecorder`) is offered every preprocessed frame and keeps a
+    low-resolution, low-fps recording of everything, events or not; its storage and
+    encode cost are logged with the capture timing.
+
+    `telemetry` (a `ProcessTelemetry`) is polled every frame; its samples are logged and
+    published with the feed stats, and capture stops as on shutdown once it requests a
+    restart (the caller restarts the process after cleaning up).
+
+    Every frame read gets a capture timestamp and sequence number on a `FrameClock`;
+    dropped frames, fps and inter-frame jitter are logged every minute and at the end
+    ("Capture timing:") and published with the feed stats.
+
+    Startup milestones (camera open, first frame, first detection) are recorded on the
+    module-level `startup` timer and logged once. Returns True on normal exit.
     """
-    cap = cv2.VideoCapture(source)
+    if capture_backend is not None:
+        cap = capture_backend.open(source, backend)
+    else:
+        cap = cv2.VideoCapture(source) if backend is None else cv2.VideoCapture(source, backend)
     if not cap.isOpened():
         logger.error("Failed to open video source: %s", source)
         return False
+    startup.mark("camera_open")
 
-    motion_recording_delay = 20  # seconds to keep recording after motion stops
+    motion_recording_delay = record_delay  # seconds to keep recording after motion stops
+    watcher = None
+    if config_path:
+        try:
+            from .live_config import ConfigWatcher
+        except ImportError:  # run as a script from this folder
+            from live_config import ConfigWatcher
+        watcher = ConfigWatcher(config_path)
 
     # Get the default frame width and height
     frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -83,6 +232,19 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
         logger.error("No frames available from source %s", source)
         cap.release()
         return False
+    startup.mark("first_frame")
+
+    # Capture timestamp (CAP_PROP_POS_MSEC when the backend has it), sequence number and drops per frame
+    clock = FrameClock(cap.get(cv2.CAP_PROP_FPS))
+    stamp = clock.stamp(cap)
+    timing = clock.metrics()
+    next_timing = time.monotonic() + 1.0
+    next_timing_log = time.monotonic() + TIMING_LOG_INTERVAL
+
+    publisher = FramePublisher(publish_feed) if publish_feed else None
+    if publisher is not None:
+        publisher.publish(frame, {"source": str(source), "frames": clock.frames, "seq": stamp.seq,
+                                  "motion": False, "recording": False})
 
     prev = preprocess(frame, width=width)
 
@@ -100,13 +262,60 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
     file_time = None
 
     while True:
+        # Apply config file changes at a frame boundary; the capture handle stays open
+        changes = watcher.poll() if watcher is not None else None
+        if changes:
+            thresh = changes.get("thresh", thresh)
+            min_area = changes.get("min_area", min_area)
+            min_frames = changes.get("min_frames", min_frames)
+            width = changes.get("width", width)
+            motion_recording_delay = changes.get("record_delay", motion_recording_delay)
+            segment_seconds = changes.get("segment_seconds", segment_seconds)
+            if out is not None:
+                out.segment_seconds = segment_seconds
+            logger.info(f"Applied config changes from {config_path}: {changes}")
+
         ret, frame = cap.read()
         if not ret or frame is None:
             logger.warning("Frame read failed; stopping capture")
             break
+        stamp = clock.stamp(cap)
+        if stamp.dropped:
+            logger.debug("Dropped %d frame(s) before frame %d", stamp.dropped, stamp.seq)
+        now_mono = time.monotonic()
+        if now_mono >= next_timing:
+            timing = clock.metrics()
+            next_timing = now_mono + 1.0
+            if now_mono >= next_timing_log:
+                logger.info("Capture timing: %s", clock.summary())
+                if continuous is not None:
+                    logger.info("Continuous stream: %s", continuous.summary())
+                next_timing_log = now_mono + TIMING_LOG_INTERVAL
+        if telemetry is not None and telemetry.poll() is not None:
+            logger.info("Process %s", telemetry.summary())
+            if telemetry.restart_reason:
+                logger.warning("Resource limit crossed (%s); stopping capture to restart", telemetry.restart_reason)
+                break
+        if publisher is not None:
+            # Before anything is drawn on the frame
+            publisher.publish(frame, {"source": str(source), "frames": clock.frames, "seq": stamp.seq,
+                                      "fps": timing["fps"], "dropped": clock.dropped,
+                                      "drop_rate": timing["drop_rate"], "jitter_ms": timing["jitter_ms"],
+                                      "motion": motion_streak >= min_frames, "recording": out is not None,
+                                      "process": telemetry.last if telemetry is not None else None,
+                                      "continuous_mb": round(continuous.bytes_on_disk / (1024 * 1024), 1)
+                                      if continuous is not None else None})
 
         proc = preprocess(frame, width=width)
+        if continuous is not None:
+            continuous.offer(proc)
+        if proc.shape != prev.shape:
+            # Processing width changed; restart the diff from this frame
+            prev = proc
         motion, diff, thresh_img, contours = detect_motion(prev, proc, thresh_val=thresh, min_area=min_area)
+        if "first_detection" not in startup.marks:
+            startup.mark("first_detection")
+            logger.info("Startup timing: %s", startup.summary())
 
         # temporal debounce to stabilize jittery contours
         motion_streak = motion_streak + 1 if motion else 0
@@ -125,9 +334,10 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
                 todays_folder = time.strftime("%d_%m_%Y")
                 video_export_folder = f'D:/motion_captures/{todays_folder}'
                 os.makedirs(video_export_folder, exist_ok=True)
-                export_file_path = f'{video_export_folder}/{file_time}.mp4'
-                out = cv2.VideoWriter(export_file_path, fourcc, 20.0, (frame_width, frame_height))
-                logger.info(f"Motion detected, started recording to {export_file_path}")
+                out = SegmentedRecorder(video_export_folder, file_time, fourcc, 20.0, (frame_width, frame_height),
+                                        segment_seconds=segment_seconds,
+                                        on_complete=postprocessor.submit if postprocessor is not None else None)
+                logger.info(f"Motion detected, started recording event {out.manifest_path}")
 
             # Draw bounding boxes
             for c in contours:
@@ -142,7 +352,7 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
             if out is not None:
                 out.release()
                 logger.info(
-                f"No motion for {str(motion_recording_delay)}s, stopped recording, file saved at: {export_file_path if 'export_file_path' in locals() else 'unknown'}")
+                f"No motion for {str(motion_recording_delay)}s, stopped recording, manifest saved at: {out.manifest_path}")
             file_time = None
             out = None
 
@@ -154,7 +364,7 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
             text_string = f"{date_code} {time_code}"
             cv2.putText(frame, text_string, (frame.shape[1] - 125, frame.shape[0] - 30),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1)
-            out.write(frame)
+            out.write(frame, score=cv2.countNonZero(thresh_img) if motion else 0)
 
         if show_windows:
             cv2.imshow('Live Video', frame)
@@ -163,7 +373,8 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
 
         prev = proc
 
-        if (cv2.waitKey(1) & 0xFF) == ord('q'):
+        # waitKey pumps the GUI event loop; skip it entirely when headless
+        if show_windows and (cv2.waitKey(1) & 0xFF) == ord('q'):
             logger.info('User requested exit (q)')
             break
 
@@ -175,21 +386,72 @@ def capture_video(source=0, duration=None, show_windows=True, min_area=500, widt
             logger.info("Shutdown flag detected, exiting...")
             break
 
+    logger.info("Capture timing: %s", clock.summary())
+    if continuous is not None:
+        continuous.release()
+        logger.info("Continuous stream: %s", continuous.summary())
+    if out is not None:
+        out.release()
+        logger.info(f"Capture ended while recording, manifest saved at: {out.manifest_path}")
     cap.release()
+    if publisher is not None:
+        publisher.close()
+    # Wait for background segment finalization so no clip is left without its index
+    default_closer.drain()
     if show_windows:
         cv2.destroyAllWindows()
     return True
 
 
+BACKENDS = {
+    'any': None,
+    'dshow': getattr(cv2, 'CAP_DSHOW', None),
+    'msmf': getattr(cv2, 'CAP_MSMF', None),
+    'v4l2': getattr(cv2, 'CAP_V4L2', None),
+}
+
+
+def _parse_source(value):
+    return int(value) if value.isdigit() else value
+
+
 def build_arg_parser():
     p = argparse.ArgumentParser(description='Simple motion detector test harness')
-    p.add_argument('--source', type=int, default=0, help='Video source index (default 0)')
+    p.add_argument('--source', type=_parse_source, default=0, help='Video source index or file path (default 0)')
+    p.add_argument('--backend', choices=sorted(BACKENDS), default='any',
+                   help="Capture API to open the source with (default 'any'; 'dshow' opens fastest on Windows)")
     p.add_argument('--duration', type=float, default=None, help="Seconds to run; omit for run-until-'q'")
     p.add_argument('--min-area', type=int, default=500, help='Minimum contour area to count as motion')
     p.add_argument('--width', type=int, default=None, help='Optional width to resize frames for processing')
     p.add_argument('--thresh', type=int, default=15, help='Threshold value for diff->binary')
     p.add_argument('--min-frames', type=int, default=2, help='Consecutive frames required to treat motion as active')
+    p.add_argument('--record-delay', type=float, default=20,
+                   help='Seconds to keep recording after motion stops (default 20)')
+    p.add_argument('--config', default=None,
+                   help='JSON/TOML file with detection settings; edits are applied live without restarting')
+    p.add_argument('--segment-seconds', type=float, default=30,
+                   help='Length of each independently finalized recording segment (default 30)')
+    p.add_argument('--postprocess', action='store_true',
+                   help='Generate thumbnails and a contact sheet for finished clips in a low-priority worker')
+    p.add_argument('--postprocess-workers', type=int, default=1, help='Maximum concurrent post-processing workers')
+    p.add_argument('--recompress', default=None, metavar='FOURCC',
+                   help="Also re-encode finished clips with this codec (e.g. 'avc1') during post-processing")
     p.add_argument('--no-windows', action='store_true', help='Do not show OpenCV GUI windows')
+    p.add_argument('--publish-feed', nargs='?', const='', default=None, metavar='NAME',
+                   help='Publish every frame to shared memory for the health monitor (main.py --feed); '
+                        'default name camera_feed_<source>')
+    p.add_argument('--continuous', action='store_true',
+                   help='Also record everything as a low-resolution, low-fps gray stream between events')
+    p.add_argument('--continuous-fps', type=float, default=2.0, help='Continuous stream frame rate (default 2)')
+    p.add_argument('--continuous-width', type=int, default=320, help='Continuous stream width in pixels (default 320)')
+    p.add_argument('--continuous-max-mb', type=float, default=2048,
+                   help='Delete the oldest continuous segments beyond this total size (default 2048)')
+    p.add_argument('--continuous-keep-days', type=float, default=7,
+                   help='Delete continuous segments older than this many days (default 7)')
+    p.add_argument('--startup-report', default=None, metavar='PATH',
+                   help='Write startup milestone timings (seconds since process start, or since import '
+                        'without psutil) to this JSON file')
+    _monitor_module("telemetry").add_telemetry_args(p)
     return p
 
 
@@ -198,10 +460,39 @@ if __name__ == '__main__':
     args = build_arg_parser().parse_args()
 
     show_windows = not args.no_windows
+    telemetry_module = _monitor_module("telemetry")
+    telemetry = telemetry_module.telemetry_from_args(args)
+
+    continuous = None
+    if args.continuous:
+        continuous = ContinuousRecorder("D:/motion_captures/continuous", fps=args.continuous_fps,
+                                        width=args.continuous_width, max_mb=args.continuous_max_mb,
+                                        keep_days=args.continuous_keep_days)
+
+    postprocessor = None
+    if args.postprocess:
+        try:
+            from .postprocess import PostProcessor
+        except ImportError:  # run as a script from this folder
+            from postprocess import PostProcessor
+        postprocessor = PostProcessor(max_workers=args.postprocess_workers, recompress_fourcc=args.recompress)
 
     success = capture_video(source=args.source, duration=args.duration, show_windows=show_windows,
-                            min_area=args.min_area, width=args.width, thresh=args.thresh, min_frames=args.min_frames)
+                            min_area=args.min_area, width=args.width, thresh=args.thresh, min_frames=args.min_frames,
+                            segment_seconds=args.segment_seconds, postprocessor=postprocessor,
+                            record_delay=args.record_delay, config_path=args.config,
+                            backend=BACKENDS[args.backend],
+                            publish_feed=(args.publish_feed or default_feed_name(args.source))
+                            if args.publish_feed is not None else None, telemetry=telemetry,
+                            continuous=continuous)
+    if postprocessor is not None:
+        postprocessor.shutdown(wait=True)
+    if args.startup_report:
+        startup.write_json(args.startup_report)
     if not success:
         logger.error('capture_video returned False')
     else:
         logger.info('capture_video finished successfully')
+    if telemetry is not None and telemetry.restart_reason:
+        logger.info('Restarting recorder (%s)', telemetry.restart_reason)
+        telemetry_module.restart_process()
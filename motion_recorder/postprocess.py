@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+try:
+    from .segments import write_json_atomic
+except ImportError:  # run as a script from this folder
+    from segments import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+def _lower_priority():
+    """Worker initializer: drop to below-normal priority and keep OpenCV single-threaded."""
+    try:
+        import psutil
+        proc = psutil.Process()
+        if sys.platform == "win32":
+            proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            proc.nice(10)
+    except Exception:
+        if hasattr(os, "nice"):
+            try:
+                os.nice(10)
+            except OSError:
+                pass
+    cv2.setNumThreads(1)
+
+
+def _read_frame(path, index):
+    cap = cv2.VideoCapture(path)
+    try:
+        if index > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        ret, frame = cap.read()
+        return frame if ret else None
+    finally:
+        cap.release()
+
+
+def contact_sheet(images, columns=3, background=(0, 0, 0)):
+    """Tile equally sized BGR images into one grid image (row-major)."""
+    if not images:
+        return None
+    h, w = images[0].shape[:2]
+    rows = (len(images) + columns - 1) // columns
+    sheet = np.full((rows * h, columns * w, 3), background, dtype=np.uint8)
+    for i, img in enumerate(images):
+        r, c = divmod(i, columns)
+        sheet[r * h:(r + 1) * h, c * w:(c + 1) * w] = img
+    return sheet
+
+
+def recompress(folder, segments, out_path, fourcc, fps, scale=1.0):
+    """Concatenate `segments` into `out_path` re-encoded with `fourcc`. Returns bytes written or 0."""
+    writer = None
+    try:
+        for seg in segments:
+            cap = cv2.VideoCapture(os.path.join(folder, seg["file"]))
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if scale != 1.0:
+                    frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                if writer is None:
+                    h, w = frame.shape[:2]
+                    writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*fourcc), fps, (w, h))
+                    if not writer.isOpened():
+                        cap.release()
+                        return 0
+                writer.write(frame)
+            cap.release()
+    finally:
+        if writer is not None:
+            writer.release()
+    return os.path.getsize(out_path) if os.path.exists(out_path) else 0
+
+
+def process_clip(manifest_path, thumb_width=320, sheet_columns=3, recompress_fourcc=None, recompress_scale=1.0):
+    """Generate peak thumbnails, a contact sheet and (optionally) a recompressed copy of an event.
+
+    Results are recorded under "postprocess" in the event manifest. Runs in a worker process.
+    """
+    started = time.time()
+    with open(manifest_path, "r", encoding="utf-8") as fp:
+        manifest = json.load(fp)
+    folder = os.path.dirname(manifest_path)
+    base = manifest["event"]
+    segments = [s for s in manifest.get("segments", []) if s.get("finalized")]
+    finalized = {s["file"] for s in segments}
+
+    thumbs = []
+    thumb_files = []
+    for n, peak in enumerate(manifest.get("peaks", [])):
+        if peak["segment"] not in finalized:
+            continue
+        frame = _read_frame(os.path.join(folder, peak["segment"]), peak["frame"])
+        if frame is None:
+            continue
+        h, w = frame.shape[:2]
+        thumb = cv2.resize(frame, (thumb_width, int(h * thumb_width / float(w))), interpolation=cv2.INTER_AREA)
+        name = f"{base}_peak{n}.jpg"
+        if cv2.imwrite(os.path.join(folder, name), thumb):
+            thumbs.append(thumb)
+            thumb_files.append(name)
+
+    result = {"thumbnails": thumb_files, "contact_sheet": None, "recompressed": None}
+    sheet = contact_sheet(thumbs, columns=sheet_columns)
+    if sheet is not None:
+        sheet_name = f"{base}_sheet.jpg"
+        if cv2.imwrite(os.path.join(folder, sheet_name), sheet):
+            result["contact_sheet"] = sheet_name
+
+    if recompress_fourcc and segments:
+        small_name = f"{base}_small.mp4"
+        size = recompress(folder, segments, os.path.join(folder, small_name), recompress_fourcc,
+                          manifest.get("fps", 20.0), scale=recompress_scale)
+        if size:
+            result["recompressed"] = {
+                "file": small_name,
+                "fourcc": recompress_fourcc,
+                "bytes": size,
+                "source_bytes": sum(os.path.getsize(os.path.join(folder, s["file"])) for s in segments),
+            }
+
+    result["seconds"] = round(time.time() - started, 3)
+    manifest["postprocess"] = result
+    write_json_atomic(manifest_path, manifest)
+    return result
+
+
+class PostProcessor:
+    """Bounded, low-priority process pool for finished motion clips.
+
+    At most `max_workers` clips are processed at once and at most `max_pending` wait in
+    the queue; further clips are skipped with a warning rather than piling up work that
+    would compete with live detection.
+    """
+
+    def __init__(self, max_workers=1, max_pending=8, thumb_width=320, sheet_columns=3,
+                 recompress_fourcc=None, recompress_scale=1.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.options = {
+            "thumb_width": thumb_width,
+            "sheet_columns": sheet_columns,
+            "recompress_fourcc": recompress_fourcc,
+            "recompress_scale": recompress_scale,
+        }
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, manifest_path):
+        """Queue a finished event manifest. Returns False if the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning("Post-processing queue full; skipping %s", manifest_path)
+                return False
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_lower_priority)
+            self._pending += 1
+        future = self._executor.submit(process_clip, manifest_path, **self.options)
+        future.add_done_callback(lambda f: self._done(manifest_path, f))
+        return True
+
+    def _done(self, manifest_path, future):
+        with self._lock:
+            self._pending -= 1
+        try:
+            result = future.result()
+            logger.info("Post-processed %s in %.1fs: %d thumbnails, sheet=%s, recompressed=%s",
+                        manifest_path, result["seconds"], len(result["thumbnails"]),
+                        result["contact_sheet"], bool(result["recompressed"]))
+        except Exception as e:
+            logger.warning("Post-processing failed for %s: %s", manifest_path, e)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
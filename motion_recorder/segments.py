@@ -0,0 +1,182 @@
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def write_json_atomic(path, data):
+    """Write `data` as JSON to `path` via a temp file + rename so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+class SegmentCloser:
+    """Release finished VideoWriters on a background thread.
+
+    `VideoWriter.release()` writes the mp4 index (moov atom) and can take a while on
+    large segments, so the capture loop hands writers off here instead of blocking.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, writer, on_done=None):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="segment-closer", daemon=True)
+                self._thread.start()
+        self._queue.put((writer, on_done))
+
+    def drain(self):
+        """Block until every submitted writer has been released."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            writer, on_done = self._queue.get()
+            try:
+                writer.release()
+                if on_done is not None:
+                    on_done()
+            except Exception:
+                logger.exception("Failed to finalize video segment")
+            finally:
+                self._queue.task_done()
+
+
+default_closer = SegmentCloser()
+
+
+class SegmentedRecorder:
+    """Record one motion event as fixed-length, independently finalized mp4 segments.
+
+    A forced kill (taskkill /F, power loss) leaves the currently open mp4 without its
+    index, so only the active segment is lost. The event is described by a JSON manifest
+    next to the segments, rewritten atomically whenever a segment opens or finalizes.
+
+    The `max_peaks` frames with the highest motion score are listed under "peaks" so
+    post-processing can find them without rescanning the clip. `on_complete(manifest_path)`
+    is called from the closer thread once the last segment has been finalized.
+    With `is_color=False` the writer takes single-channel (gray) frames.
+    """
+
+    def __init__(self, folder, base_name, fourcc, fps, frame_size, segment_seconds=30, closer=None,
+                 max_peaks=6, on_complete=None, is_color=True):
+        self.folder = folder
+        self.base_name = base_name
+        self.fourcc = fourcc
+        self.fps = fps
+        self.frame_size = frame_size
+        self.segment_seconds = segment_seconds
+        self.closer = closer if closer is not None else default_closer
+        self.manifest_path = os.path.join(folder, f"{base_name}.json")
+        self.max_peaks = max_peaks
+        self.on_complete = on_complete
+        self.is_color = is_color
+
+        self._lock = threading.Lock()
+        self._writer = None
+        self._segment_started = 0.0
+        self._segment_index = -1
+        self._closed = False
+        self._peaks = []  # min-heap of (score, segment_index, frame_index)
+        self.manifest = {
+            "event": base_name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "fps": fps,
+            "frame_size": list(frame_size),
+            "segment_seconds": segment_seconds,
+            "segments": [],
+            "complete": False,
+        }
+        os.makedirs(folder, exist_ok=True)
+
+    def write(self, frame, score=0):
+        """Append `frame`; `score` (e.g. changed pixel count) ranks it as a peak candidate."""
+        if self._closed:
+            return
+        now = time.time()
+        if self._writer is None or now - self._segment_started >= self.segment_seconds:
+            self._roll(now)
+        self._writer.write(frame)
+        segment = self.manifest["segments"][-1]
+        if score > 0 and self.max_peaks > 0:
+            entry = (score, self._segment_index, segment["frames"])
+            if len(self._peaks) < self.max_peaks:
+                heapq.heappush(self._peaks, entry)
+            elif entry > self._peaks[0]:
+                heapq.heapreplace(self._peaks, entry)
+        segment["frames"] += 1
+
+    def release(self):
+        """Finalize the active segment in the background and mark the event complete."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            self.manifest["peaks"] = [
+                {"segment": self.manifest["segments"][seg]["file"], "frame": frame, "score": score}
+                for score, seg, frame in sorted(self._peaks, reverse=True)
+            ]
+            self.manifest["ended"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if self._writer is None:
+            self._mark_complete()
+        else:
+            self._hand_off_current(final=True)
+
+    def _mark_complete(self):
+        with self._lock:
+            self.manifest["complete"] = True
+            self._save_manifest()
+        if self.on_complete is not None:
+            self.on_complete(self.manifest_path)
+
+    def _roll(self, now):
+        self._hand_off_current()
+        self._segment_index += 1
+        file_name = f"{self.base_name}_{self._segment_index:03d}.mp4"
+        self._writer = cv2.VideoWriter(os.path.join(self.folder, file_name), self.fourcc, self.fps, self.frame_size,
+                                       self.is_color)
+        self._segment_started = now
+        with self._lock:
+            self.manifest["segments"].append({
+                "file": file_name,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)),
+                "frames": 0,
+                "finalized": False,
+            })
+            self._save_manifest()
+
+    def _hand_off_current(self, final=False):
+        if self._writer is None:
+            return
+        segment = self.manifest["segments"][-1]
+        writer, self._writer = self._writer, None
+
+        def on_done():
+            with self._lock:
+                segment["finalized"] = True
+                self._save_manifest()
+            if final:
+                self._mark_complete()
+
+        self.closer.submit(writer, on_done)
+
+    def _save_manifest(self):
+        try:
+            write_json_atomic(self.manifest_path, self.manifest)
+        except OSError as e:
+            logger.warning("Could not write manifest %s: %s", self.manifest_path, e)
@@ -0,0 +1,47 @@
+import json
+import time
+
+
+def process_start():
+    """perf_counter() value at which this process was created, or None without psutil.
+
+    Covers interpreter startup and everything imported before the timer, which a
+    perf_counter() taken at import would miss.
+    """
+    try:
+        import psutil
+        age = time.time() - psutil.Process().create_time()
+    except Exception:
+        return None
+    return time.perf_counter() - max(0.0, age)
+
+
+class StartupTimer:
+    """Record named milestones relative to a start point (perf_counter based).
+
+    Used to measure time-to-first-detection: imports, camera open, first frame and
+    first analyzed frame. Each milestone is only recorded the first time it is hit.
+    By default times count from process creation (`origin` "process"), or from when
+    the timer was created if psutil is unavailable (`origin` "timer").
+    """
+
+    def __init__(self, start=None):
+        if start is None:
+            start = process_start()
+            self.origin = "timer" if start is None else "process"
+        else:
+            self.origin = "given"
+        self.start = time.perf_counter() if start is None else start
+        self.marks = {}
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+
+    def summary(self):
+        marks = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.marks.items())
+        return marks if self.origin == "process" else f"{marks} (since {self.origin} start)"
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump({name: round(seconds, 4) for name, seconds in self.marks.items()}, fp, indent=2)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Time CameraMonitor.check_camera against scripted fake cameras (no webcam needed).
+
+Each scenario builds a fresh CameraMonitor on a FakeBackend, runs a few checks and
+reports pass/fail, median/max check latency and how many opens and reads it took.
+Bench files go to logs/bench_* and are removed afterwards.
+
+Usage:
+    python bench_check.py
+    python bench_check.py --checks 10 --scenario black_start slow_open
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+
+from capture_backend import FakeBackend, FakeCamera
+from device_presence import FakePresenceProvider
+from main import CameraMonitor
+
+
+def scenario_cameras():
+    return {
+        "live": (FakeCamera(), {}),
+        "persistent": (FakeCamera(), {"persistent_session": True}),
+        "exposure_ramp": (FakeCamera(exposure_ramp=8), {}),
+        "black_start": (FakeCamera().script("black", 18), {}),
+        "frozen": (FakeCamera(mode="frozen"), {"frozen_after": 0.0}),
+        "dshow_fails": (FakeCamera(failing_apis={cv2.CAP_DSHOW}), {}),
+        "first_open_fails": (FakeCamera(open_failures=2), {}),
+        "slow_open": (FakeCamera(open_delay=0.5), {}),
+        "dead_reads": (FakeCamera(mode="dead"), {}),
+    }
+
+
+def run_scenario(name, camera, options, checks):
+    backend = FakeBackend({0: camera})
+    monitor = CameraMonitor(
+        capture_backend=backend,
+        presence_provider=FakePresenceProvider(),
+        log_file="bench_check.log",
+        save_dir=os.path.join("logs", "bench_frames"),
+        status_file="bench_status.json",
+        history_file="bench_history.sqlite3",
+        discovery_cache_file="bench_discovery_cache.json",
+        enable_ptz_cycling=False,
+        frame_save_interval=float("inf"),
+        probe_backoff_min=0.0,
+        log_console=False,
+        **options,
+    )
+    results, latencies = [], []
+    try:
+        for _ in range(checks):
+            t0 = time.perf_counter()
+            results.append(monitor.check_camera())
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+    finally:
+        monitor.close()
+        for path in ("bench_check.log", "bench_status.json", "bench_history.sqlite3",
+                     "bench_history.sqlite3-wal", "bench_history.sqlite3-shm", "bench_discovery_cache.json"):
+            try:
+                os.remove(os.path.join(monitor.log_dir, path))
+            except OSError:
+                pass
+        try:
+            os.rmdir(monitor.save_dir)
+        except OSError:
+            pass
+    print(f"  {name:16s} ok={sum(results)}/{checks}  median={statistics.median(latencies):7.1f}ms  "
+          f"max={max(latencies):7.1f}ms  opens={backend.opens:3d}  reads={camera.reads:4d}")
+    return results
+
+
+def main():
+    scenarios = scenario_cameras()
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--checks", type=int, default=5, help="Checks per scenario (default 5)")
+    p.add_argument("--scenario", nargs="+", choices=sorted(scenarios), default=list(scenarios),
+                   help="Scenarios to run (default all)")
+    args = p.parse_args()
+
+    print(f"check_camera benchmark: {args.checks} checks per scenario")
+    for name in args.scenario:
+        camera, options = scenarios[name]
+        run_scenario(name, camera, options, args.checks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class CaptureBackend:
+    """Open capture devices for CameraMonitor, health_check and PTZSession.
+
+    `open(index, api)` returns an object with the cv2.VideoCapture interface
+    (isOpened/read/grab/set/get/release); it may be unopened, exactly like
+    cv2.VideoCapture on a missing device. `api` is a cv2.CAP_* constant or None.
+    """
+
+    name = "base"
+
+    def open(self, index, api=None):
+        raise NotImplementedError
+
+
+class OpenCVBackend(CaptureBackend):
+    """The real thing: cv2.VideoCapture."""
+
+    name = "opencv"
+
+    def open(self, index, api=None):
+        return cv2.VideoCapture(index) if api is None else cv2.VideoCapture(index, api)
+
+
+class FakeCamera:
+    """Deterministic synthetic camera, scriptable for tests and benchmarks.
+
+    Frames are a textured scene with a moving bar plus seeded sensor noise, so they pass
+    the frame-quality checks and are never byte-identical. Behaviour is controlled by
+    attributes that may be changed at any time:
+
+      - `mode`: "live", "black" (near-zero frames), "frozen" (the same bytes every read)
+        or "dead" (reads fail)
+      - `script(mode, count)`: use `mode` for the next `count` reads, then fall back
+      - `open_failures`: number of upcoming opens that fail
+      - `failing_apis`: cv2.CAP_* constants that never open this camera
+      - `open_delay` / `read_delay`: seconds each open / read takes
+      - `exposure_ramp`: the first N frames after each open fade in from dark, like
+        auto-exposure settling
+      - `ptz`: whether CAP_PROP_PAN/TILT/ZOOM can be set
+    """
+
+    PTZ_PROPS = (cv2.CAP_PROP_PAN, cv2.CAP_PROP_TILT, cv2.CAP_PROP_ZOOM)
+
+    def __init__(self, width: int = 1280, height: int = 720, mode: str = "live", open_delay: float = 0.0,
+                 read_delay: float = 0.0, open_failures: int = 0, failing_apis=(), ptz: bool = True,
+                 exposure_ramp: int = 0, seed: int = 0) -> None:
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.open_delay = open_delay
+        self.read_delay = read_delay
+        self.open_failures = open_failures
+        self.failing_apis = set(failing_apis)
+        self.ptz = ptz
+        self.exposure_ramp = exposure_ramp
+        self.seed = seed
+        self.props = {prop: 0.0 for prop in self.PTZ_PROPS}
+        self.opens = 0
+        self.reads = 0
+        self.reads_since_open = 0
+        self._script = collections.deque()
+        self._frozen = None
+        self._scene = None
+        self._lock = threading.Lock()
+
+    def script(self, mode: str, count: int = 1):
+        """Queue `count` reads in `mode` ahead of the default mode. Chainable."""
+        self._script.extend([mode] * count)
+        return self
+
+    def _background(self) -> np.ndarray:
+        if self._scene is None or self._scene.shape[:2] != (self.height, self.width):
+            rng = np.random.default_rng(self.seed)
+            y, x = np.mgrid[0:self.height, 0:self.width]
+            scene = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            scene[..., 0] = (x * 200 // max(1, self.width - 1) + 30).astype(np.uint8)
+            scene[..., 1] = (y * 200 // max(1, self.height - 1) + 30).astype(np.uint8)
+            scene[..., 2] = 110
+            for _ in range(24):
+                x1, y1 = int(rng.integers(0, self.width - 40)), int(rng.integers(0, self.height - 40))
+                color = tuple(int(c) for c in rng.integers(0, 250, 3))
+                cv2.rectangle(scene, (x1, y1), (x1 + int(rng.integers(20, 200)), y1 + int(rng.integers(20, 150))),
+                              color, -1)
+            self._scene = scene
+        return self._scene
+
+    def next_frame(self):
+        """Return (ret, frame) for one read according to the script/mode."""
+        with self._lock:
+            self.reads += 1
+            self.reads_since_open += 1
+            mode = self._script.popleft() if self._script else self.mode
+            n = self.reads
+            since_open = self.reads_since_open
+        if self.read_delay:
+            time.sleep(self.read_delay)
+        if mode == "dead":
+            return False, None
+        if mode == "black":
+            return True, np.random.default_rng(n).integers(0, 4, (self.height, self.width, 3), dtype=np.uint8)
+        if mode == "frozen" and self._frozen is not None and self._frozen.shape[:2] == (self.height, self.width):
+            return True, self._frozen.copy()
+
+        frame = self._background().copy()
+        bar = (n * 16) % self.width
+        frame[:, bar:bar + 12] = 250
+        noise = np.random.default_rng(n).integers(0, 3, frame.shape[:2], dtype=np.uint8)
+        frame[..., 2] += noise  # scene values stay <= 250, so this never wraps
+        if since_open <= self.exposure_ramp:
+            frame = (frame * (since_open / (self.exposure_ramp + 1.0))).astype(np.uint8)
+        if mode == "frozen":
+            self._frozen = frame.copy()
+        return True, frame
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in reading from a FakeCamera."""
+
+    def __init__(self, camera: FakeCamera | None) -> None:
+        self.camera = camera
+        self._opened = camera is not None
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image=None):
+        if not self._opened:
+            return False, None
+        return self.camera.next_frame()
+
+    def grab(self) -> bool:
+        return self.read()[0]
+
+    def set(self, prop, value) -> bool:
+        if not self._opened:
+            return False
+        camera = self.camera
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            camera.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            camera.height = int(value)
+        elif prop in FakeCamera.PTZ_PROPS:
+            if not camera.ptz:
+                return False
+            camera.props[prop] = float(value)
+        elif prop not in (cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_BUFFERSIZE, cv2.CAP_PROP_FPS):
+            return False
+        return True
+
+    def get(self, prop) -> float:
+        if not self._opened:
+            return 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.camera.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.camera.height)
+        if prop in FakeCamera.PTZ_PROPS:
+            return self.camera.props[prop] if self.camera.ptz else -1.0
+        return -1.0
+
+    def release(self) -> None:
+        self._opened = False
+
+
+class FakeBackend(CaptureBackend):
+    """Serve FakeCameras by index; unknown indices (and scripted failures) fail to open."""
+
+    name = "fake"
+
+    def __init__(self, cameras=None) -> None:
+        if cameras is None:
+            cameras = {0: FakeCamera()}
+        elif isinstance(cameras, FakeCamera):
+            cameras = {0: cameras}
+        self.cameras = dict(cameras)
+        self.opens = 0
+
+    def open(self, index, api=None):
+        self.opens += 1
+        camera = self.cameras.get(index)
+        if camera is None:
+            return FakeCapture(None)
+        camera.opens += 1
+        camera.reads_since_open = 0
+        if camera.open_delay:
+            time.sleep(camera.open_delay)
+        if api in camera.failing_apis:
+            return FakeCapture(None)
+        if camera.open_failures > 0:
+            camera.open_failures -= 1
+            return FakeCapture(None)
+        return FakeCapture(camera)
+
+
+def _frame_feed_module():
+    """Import motion_recorder.frame_feed, from the package or the sibling folder."""
+    try:
+        from motion_recorder import frame_feed
+    except ImportError:  # run as a script from this folder
+        recorder_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "motion_recorder")
+        if recorder_dir not in sys.path:
+            sys.path.append(recorder_dir)
+        import frame_feed
+    return frame_feed
+
+
+class FeedCapture:
+    """cv2.VideoCapture stand-in reading the motion recorder's shared-memory feed.
+
+    `read()` waits up to `read_timeout` for a frame newer than the last one returned,
+    so a recorder that stopped publishing fails the read like an unplugged camera.
+    `grab()` only skips to the newest frame. Device properties can't be set.
+    """
+
+    def __init__(self, reader, stale_after: float, read_timeout: float) -> None:
+        self.reader = reader
+        self.read_timeout = read_timeout
+        self.last = None
+        self._last_seq = 0
+        header = reader.header() if reader.attach() else None
+        # A block left by a recorder that hung (or was killed on Windows) keeps its last frame
+        self._opened = header is not None and header["seq"] > 0 and time.time() - header["timestamp"] < stale_after
+        if not self._opened:
+            reader.close()
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image=None):
+        if not self._opened:
+            return False, None
+        feed_frame = self.reader.read(after_seq=self._last_seq, timeout=self.read_timeout)
+        if feed_frame is None:
+            return False, None
+        self._last_seq = feed_frame.seq
+        self.last = feed_frame
+        return True, feed_frame.frame
+
+    def grab(self) -> bool:
+        if not self._opened:
+            return False
+        # Skip frames older than the newest published one, like draining a driver queue;
+        # the next read returns that newest frame without waiting for another
+        self._last_seq = max(self._last_seq, self.reader.current_seq() - 1)
+        return True
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def get(self, prop) -> float:
+        header = self.reader.header() if self._opened else None
+        if header is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(header["width"])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(header["height"])
+        if prop == cv2.CAP_PROP_POS_MSEC and self.last is not None:
+            # When the recorder read the frame, not when we copied it
+            return self.last.timestamp * 1000.0
+        if prop == cv2.CAP_PROP_FPS and self.last is not None:
+            return float(self.last.stats.get("fps") or 0.0)
+        return -1.0
+
+    def info(self) -> dict | None:
+        """Details of the last frame read (sequence, age, publisher pid and stats)."""
+        if self.last is None:
+            return None
+        return {"name": self.reader.name, "frame": self.last.number, "age_s": round(self.last.age, 2),
+                "pid": self.last.pid, "stats": self.last.stats}
+
+    def release(self) -> None:
+        self._opened = False
+        self.reader.close()
+
+
+class FeedBackend(CaptureBackend):
+    """Read frames the motion recorder publishes (--publish-feed) instead of opening the device.
+
+    `feed_name` defaults to the recorder's default name for the opened index. A feed
+    whose newest frame is older than `stale_after` seconds doesn't open.
+    """
+
+    name = "feed"
+
+    def __init__(self, feed_name: str | None = None, stale_after: float = 5.0, read_timeout: float = 2.0) -> None:
+        self.frame_feed = _frame_feed_module()
+        self.feed_name = feed_name
+        self.stale_after = stale_after
+        self.read_timeout = read_timeout
+
+    def open(self, index, api=None):
+        name = self.feed_name or self.frame_feed.default_feed_name(index)
+        return FeedCapture(self.frame_feed.FrameFeedReader(name), self.stale_after, self.read_timeout)
@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+import time
+
+
+class DevicePresenceProvider:
+    """Answer "does the OS see a camera?" for CameraMonitor.
+
+    `camera_present()` returns True/False, or None when the OS could not be queried
+    (callers fail open in that case; the capture attempt is the real test).
+    `reports_absence` is False for providers that never answer False.
+    """
+
+    name = "none"
+    reports_absence = False
+
+    def camera_present(self) -> bool | None:
+        return None
+
+    def invalidate(self) -> None:
+        """Drop any cached answer (no-op for uncached providers)."""
+
+
+class WindowsPresenceProvider(DevicePresenceProvider):
+    """Query PnP devices via PowerShell CIM, falling back to WMIC. Spawns a process per call.
+
+    Only ever answers True or None: the PnP listing is too coarse to prove a camera is
+    absent, so (like the original inline check) an empty listing fails open.
+    """
+
+    name = "windows-pnp"
+    reports_absence = False
+
+    PS_CMD = (
+        "Get-CimInstance Win32_PnPEntity | "
+        "Where-Object { $_.PNPClass -eq 'Image' -or $_.Name -match 'Camera|USB' } | "
+        "Select-Object -ExpandProperty Name"
+    )
+
+    def camera_present(self) -> bool | None:
+        try:
+            output = subprocess.check_output(
+                ["powershell", "-NoProfile", "-Command", self.PS_CMD],
+                stderr=subprocess.DEVNULL,
+            ).decode(errors="ignore")
+            if any(len(line.strip()) > 0 for line in output.splitlines()):
+                return True
+            return None
+        except Exception:
+            # Fallback to WMIC for older environments
+            try:
+                output = subprocess.check_output(
+                    "wmic path Win32_PnPEntity get Name", shell=True, stderr=subprocess.DEVNULL
+                ).decode(errors="ignore")
+                if any("Camera" in line or "USB" in line for line in output.splitlines()):
+                    return True
+                return None
+            except Exception:
+                return None
+
+
+class LinuxPresenceProvider(DevicePresenceProvider):
+    """Check for V4L2 capture nodes under /sys/class/video4linux (no process spawn)."""
+
+    name = "linux-v4l2"
+    reports_absence = True
+
+    def __init__(self, sysfs_dir: str = "/sys/class/video4linux") -> None:
+        self.sysfs_dir = sysfs_dir
+
+    def camera_present(self) -> bool | None:
+        try:
+            entries = os.listdir(self.sysfs_dir)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return None
+        return any(entry.startswith("video") for entry in entries)
+
+
+class FakePresenceProvider(DevicePresenceProvider):
+    """Scriptable provider for tests: set `.present`; `.calls` counts queries."""
+
+    name = "fake"
+    reports_absence = True
+
+    def __init__(self, present: bool | None = True) -> None:
+        self.present = present
+        self.calls = 0
+
+    def camera_present(self) -> bool | None:
+        self.calls += 1
+        return self.present
+
+
+class CachedPresenceProvider(DevicePresenceProvider):
+    """Cache another provider's answer for `ttl` seconds.
+
+    Call `invalidate()` when a capture attempt fails so the next check asks the OS
+    again instead of trusting a stale "present". That is skipped for providers that
+    can't report absence: their answer would not change, and on Windows every
+    re-query spawns PowerShell.
+    """
+
+    def __init__(self, provider: DevicePresenceProvider, ttl: float = 300.0, clock=time.monotonic) -> None:
+        self.provider = provider
+        self.ttl = ttl
+        self.clock = clock
+        self.name = f"cached({provider.name})"
+        self.reports_absence = provider.reports_absence
+        self._value = None
+        self._expires = None
+
+    def camera_present(self) -> bool | None:
+        now = self.clock()
+        if self._expires is None or now >= self._expires:
+            self._value = self.provider.camera_present()
+            self._expires = now + self.ttl
+        return self._value
+
+    def invalidate(self) -> None:
+        if self.reports_absence:
+            self._expires = None
+
+
+def default_presence_provider(ttl: float = 300.0) -> DevicePresenceProvider:
+    """Return a cached provider suited to the current platform."""
+    if sys.platform == "win32":
+        provider = WindowsPresenceProvider()
+    elif sys.platform.startswith("linux"):
+        provider = LinuxPresenceProvider()
+    else:
+        provider = DevicePresenceProvider()
+    return CachedPresenceProvider(provider, ttl=ttl)
@@ -0,0 +1,131 @@
+import cv2
+import numpy as np
+
+# Share of the frame kept by digital pan/tilt, and how far (as a fraction of the frame)
+# an offset of +/-1.0 moves the crop centre
+PAN_TILT_CROP = 0.8
+PAN_TILT_TRAVEL = 0.25
+ZOOM_RANGE = (0.5, 3.0)
+
+
+def crop_window(kind: str, value: float, w: int, h: int) -> tuple[int, int, int, int]:
+    """Return the (x1, y1, crop_w, crop_h) source window of one digital PTZ step.
+
+    kind is "pan" (value -1.0 left .. 1.0 right), "tilt" (-1.0 top .. 1.0 bottom) or
+    "zoom" (factor, clamped to ZOOM_RANGE). The window always stays inside the frame.
+    """
+    if kind == "zoom":
+        zoom = max(ZOOM_RANGE[0], min(ZOOM_RANGE[1], value))
+        crop_w = min(int(w / zoom), w)
+        crop_h = min(int(h / zoom), h)
+        return (w - crop_w) // 2, (h - crop_h) // 2, crop_w, crop_h
+    if kind not in ("pan", "tilt"):
+        raise ValueError(f"Unknown digital PTZ step: {kind}")
+
+    crop_w = int(w * PAN_TILT_CROP)
+    crop_h = int(h * PAN_TILT_CROP)
+    center_x = int(w * (0.5 + value * PAN_TILT_TRAVEL)) if kind == "pan" else w // 2
+    center_y = int(h * (0.5 + value * PAN_TILT_TRAVEL)) if kind == "tilt" else h // 2
+    # Shift (rather than shrink) a window that would leave the frame, keeping the aspect ratio
+    x1 = min(max(0, center_x - crop_w // 2), w - crop_w)
+    y1 = min(max(0, center_y - crop_h // 2), h - crop_h)
+    return x1, y1, crop_w, crop_h
+
+
+def window_matrix(window, w: int, h: int) -> np.ndarray:
+    """3x3 map from output pixels to source pixels for "crop `window`, resize to w x h".
+
+    Uses the same pixel-centre convention as cv2.resize:
+    src = x1 + (dst + 0.5) * crop_w / w - 0.5.
+    """
+    x1, y1, crop_w, crop_h = window
+    sx = crop_w / float(w)
+    sy = crop_h / float(h)
+    return np.array([
+        [sx, 0.0, x1 + 0.5 * sx - 0.5],
+        [0.0, sy, y1 + 0.5 * sy - 0.5],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+class DigitalPTZ:
+    """Render digital pan/tilt/zoom views with one resample per view.
+
+    A view is a sequence of steps such as (("pan", -1.0), ("zoom", 2.0)), applied in
+    order as if each step cropped and resized the previous result. The steps are
+    composed into a single affine map, so a combined pan+tilt+zoom resamples the frame
+    once. When the composed map is a whole-pixel crop (always the case for a single
+    step) it is applied as cv2.resize of a view, which is several times faster than
+    warpAffine; other maps go through one warpAffine. Maps are cached per
+    (resolution, steps) and output buffers per (name, shape), so a steady stream of
+    same-sized frames allocates nothing after the first render.
+    """
+
+    def __init__(self, interpolation: int = cv2.INTER_LINEAR) -> None:
+        self.interpolation = interpolation
+        self._plans = {}
+        self._buffers = {}
+
+    def matrix(self, w: int, h: int, steps) -> np.ndarray:
+        """Return the 2x3 output->source map composed from `steps`."""
+        m = np.eye(3)
+        for kind, value in steps:
+            # Each step samples the previous output, so its map is applied first
+            m = m @ window_matrix(crop_window(kind, value, w, h), w, h)
+        return m[:2].copy()
+
+    def plan(self, w: int, h: int, steps):
+        """Return the cached ("copy" | "crop" | "warp", window or matrix) for `steps` at w x h."""
+        key = (w, h, tuple(steps))
+        plan = self._plans.get(key)
+        if plan is None:
+            m = self.matrix(w, h, steps)
+            sx, sy = m[0, 0], m[1, 1]
+            window = (m[0, 2] - 0.5 * sx + 0.5, m[1, 2] - 0.5 * sy + 0.5, sx * w, sy * h)
+            rounded = tuple(int(round(v)) for v in window)
+            if np.allclose(m, np.eye(3)[:2]):
+                plan = ("copy", None)
+            elif np.allclose(window, rounded, atol=1e-6):
+                plan = ("crop", rounded)
+            else:
+                plan = ("warp", m)
+            self._plans[key] = plan
+        return plan
+
+    def apply(self, frame, steps, dst: np.ndarray | None = None) -> np.ndarray:
+        """Apply `steps` to `frame` in a single resample (into `dst` if given)."""
+        h, w = frame.shape[:2]
+        kind, arg = self.plan(w, h, steps)
+        if kind == "copy":
+            if dst is None:
+                return frame.copy()
+            np.copyto(dst, frame)
+            return dst
+        if kind == "crop":
+            x1, y1, crop_w, crop_h = arg
+            return cv2.resize(frame[y1:y1 + crop_h, x1:x1 + crop_w], (w, h), dst=dst,
+                              interpolation=self.interpolation)
+        return cv2.warpAffine(
+            frame, arg, (w, h), dst=dst,
+            flags=self.interpolation | cv2.WARP_INVERSE_MAP,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+
+    def render(self, frame, name: str, steps) -> np.ndarray:
+        """Apply `steps` into a buffer reused for `name`; valid until the next render of `name`.
+
+        Identity views (no steps, or e.g. zoom 0.5 which is clamped to the full frame)
+        return `frame` itself without copying.
+        """
+        h, w = frame.shape[:2]
+        if not steps or self.plan(w, h, steps)[0] == "copy":
+            return frame
+        key = (name, frame.shape, frame.dtype.str)
+        dst = self._buffers.get(key)
+        if dst is None:
+            dst = self._buffers[key] = np.empty_like(frame)
+        return self.apply(frame, steps, dst=dst)
+
+    def render_all(self, frame, views) -> dict:
+        """Render every (name, steps) view of one source frame; identity views return `frame` itself."""
+        return {name: self.render(frame, name, steps) for name, steps in views}
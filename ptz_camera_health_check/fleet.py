@@ -0,0 +1,235 @@
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    from .main import CameraMonitor
+    from .status_store import write_json_atomic
+    from .telemetry import ProcessTelemetry, add_telemetry_args, restart_process, telemetry_from_args
+except ImportError:  # run as a script from this folder
+    from main import CameraMonitor
+    from status_store import write_json_atomic
+    from telemetry import ProcessTelemetry, add_telemetry_args, restart_process, telemetry_from_args
+
+
+class FleetMonitor:
+    """Run health checks for several cameras concurrently from one process.
+
+    Each camera gets its own CameraMonitor (own log, status, discovery cache and frame
+    folder; the SQLite check history is shared and keyed by camera index). Checks run on
+    a bounded thread pool. First checks are staggered evenly across one interval so
+    cameras don't hit the USB bus at the same moment. When a check finishes, that
+    camera's next check is due after the delay chosen by its AdaptiveScheduler
+    (`interval` as the base, +/- `jitter`), so healthy cameras slow down and failing
+    ones are rechecked quickly.
+
+    A check still running after `check_timeout` seconds is reported as "timeout". Python
+    cannot kill the worker thread, so that camera is not checked again until the stuck
+    check returns, and then it counts as failed whatever it returned; the other cameras
+    keep their schedule as long as free workers remain. Failed, raising and late checks
+    also mark the camera's own status file not ok.
+
+    Results are aggregated in `logs/fleet_status.json`, rewritten atomically after every
+    completed or timed-out check. With `telemetry`, process resource samples are added
+    under "process", and run() returns early once a resource limit has been crossed.
+    """
+
+    def __init__(
+        self,
+        cameras,
+        interval: float = 5.0,
+        max_workers: int = 4,
+        jitter: float = 0.1,
+        check_timeout: float = 30.0,
+        fleet_status_file: str = "fleet_status.json",
+        monitor_factory=CameraMonitor,
+        telemetry: ProcessTelemetry | None = None,
+    ) -> None:
+        self.interval = interval
+        self.jitter = jitter
+        self.check_timeout = check_timeout
+        self.max_workers = max_workers
+        self.telemetry = telemetry
+        self.monitors = {}
+        for cam in cameras:
+            # Accept plain indices or per-camera CameraMonitor keyword dicts
+            options = dict(cam) if isinstance(cam, dict) else {"camera_index": int(cam)}
+            index = options.setdefault("camera_index", 0)
+            options.setdefault("check_interval", interval)
+            options.setdefault("log_file", f"camera_{index}.log")
+            options.setdefault("save_dir", os.path.join("monitor_frames", f"camera_{index}"))
+            options.setdefault("status_file", f"status_{index}.json")
+            options.setdefault("discovery_cache_file", f"discovery_cache_{index}.json")
+            options.setdefault("probe_fallback_indices", False)
+            options.setdefault("log_console", False)
+            if index in self.monitors:
+                raise ValueError(f"Camera index {index} listed twice")
+            self.monitors[index] = monitor_factory(**options)
+            self.monitors[index].scheduler.jitter = jitter
+
+        first = next(iter(self.monitors.values()))
+        self.fleet_status_path = os.path.join(first.log_dir, fleet_status_file)
+        self.results = {
+            index: {"state": "pending", "ok": None, "last_check": None, "latency_ms": None,
+                    "consecutive_failures": 0, "status_file": m.status.path}
+            for index, m in self.monitors.items()
+        }
+        self._stop = threading.Event()
+
+    def log(self, msg: str) -> None:
+        print(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] {msg}", flush=True)
+
+    def _run_check(self, index: int) -> bool:
+        return self.monitors[index].check_camera()
+
+    def _record(self, index: int, state: str, ok: bool | None, started: float) -> None:
+        result = self.results[index]
+        result["state"] = state
+        result["ok"] = ok
+        result["last_check"] = datetime.datetime.fromtimestamp(started).isoformat(timespec="seconds")
+        result["latency_ms"] = round((time.time() - started) * 1000.0, 1)
+        result["consecutive_failures"] = 0 if ok else result["consecutive_failures"] + 1
+        result["schedule"] = self.monitors[index].scheduler.snapshot()
+
+    def write_fleet_status(self) -> None:
+        states = [r["state"] for r in self.results.values()]
+        try:
+            write_json_atomic(self.fleet_status_path, {
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "cameras_total": len(states),
+                "cameras_ok": states.count("ok"),
+                "cameras_failed": states.count("failed"),
+                "cameras_timeout": states.count("timeout"),
+                "cameras": {str(index): result for index, result in self.results.items()},
+                "process": self.telemetry.snapshot() if self.telemetry is not None else None,
+            })
+        except OSError as e:
+            self.log(f"WARN: Could not write fleet status: {e}")
+
+    def _collect(self, running: dict, timed_out: set, due: dict, now: float) -> bool:
+        """Record finished and newly timed-out checks; return True if any result changed."""
+        changed = False
+        for future, (index, started, deadline) in list(running.items()):
+            if future.done():
+                del running[future]
+                late = future in timed_out
+                timed_out.discard(future)
+                raised = False
+                try:
+                    ok = bool(future.result())
+                except Exception as e:
+                    self.log(f"ERROR: Camera {index} check raised: {e}")
+                    ok, raised = False, True
+                if late:
+                    # A check that blew its deadline is a failure whatever it returned; the
+                    # monitor's own status may say ok, so overwrite it now that it is done
+                    self.log(f"WARN: Camera {index} check returned after "
+                             f"{time.time() - started:.0f}s; counted as failed")
+                    ok = False
+                if raised or late:
+                    # The monitor never recorded this failure (or recorded a pass), so its
+                    # scheduler would otherwise resubmit at once or keep the healthy interval
+                    self.monitors[index].scheduler.record(False)
+                if not ok:
+                    self.monitors[index].write_status(False, None)
+                self._record(index, "ok" if ok else "failed", ok, started)
+                due[index] = now + self.monitors[index].scheduler.next_delay()
+                changed = True
+            elif now >= deadline and future not in timed_out:
+                timed_out.add(future)
+                self.log(f"ERROR: Camera {index} check exceeded {self.check_timeout:.0f}s")
+                self._record(index, "timeout", False, started)
+                changed = True
+        return changed
+
+    def run(self, duration: float | None = None) -> None:
+        """Schedule checks until stop() is called (or `duration` seconds have passed)."""
+        start = time.monotonic()
+        count = len(self.monitors)
+        # Stagger first checks evenly across one interval
+        due = {index: start + i * self.interval / count for i, index in enumerate(self.monitors)}
+        running = {}  # future -> (index, started wall time, deadline)
+        timed_out = set()
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet-check")
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if duration is not None and now - start >= duration:
+                    break
+                busy = {index for index, _, _ in running.values()}
+                # Most overdue first, so a slow camera can't starve the others of workers
+                for index, when in sorted(due.items(), key=lambda item: item[1]):
+                    if when <= now and index not in busy and len(running) < self.max_workers:
+                        running[pool.submit(self._run_check, index)] = (index, time.time(), now + self.check_timeout)
+                        due[index] = float("inf")  # rescheduled when the check finishes
+                        self.results[index]["state"] = "running"
+
+                changed = self._collect(running, timed_out, due, now)
+                if self.telemetry is not None and self.telemetry.poll() is not None:
+                    self.log(f"INFO: Process {self.telemetry.summary()}")
+                    changed = True
+                    if self.telemetry.restart_reason:
+                        self.log(f"WARN: Resource limit crossed ({self.telemetry.restart_reason}); restart requested")
+                        break
+                if changed:
+                    self.write_fleet_status()
+
+                # Sleep until the next due check, deadline or completion
+                busy = {index for index, _, _ in running.values()}
+                wake = min([d for i, d in due.items() if i not in busy] +
+                           [deadline for f, (_, _, deadline) in running.items() if f not in timed_out] +
+                           [now + self.interval])
+                if running:
+                    wait(list(running), timeout=max(0.0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+                else:
+                    self._stop.wait(max(0.0, wake - time.monotonic()))
+        finally:
+            if running:
+                self.log(f"INFO: Waiting up to {self.check_timeout:.0f}s for {len(running)} running check(s)")
+                wait(list(running), timeout=self.check_timeout)
+                self._collect(running, timed_out, due, time.monotonic())
+            self.write_fleet_status()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        for monitor in self.monitors.values():
+            monitor.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Monitor several cameras from one process")
+    p.add_argument("--cameras", type=int, nargs="+", default=[0], help="Camera indices (default 0)")
+    p.add_argument("--config", default=None,
+                   help="JSON file with a list of per-camera CameraMonitor options (overrides --cameras)")
+    p.add_argument("--interval", type=float, default=5.0, help="Base seconds between checks of each camera (default 5)")
+    p.add_argument("--workers", type=int, default=4, help="Maximum concurrent checks (default 4)")
+    p.add_argument("--jitter", type=float, default=0.1, help="Random +/- fraction of the interval (default 0.1)")
+    p.add_argument("--timeout", type=float, default=30.0, help="Seconds before a check is reported as timed out")
+    add_telemetry_args(p)
+    args = p.parse_args()
+
+    cameras = args.cameras
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as fp:
+            cameras = json.load(fp)
+
+    fleet = FleetMonitor(cameras, interval=args.interval, max_workers=args.workers,
+                         jitter=args.jitter, check_timeout=args.timeout, telemetry=telemetry_from_args(args))
+    fleet.log(f"=== Fleet Monitor Started ({len(fleet.monitors)} cameras) ===")
+    try:
+        fleet.run()
+    except KeyboardInterrupt:
+        fleet.log("=== Fleet Monitor Stopped ===")
+    finally:
+        fleet.close()
+    if fleet.telemetry is not None and fleet.telemetry.restart_reason:
+        fleet.log("=== Fleet Monitor Restarting ===")
+        restart_process()
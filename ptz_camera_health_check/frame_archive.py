@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Pack verification frames into one archive per day and apply a retention policy.
+
+Frames named %Y%m%d_%H%M%S.<ext> in the frames folder are packed, once their day is
+over, into <archive>/<YYYYMMDD>.zip (stored, not recompressed: the images already are)
+and optionally rendered into <archive>/<YYYYMMDD>.mp4 time-lapse. Progress is kept in
+<archive>/state.json, so each run only touches frames newer than the last archived one
+of their day. Originals are deleted only after they are archived: when older than
+--keep-days, and oldest first while the remaining originals exceed --max-mb.
+
+Usage:
+    python frame_archive.py
+    python frame_archive.py --folder monitor_frames/camera_1 --timelapse --keep-days 3 --max-mb 500
+"""
+
+import argparse
+import datetime
+import os
+import re
+import sys
+import zipfile
+
+import cv2
+import numpy as np
+
+try:
+    from .status_store import write_json_atomic
+except ImportError:  # run as a script from this folder
+    from status_store import write_json_atomic
+
+FRAME_NAME = re.compile(r"^(\d{8})_(\d{6})\.(jpg|jpeg|png|webp)$", re.IGNORECASE)
+
+
+def _load_state(path: str) -> dict:
+    try:
+        import json
+        with open(path, "r", encoding="utf-8") as fp:
+            state = json.load(fp)
+        if isinstance(state.get("days"), dict):
+            return state
+    except Exception:
+        pass
+    return {"days": {}}
+
+
+def scan_frames(folder: str) -> dict:
+    """Return {day: [(name, size), ...]} for frame files in `folder`, sorted by name (= time)."""
+    days = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            match = FRAME_NAME.match(entry.name)
+            if match and entry.is_file():
+                days.setdefault(match.group(1), []).append((entry.name, entry.stat().st_size))
+    for frames in days.values():
+        frames.sort()
+    return days
+
+
+def pack_day(folder: str, zip_path: str, names) -> int:
+    """Add `names` to the day's zip (rebuilt via a temp file, so a crash never corrupts it).
+
+    Returns the number of frames in the archive afterwards.
+    """
+    tmp_path = f"{zip_path}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as out:
+        if os.path.exists(zip_path):
+            with zipfile.ZipFile(zip_path, "r") as old:
+                for info in old.infolist():
+                    if info.filename not in names:
+                        out.writestr(info, old.read(info.filename))
+        for name in names:
+            out.write(os.path.join(folder, name), arcname=name)
+        count = len(out.infolist())
+    os.replace(tmp_path, zip_path)
+    return count
+
+
+def render_timelapse(zip_path: str, video_path: str, fps: float = 10.0, fourcc: str = "mp4v") -> int:
+    """Render every frame of a day archive, in time order, into a video. Returns frames written."""
+    writer = None
+    written = 0
+    tmp_path = video_path + ".tmp" + os.path.splitext(video_path)[1]
+    try:
+        with zipfile.ZipFile(zip_path, "r") as archive:
+            for name in sorted(archive.namelist()):
+                frame = cv2.imdecode(np.frombuffer(archive.read(name), dtype=np.uint8), cv2.IMREAD_COLOR)
+                if frame is None:
+                    continue
+                if writer is None:
+                    size = (frame.shape[1], frame.shape[0])
+                    writer = cv2.VideoWriter(tmp_path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+                    if not writer.isOpened():
+                        return 0
+                if (frame.shape[1], frame.shape[0]) != size:
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                writer.write(frame)
+                written += 1
+    finally:
+        if writer is not None:
+            writer.release()
+    if written:
+        os.replace(tmp_path, video_path)
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    return written
+
+
+def read_archived_frame(archive_dir: str, name: str) -> bytes | None:
+    """Return the encoded bytes of an archived frame by its original file name."""
+    match = FRAME_NAME.match(name)
+    if not match:
+        return None
+    try:
+        with zipfile.ZipFile(os.path.join(archive_dir, f"{match.group(1)}.zip"), "r") as archive:
+            return archive.read(name)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def compact(folder: str, archive_dir: str | None = None, timelapse: bool = False, fps: float = 10.0,
+            keep_days: float | None = 7.0, max_mb: float | None = None, today: str | None = None,
+            log=print) -> dict:
+    """Archive new frames of finished days, render time-lapses and apply retention.
+
+    Returns a summary dict (frames archived, days packed, originals deleted, bytes freed).
+    """
+    archive_dir = archive_dir or os.path.join(folder, "archive")
+    os.makedirs(archive_dir, exist_ok=True)
+    state_path = os.path.join(archive_dir, "state.json")
+    state = _load_state(state_path)
+    today = today or datetime.date.today().strftime("%Y%m%d")
+    summary = {"archived": 0, "days_packed": [], "timelapses": [], "deleted": 0, "freed_bytes": 0}
+
+    days = scan_frames(folder)
+    for day in sorted(days):
+        if day >= today:
+            continue  # still being written to
+        info = state["days"].setdefault(day, {"count": 0, "last": "", "timelapse": None})
+        new = [name for name, _ in days[day] if name > info["last"]]
+        if not new:
+            continue
+        zip_path = os.path.join(archive_dir, f"{day}.zip")
+        info["count"] = pack_day(folder, zip_path, new)
+        info["last"] = new[-1]
+        info["bytes"] = os.path.getsize(zip_path)
+        info["timelapse"] = None  # (re)render below if requested
+        summary["archived"] += len(new)
+        summary["days_packed"].append(day)
+        # Save progress per day so an interrupted run doesn't repack it
+        write_json_atomic(state_path, state)
+        log(f"INFO: Archived {len(new)} frames of {day} ({info['count']} total) to {zip_path}")
+
+    if timelapse:
+        for day, info in sorted(state["days"].items()):
+            if info.get("timelapse") or not info.get("count"):
+                continue
+            video_name = f"{day}.mp4"
+            written = render_timelapse(os.path.join(archive_dir, f"{day}.zip"),
+                                       os.path.join(archive_dir, video_name), fps=fps)
+            if written:
+                info["timelapse"] = video_name
+                summary["timelapses"].append(day)
+                write_json_atomic(state_path, state)
+                log(f"INFO: Rendered {written}-frame time-lapse {video_name}")
+
+    # Retention: only originals already in an archive are ever deleted
+    archived = [(name, size) for day, frames in sorted(days.items())
+                for name, size in frames if name <= state["days"].get(day, {}).get("last", "")]
+    remaining = sum(size for frames in days.values() for _, size in frames)
+    cutoff = None
+    if keep_days is not None:
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=keep_days)).strftime("%Y%m%d_%H%M%S")
+    for name, size in archived:  # oldest first
+        too_old = cutoff is not None and name[:15] < cutoff
+        too_big = max_mb is not None and remaining > max_mb * 1024 * 1024
+        if not (too_old or too_big):
+            break
+        try:
+            os.remove(os.path.join(folder, name))
+        except OSError:
+            continue
+        remaining -= size
+        summary["deleted"] += 1
+        summary["freed_bytes"] += size
+    if summary["deleted"]:
+        log(f"INFO: Deleted {summary['deleted']} archived originals ({summary['freed_bytes'] // 1024} KB)")
+    return summary
+
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--folder", default=os.path.join(base_dir, "monitor_frames"), help="Frames folder")
+    p.add_argument("--archive-dir", default=None, help="Archive folder (default <folder>/archive)")
+    p.add_argument("--timelapse", action="store_true", help="Also render a time-lapse video per archived day")
+    p.add_argument("--fps", type=float, default=10.0, help="Time-lapse frame rate (default 10)")
+    p.add_argument("--keep-days", type=float, default=7.0,
+                   help="Delete archived originals older than this many days (default 7; negative keeps all)")
+    p.add_argument("--max-mb", type=float, default=None,
+                   help="Also delete the oldest archived originals while originals exceed this size")
+    args = p.parse_args()
+
+    result = compact(args.folder, args.archive_dir, timelapse=args.timelapse, fps=args.fps,
+                     keep_days=None if args.keep_days < 0 else args.keep_days, max_mb=args.max_mb)
+    print(f"Archived {result['archived']} frames ({len(result['days_packed'])} days), "
+          f"{len(result['timelapses'])} time-lapses, deleted {result['deleted']} originals")
+    sys.exit(0)
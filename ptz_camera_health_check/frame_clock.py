@@ -0,0 +1,116 @@
+import collections
+import statistics
+import time
+from typing import NamedTuple
+
+import cv2
+
+# Measured intervals needed before gaps are judged, and how far beyond the median
+# interval a gap must be to count as dropped frames
+MIN_INTERVALS = 5
+DROP_GAP = 1.8
+
+
+class FrameStamp(NamedTuple):
+    seq: int  # position in the camera's stream; skips by the number of frames dropped
+    timestamp: float  # capture time, seconds on the time.monotonic() scale
+    source: str  # "pos_msec" (backend timestamp) or "host" (when read() returned)
+    dropped: int  # frames missing between the previous stamp and this one
+
+
+class FrameClock:
+    """Give each frame read a capture timestamp and sequence number, and count drops.
+
+    Call `stamp(cap)` right after every successful read. The capture time comes from
+    `CAP_PROP_POS_MSEC` while the backend reports increasing values (mapped onto the
+    monotonic clock), else from the host clock when read() returned, which also includes
+    read latency. The expected interval is the median of the recent measured intervals
+    (after MIN_INTERVALS of them; no drops are counted before that), and a gap longer
+    than DROP_GAP expected intervals counts the missing frames as dropped. The backend's
+    `nominal_fps` is only reported: many cameras claim 30 fps and deliver 15 in low
+    light, which would otherwise make every other frame look dropped.
+
+    `reset()` marks a deliberate break (the device was reopened, or reads paused
+    between health checks), so the next interval isn't counted as a gap.
+    """
+
+    def __init__(self, nominal_fps: float | None = None, window: int = 300, clock=time.monotonic) -> None:
+        self.clock = clock
+        self.window = window
+        self.seq = 0
+        self.frames = 0
+        self.dropped = 0
+        self.last: FrameStamp | None = None
+        self._intervals = collections.deque(maxlen=window)  # per frame, gaps split over the drops
+        self._raw_intervals = collections.deque(maxlen=window)
+        self._offset = None
+        self._last_pos = None
+        self.reset(nominal_fps)
+
+    def reset(self, nominal_fps: float | None = None) -> None:
+        """Start a new run of consecutive reads; totals are kept."""
+        # Backends report 0/-1 when they don't know, some report nonsense like 1000
+        self.nominal_fps = nominal_fps if nominal_fps and 1.0 <= nominal_fps <= 240.0 else None
+        self._prev = None
+
+    def expected_interval(self) -> float | None:
+        # Raw intervals, so gaps already split into drops don't pull the median down
+        if len(self._raw_intervals) >= MIN_INTERVALS:
+            return statistics.median(self._raw_intervals)
+        return None
+
+    def stamp(self, cap=None) -> FrameStamp:
+        host = self.clock()
+        pos = None
+        if cap is not None:
+            try:
+                pos = cap.get(cv2.CAP_PROP_POS_MSEC)
+            except Exception:
+                pos = None
+        if pos is not None and pos > 0 and (self._last_pos is None or pos > self._last_pos):
+            if self._offset is None or self._prev is None or self._prev.source != "pos_msec":
+                self._offset = host - pos / 1000.0
+            timestamp, source = self._offset + pos / 1000.0, "pos_msec"
+            self._last_pos = pos
+        else:
+            timestamp, source = host, "host"
+            self._last_pos = None
+
+        dropped = 0
+        prev = self._prev
+        if prev is not None and prev.source == source and timestamp > prev.timestamp:
+            interval = timestamp - prev.timestamp
+            expected = self.expected_interval()
+            if expected and interval > DROP_GAP * expected:
+                dropped = max(0, round(interval / expected) - 1)
+            # Keep gaps out of the jitter window; they are accounted for as drops
+            self._intervals.append(interval / (dropped + 1))
+            self._raw_intervals.append(interval)
+        self.seq += 1 + dropped
+        self.frames += 1
+        self.dropped += dropped
+        self.last = self._prev = FrameStamp(self.seq, timestamp, source, dropped)
+        return self.last
+
+    def metrics(self) -> dict:
+        """Totals plus interval statistics over the last `window` frames (milliseconds)."""
+        intervals = list(self._intervals)
+        mean = statistics.fmean(intervals) if intervals else None
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "drop_rate": round(self.dropped / (self.frames + self.dropped), 4) if self.frames else 0.0,
+            "fps": round(1.0 / mean, 2) if mean else None,
+            "nominal_fps": self.nominal_fps,
+            "interval_ms": round(mean * 1000.0, 2) if mean else None,
+            "jitter_ms": round(statistics.pstdev(intervals) * 1000.0, 2) if len(intervals) >= 2 else None,
+            "max_interval_ms": round(max(self._raw_intervals) * 1000.0, 2) if self._raw_intervals else None,
+            "timestamp_source": self.last.source if self.last is not None else None,
+        }
+
+    def summary(self) -> str:
+        m = self.metrics()
+        fps = f"{m['fps']:.1f}" if m["fps"] else "n/a"
+        jitter = f"{m['jitter_ms']:.1f}ms" if m["jitter_ms"] is not None else "n/a"
+        return (f"frames={m['frames']} dropped={m['dropped']} ({m['drop_rate'] * 100:.1f}%) fps={fps} "
+                f"jitter={jitter} ({m['timestamp_source']} timestamps)")
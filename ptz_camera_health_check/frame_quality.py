@@ -0,0 +1,221 @@
+import time
+import zlib
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+
+class FrameQuality(NamedTuple):
+    """Compact result of analyze_frame(); cheap to log, compare and aggregate.
+
+    Metrics that were not computed because an earlier check already decided the result
+    are -1. `ok` is False only for unusable frames (empty/black/flat/no edges); blur and
+    overexposure are reported as flags without failing the frame.
+    """
+
+    ok: bool
+    reason: str
+    mean: float = -1.0
+    std: float = -1.0
+    pct_dark: float = -1.0
+    pct_bright: float = -1.0
+    edges: int = -1
+    blur: float = -1.0
+    blurry: bool = False
+    overexposed: bool = False
+
+    def summary(self) -> str:
+        flags = "".join(f" {name}" for name in ("blurry", "overexposed") if getattr(self, name))
+        return (f"{'ok' if self.ok else self.reason} mean={self.mean:.1f} std={self.std:.1f} "
+                f"dark={self.pct_dark:.2f} bright={self.pct_bright:.2f} edges={self.edges} "
+                f"blur={self.blur:.0f}{flags}")
+
+
+def thumbnail_gray(frame, width: int = 160) -> np.ndarray:
+    """Downsample (INTER_AREA) before converting to gray so later passes touch few pixels."""
+    arr = np.asarray(frame)
+    h, w = arr.shape[:2]
+    if w > width:
+        arr = cv2.resize(arr, (width, max(1, int(h * width / float(w)))), interpolation=cv2.INTER_AREA)
+    if arr.ndim == 3:
+        if arr.shape[2] == 1:
+            return arr[:, :, 0]
+        return cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
+    return arr
+
+
+def analyze_frame(
+    frame,
+    *,
+    thumb_width: int = 160,
+    mean_thresh: float = 12.0,
+    pct_dark_thresh: float = 0.98,
+    std_thresh: float = 3.0,
+    edge_thresh: int = 20,
+    bright_level: int = 250,
+    pct_bright_thresh: float = 0.5,
+    blur_thresh: float = 20.0,
+) -> FrameQuality:
+    """Grade a frame from cheapest to most expensive check, exiting at the first failure.
+
+    Works on a `thumb_width` gray thumbnail. `edge_thresh` is given for a full-resolution
+    frame and scaled by the thumbnail's share of the pixels; `blur_thresh` is the minimum
+    Laplacian variance on the thumbnail.
+    """
+    if frame is None:
+        return FrameQuality(False, "none")
+    try:
+        arr = np.asarray(frame)
+    except Exception:
+        return FrameQuality(False, "not_array")
+    if arr.size == 0 or arr.ndim < 2:
+        return FrameQuality(False, "empty")
+
+    full_pixels = arr.shape[0] * arr.shape[1]
+    gray = thumbnail_gray(arr, thumb_width)
+
+    # One pass for both mean and standard deviation
+    m, sd = cv2.meanStdDev(gray)
+    mean = float(m[0, 0])
+    std = float(sd[0, 0])
+    if mean < mean_thresh:
+        return FrameQuality(False, "black", mean, std)
+    if std < std_thresh:
+        # A uniformly saturated frame is blown out rather than merely featureless
+        if mean >= bright_level:
+            return FrameQuality(False, "overexposed", mean, std, overexposed=True)
+        return FrameQuality(False, "flat", mean, std)
+
+    hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+    total = float(gray.size)
+    pct_dark = float(hist[: int(mean_thresh) + 1].sum()) / total
+    pct_bright = float(hist[bright_level:].sum()) / total
+    if pct_dark >= pct_dark_thresh:
+        return FrameQuality(False, "dark", mean, std, pct_dark, pct_bright)
+    overexposed = pct_bright >= pct_bright_thresh
+
+    edges = int(np.count_nonzero(cv2.Canny(gray, 50, 150)))
+    if edges <= edge_thresh * gray.size / float(full_pixels):
+        return FrameQuality(False, "no_edges", mean, std, pct_dark, pct_bright, edges, overexposed=overexposed)
+
+    blur = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+    return FrameQuality(True, "", mean, std, pct_dark, pct_bright, edges, blur,
+                        blurry=blur < blur_thresh, overexposed=overexposed)
+
+
+def quick_brightness(frame, step: int = 8) -> float:
+    """Mean intensity over every `step`-th pixel in each direction (~1/64 of the frame)."""
+    return float(np.asarray(frame)[::step, ::step].mean())
+
+
+class ExposureConvergence:
+    """Decide when a freshly opened camera's auto-exposure has settled.
+
+    Feed warmup frames to `update()`; it returns True once the last `stable_frames`
+    brightness values are within `tolerance` levels of each other and not black
+    (below `min_level`). A stable black image (sensor still starting) keeps waiting.
+    """
+
+    def __init__(self, stable_frames: int = 3, tolerance: float = 2.0, min_level: float = 12.0) -> None:
+        self.stable_frames = stable_frames
+        self.tolerance = tolerance
+        self.min_level = min_level
+        self.levels = []
+
+    def update(self, frame) -> bool:
+        self.levels.append(quick_brightness(frame))
+        recent = self.levels[-self.stable_frames:]
+        return (
+            len(recent) == self.stable_frames
+            and min(recent) >= self.min_level
+            and max(recent) - min(recent) <= self.tolerance
+        )
+
+    @property
+    def level(self) -> float | None:
+        return self.levels[-1] if self.levels else None
+
+
+def average_hash(gray) -> int:
+    """64-bit average hash: 8x8 area-averaged blocks, one bit per block above the mean."""
+    blocks = cv2.resize(np.asarray(gray, dtype=np.float32), (8, 8), interpolation=cv2.INTER_AREA)
+    bits = (blocks > blocks.mean()).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class FrozenFeedDetector:
+    """Flag a feed that keeps delivering the same image.
+
+    Each frame is reduced to a 64-bit average hash plus a CRC of its gray thumbnail. Two
+    consecutive frames match when the hashes are within `max_distance` bits and, with
+    `exact=True` (default), the thumbnails are byte-identical. Sensor noise makes a live
+    but static scene differ slightly from frame to frame, while a stuck driver buffer
+    repeats exactly, so `exact` avoids flagging a quiet room at night. The feed is
+    frozen once frames have matched for `max_static_seconds`.
+
+    The last `history` hashes and timestamps are kept in fixed-size NumPy ring buffers.
+    """
+
+    def __init__(self, max_static_seconds: float = 60.0, history: int = 32, max_distance: int = 0,
+                 exact: bool = True, clock=time.time) -> None:
+        self.max_static_seconds = max_static_seconds
+        self.max_distance = max_distance
+        self.exact = exact
+        self.clock = clock
+        self.hashes = np.zeros(history, dtype=np.uint64)
+        self.times = np.zeros(history, dtype=np.float64)
+        self.count = 0
+        self._last_crc = None
+        self.static_since = None
+
+    @property
+    def last_hash(self) -> int | None:
+        if self.count == 0:
+            return None
+        return int(self.hashes[(self.count - 1) % len(self.hashes)])
+
+    @property
+    def static_seconds(self) -> float:
+        if self.static_since is None or self.count == 0:
+            return 0.0
+        return float(self.times[(self.count - 1) % len(self.times)] - self.static_since)
+
+    def update(self, frame, thumb_width: int = 160) -> bool:
+        """Add a verified frame; return True if the feed is considered frozen."""
+        gray = thumbnail_gray(frame, thumb_width)
+        h = average_hash(gray)
+        crc = zlib.crc32(np.ascontiguousarray(gray))
+        now = self.clock()
+
+        prev = self.last_hash
+        matched = (
+            prev is not None
+            and hamming(h, prev) <= self.max_distance
+            and (not self.exact or crc == self._last_crc)
+        )
+        if matched:
+            if self.static_since is None:
+                self.static_since = float(self.times[(self.count - 1) % len(self.times)])
+        else:
+            self.static_since = None
+
+        slot = self.count % len(self.hashes)
+        self.hashes[slot] = h
+        self.times[slot] = now
+        self.count += 1
+        self._last_crc = crc
+        return self.is_frozen
+
+    @property
+    def is_frozen(self) -> bool:
+        return self.static_since is not None and self.static_seconds >= self.max_static_seconds
+
+    def reset(self) -> None:
+        self.count = 0
+        self._last_crc = None
+        self.static_since = None
@@ -0,0 +1,126 @@
+import os
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+try:
+    from .frame_quality import average_hash, hamming, thumbnail_gray
+except ImportError:  # run as a script from this folder
+    from frame_quality import average_hash, hamming, thumbnail_gray
+
+# File extension -> cv2 quality parameter
+QUALITY_PARAMS = {"jpg": cv2.IMWRITE_JPEG_QUALITY, "webp": cv2.IMWRITE_WEBP_QUALITY}
+
+
+class SaveResult(NamedTuple):
+    """Outcome of one FrameSaver job, passed to its callback on the encoder thread."""
+
+    status: str  # "saved", "duplicate" or "failed"
+    path: str
+    key: str
+    hash: int | None = None
+    distance: int | None = None
+    encode_ms: float = 0.0
+    bytes: int = 0
+    error: str = ""
+
+
+class FrameSaver:
+    """Encode and write verification frames on a background thread.
+
+    Each frame is encoded once (cv2.imencode) and written in a single write. Before
+    encoding, its 64-bit average hash is compared with the last frame saved under the
+    same `key` (e.g. the PTZ effect name); frames within `dedup_distance` bits are
+    skipped as near-duplicates. `dedup_distance=None` saves everything.
+
+    At most `max_pending` frames wait for the encoder; further submissions are refused
+    so a slow disk never backs up into the check loop.
+    """
+
+    def __init__(self, fmt: str = "jpg", quality: int = 90, dedup_distance: int | None = 4,
+                 max_pending: int = 4) -> None:
+        fmt = fmt.lower().lstrip(".").replace("jpeg", "jpg")
+        if fmt not in QUALITY_PARAMS:
+            raise ValueError(f"Unsupported frame format: {fmt} (use one of {', '.join(QUALITY_PARAMS)})")
+        self.fmt = fmt
+        self.quality = int(quality)
+        self.dedup_distance = dedup_distance
+        self.saved = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._last_hashes = {}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="frame-saver", daemon=True)
+        self._thread.start()
+
+    @property
+    def extension(self) -> str:
+        return f".{self.fmt}"
+
+    def submit(self, frame, path_base: str, key: str = "", callback=None) -> bool:
+        """Queue `frame` to be written to `path_base` + extension. Returns False if the queue is full.
+
+        The frame is copied, so the caller may reuse its buffer immediately.
+        """
+        try:
+            self._queue.put_nowait((np.array(frame, copy=True), path_base + self.extension, key, callback))
+            return True
+        except queue.Full:
+            return False
+
+    def _save(self, frame, path: str, key: str) -> SaveResult:
+        h = average_hash(thumbnail_gray(frame))
+        last = self._last_hashes.get(key)
+        if last is not None and self.dedup_distance is not None:
+            distance = hamming(h, last)
+            if distance <= self.dedup_distance:
+                self.duplicates += 1
+                return SaveResult("duplicate", path, key, h, distance)
+        else:
+            distance = None
+
+        t0 = time.perf_counter()
+        try:
+            ok, buf = cv2.imencode(self.extension, frame, [QUALITY_PARAMS[self.fmt], self.quality])
+            if not ok:
+                raise ValueError("encoder returned no data")
+            encode_ms = (time.perf_counter() - t0) * 1000.0
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as fp:
+                fp.write(buf.tobytes())
+        except Exception as e:
+            self.failed += 1
+            return SaveResult("failed", path, key, h, distance, error=str(e))
+        self._last_hashes[key] = h
+        self.saved += 1
+        return SaveResult("saved", path, key, h, distance, encode_ms, len(buf))
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                frame, path, key, callback = job
+                result = self._save(frame, path, key)
+                if callback is not None:
+                    try:
+                        callback(result)
+                    except Exception:
+                        pass
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Block until every queued frame has been handled."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Finish queued frames and stop the encoder thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
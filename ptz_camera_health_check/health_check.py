@@ -1,14 +1,32 @@
-import cv2
+import argparse
+import datetime
+import json
+import os
+import platform
 import sys
+import threading
+import time
+
+import cv2
+
+try:
+    from .capture_backend import OpenCVBackend
+except ImportError:  # run as a script from this folder
+    from capture_backend import OpenCVBackend
 
 # Quick health check: attempts to open index 0 with DirectShow, then MSMF
 
-def try_open(index):
+# Camera APIs worth probing, in preference order (others in the registry are niche)
+PROBE_APIS = ("DSHOW", "MSMF", "V4L2", "AVFOUNDATION")
+
+
+def try_open(index, capture_backend=None):
+    capture = capture_backend if capture_backend is not None else OpenCVBackend()
     backends = [getattr(cv2, "CAP_DSHOW", None), getattr(cv2, "CAP_MSMF", None)]
     for be in backends:
         if be is None:
             continue
-        cap = cv2.VideoCapture(index, be)
+        cap = capture.open(index, be)
         if cap.isOpened():
             ret, frame = cap.read()
             cap.release()
@@ -19,7 +37,164 @@ def try_open(index):
                 print(f"ERROR: open ok but read failed at index {index}, backend {be}")
     return False
 
+
+def available_backends(names=None) -> list:
+    """Return [(name, cv2 API constant)] to probe: `names`, or the camera APIs this OpenCV build has."""
+    if names:
+        wanted = [n.upper() for n in names]
+    else:
+        wanted = list(PROBE_APIS[:2])
+        try:
+            registry = cv2.videoio_registry
+            built = {registry.getBackendName(b) for b in registry.getCameraBackends()}
+            wanted = [n for n in PROBE_APIS if n in built] or wanted
+        except Exception:
+            pass
+    return [(n, getattr(cv2, f"CAP_{n}")) for n in wanted if hasattr(cv2, f"CAP_{n}")]
+
+
+def _probe_result(index: int, name: str, **fields) -> dict:
+    result = {"index": index, "backend": name, "opened": False, "open_ms": None,
+              "first_frame_ms": None, "width": None, "height": None, "timeout": False}
+    result.update(fields)
+    return result
+
+
+def probe_one(index: int, name: str, api, capture) -> dict:
+    """Open (index, api), time the open and the first frame, and release it."""
+    result = _probe_result(index, name)
+    t0 = time.perf_counter()
+    cap = capture.open(index, api)
+    try:
+        if not cap.isOpened():
+            return result
+        result["opened"] = True
+        result["open_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+        t1 = time.perf_counter()
+        ret, frame = cap.read()
+        if ret and frame is not None:
+            result["first_frame_ms"] = round((time.perf_counter() - t1) * 1000.0, 1)
+            result["height"], result["width"] = frame.shape[:2]
+    finally:
+        cap.release()
+    return result
+
+
+def probe(indices, backends=None, timeout: float = 2.0, capture_backend=None) -> dict:
+    """Probe every (index, backend) pair, allowing `timeout` seconds per pair.
+
+    Indices are probed concurrently, each on its own daemon thread so a hung driver
+    call can't block the caller. The backends of one index run one after another on
+    that thread, since DirectShow and MSMF opening the same device at once contend for
+    it. Each pair is allowed `timeout` seconds from when it starts; one that takes
+    longer is reported with "timeout": true and not counted as a working camera, even
+    if it returned. An index's thread is waited for until both `timeout` x backends
+    and its current pair's own deadline have passed; pairs unfinished by then (hung,
+    or queued behind a hung one) are reported as timed out too.
+    """
+    capture = capture_backend if capture_backend is not None else OpenCVBackend()
+    apis = available_backends(backends)
+    pairs = [(index, name, api) for index in indices for name, api in apis]
+    results = [None] * len(pairs)
+    starts = [None] * len(pairs)
+
+    def run(first_slot, index):
+        for slot in range(first_slot, first_slot + len(apis)):
+            _, name, api = pairs[slot]
+            starts[slot] = time.perf_counter()
+            try:
+                result = probe_one(index, name, api, capture)
+            except Exception as e:
+                result = _probe_result(index, name, error=str(e))
+            if time.perf_counter() - starts[slot] > timeout:
+                result["timeout"] = True
+            results[slot] = result
+
+    def pair_deadline(first_slot):
+        """Deadline of the pair an index's thread is on (None once all its pairs are done)."""
+        for slot in range(first_slot, first_slot + len(apis)):
+            if results[slot] is None:
+                # Not started yet means the thread is just moving on to it
+                return (starts[slot] or time.perf_counter()) + timeout
+        return None
+
+    started = time.perf_counter()
+    threads = []
+    for i, index in enumerate(indices):
+        thread = threading.Thread(target=run, args=(i * len(apis), index), daemon=True, name=f"probe-{index}")
+        thread.start()
+        threads.append(thread)
+    group_deadline = started + timeout * len(apis)
+    for i, thread in enumerate(threads):
+        while thread.is_alive():
+            deadline = pair_deadline(i * len(apis))
+            if deadline is None:
+                break
+            remaining = max(deadline, group_deadline) - time.perf_counter()
+            if remaining <= 0:
+                break
+            thread.join(remaining)
+
+    # Copy, so a hung thread finishing later can't change the report
+    results = [r if r is not None else _probe_result(index, name, timeout=True)
+               for r, (index, name, _) in zip(list(results), pairs)]
+
+    cameras = {}
+    for r in results:
+        if r["opened"] and r.get("first_frame_ms") is not None and not r["timeout"]:
+            cameras.setdefault(r["index"], []).append(r)
+    return {
+        "host": platform.node(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 1),
+        "timeout_s": timeout,
+        "results": results,
+        "cameras": [
+            {"index": index,
+             "backends": [r["backend"] for r in ok],
+             "fastest": min(ok, key=lambda r: r["open_ms"] + r["first_frame_ms"])["backend"]}
+            for index, ok in sorted(cameras.items())
+        ],
+    }
+
+
+def _parse_indices(value: str) -> list:
+    """'0-5' -> [0..5]; '0,2,4' -> [0, 2, 4]."""
+    indices = []
+    for part in value.split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            indices.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            indices.append(int(part))
+    return indices
+
+
 if __name__ == "__main__":
-    idx = int(sys.argv[1]) if len(sys.argv) > 1 else 0
-    ok = try_open(idx)
-    sys.exit(0 if ok else 1)
+    p = argparse.ArgumentParser(description="Check that a camera opens and delivers a frame")
+    p.add_argument("index", nargs="?", type=int, default=0, help="Camera index for the quick check (default 0)")
+    p.add_argument("--probe", action="store_true",
+                   help="Probe indices (concurrently) x backends (in turn) and print JSON instead")
+    p.add_argument("--indices", type=_parse_indices, default=list(range(6)), help="Indices to probe (default 0-5)")
+    p.add_argument("--backends", nargs="+", default=None,
+                   help="Backends to probe, e.g. dshow msmf (default: camera APIs in this OpenCV build)")
+    p.add_argument("--timeout", type=float, default=2.0, help="Hard timeout per probe in seconds (default 2)")
+    p.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = p.parse_args()
+
+    if not args.probe:
+        ok = try_open(args.index)
+        sys.exit(0 if ok else 1)
+
+    report = probe(args.indices, args.backends, timeout=args.timeout)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text)
+    sys.stdout.flush()
+    code = 0 if report["cameras"] else 1
+    if any(r["timeout"] for r in report["results"]):
+        # A hung driver call may never return; don't wait for it at interpreter shutdown
+        os._exit(code)
+    sys.exit(code)
@@ -1,14 +1,43 @@
 import cv2
 import time
 import datetime
+import logging
 import os
-import subprocess
+import threading
 import numpy as np
 
+try:
+    from .capture_backend import CaptureBackend, FeedBackend, OpenCVBackend
+    from .device_presence import CachedPresenceProvider, DevicePresenceProvider, default_presence_provider
+    from .digital_ptz import DigitalPTZ
+    from .frame_clock import FrameClock
+    from .frame_saver import FrameSaver
+    from .frame_quality import ExposureConvergence, FrameQuality, FrozenFeedDetector, analyze_frame
+    from .ptz_session import PTZSession
+    from .queued_log import start_queued_logger
+    from .scheduler import AdaptiveScheduler
+    from .status_store import CheckHistory, StatusStore, write_json_atomic
+    from .telemetry import ProcessTelemetry, add_telemetry_args, restart_process, telemetry_from_args
+except ImportError:  # run as a script from this folder
+    from capture_backend import CaptureBackend, FeedBackend, OpenCVBackend
+    from device_presence import CachedPresenceProvider, DevicePresenceProvider, default_presence_provider
+    from digital_ptz import DigitalPTZ
+    from frame_clock import FrameClock
+    from frame_saver import FrameSaver
+    from frame_quality import ExposureConvergence, FrameQuality, FrozenFeedDetector, analyze_frame
+    from ptz_session import PTZSession
+    from queued_log import start_queued_logger
+    from scheduler import AdaptiveScheduler
+    from status_store import CheckHistory, StatusStore, write_json_atomic
+    from telemetry import ProcessTelemetry, add_telemetry_args, restart_process, telemetry_from_args
+
 
 class CameraMonitor:
     """Monitor a USB camera on Windows 11 with robust backend selection and logging."""
 
+    # Backend names used in logs/status/cache -> cv2 API constant names
+    BACKEND_APIS = {"DSHOW": "CAP_DSHOW", "MSMF": "CAP_MSMF"}
+
     def __init__(
         self,
         camera_index: int = 0,
@@ -20,14 +49,72 @@ class CameraMonitor:
         height: int = 720,
         use_mjpg: bool = True,
         enable_ptz_cycling: bool = True,
+        persistent_session: bool = False,
+        session_max_failures: int = 3,
+        probe_backoff_min: float = 10.0,
+        probe_backoff_max: float = 600.0,
+        presence_provider: DevicePresenceProvider | None = None,
+        presence_ttl: float = 300.0,
+        frozen_after: float = 60.0,
+        log_max_bytes: int = 10 * 1024 * 1024,
+        log_backup_count: int = 5,
+        log_rotate_when: str | None = None,
+        status_file: str = "status.json",
+        status_heartbeat: float = 60.0,
+        history_file: str = "history.sqlite3",
+        history_keep_days: float | None = 90.0,
+        discovery_cache_file: str = "discovery_cache.json",
+        probe_fallback_indices: bool = True,
+        log_console: bool = True,
+        frame_format: str = "jpg",
+        frame_quality: int = 90,
+        frame_dedup_distance: int | None = 4,
+        adaptive_interval: bool = True,
+        max_check_interval: float = 60.0,
+        fast_recheck_interval: float = 1.0,
+        backoff_max_interval: float = 300.0,
+        capture_backend: CaptureBackend | None = None,
+        warmup_max_frames: int = 30,
+        warmup_max_seconds: float = 3.0,
+        warmup_stable_frames: int = 3,
+        warmup_tolerance: float = 2.0,
+        frame_feed: str | bool | None = None,
+        feed_stale_after: float = 5.0,
+        telemetry: ProcessTelemetry | None = None,
     ) -> None:
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.camera_index = camera_index
+        # Where capture handles come from: cv2.VideoCapture, or a FakeBackend in tests/benchmarks.
+        # With frame_feed (a feed name, or True for the recorder's default name) frames come from
+        # the motion recorder's shared-memory feed and this process never opens the device.
+        if capture_backend is None:
+            if frame_feed:
+                capture_backend = FeedBackend(frame_feed if isinstance(frame_feed, str) else None,
+                                              stale_after=feed_stale_after)
+            else:
+                capture_backend = OpenCVBackend()
+        self.capture = capture_backend
+        self.use_feed = isinstance(self.capture, FeedBackend)
+        self.feed_info: dict | None = None
         self.log_dir = os.path.join(self.base_dir, "logs")
         os.makedirs(self.log_dir, exist_ok=True)
         self.log_file = os.path.join(self.log_dir, log_file)
+        # Console/file output runs on a background thread; see close()
+        self._logger, self._log_listener = start_queued_logger(
+            f"camera_monitor.{camera_index}.{id(self)}", self.log_file,
+            max_bytes=log_max_bytes, backup_count=log_backup_count, rotate_when=log_rotate_when,
+            console=log_console)
         self.save_dir = os.path.join(self.base_dir, save_dir)
         self.check_interval = check_interval
+        # Next-check delay: grows while healthy, fast rechecks after a failure, backoff when down.
+        # With adaptive_interval=False every check is check_interval apart.
+        if adaptive_interval:
+            self.scheduler = AdaptiveScheduler(check_interval, max_interval=max_check_interval,
+                                               fast_interval=fast_recheck_interval,
+                                               backoff_max=backoff_max_interval)
+        else:
+            self.scheduler = AdaptiveScheduler(check_interval, max_interval=check_interval, fast_checks=0,
+                                               backoff_max=check_interval, jitter=0.0)
         self.frame_save_interval = frame_save_interval
         self.width = width
         self.height = height
@@ -35,178 +122,254 @@ class CameraMonitor:
         self.last_saved = 0
         self.enable_ptz_cycling = enable_ptz_cycling
         self.ptz_cycle_index = 0
+        # last_saved and ptz_cycle_index are also updated from the FrameSaver's encoder thread
+        self._save_lock = threading.Lock()
+        # Persistent capture session: keep the device open between checks and only
+        # reopen after session_max_failures consecutive failed reads
+        self.persistent_session = persistent_session
+        self.session_max_failures = session_max_failures
+        self._session = None
+        self.session_stats = {"opens": 0, "reuses": 0, "last_open_ms": None, "consecutive_failures": 0,
+                              "last_warmup_frames": None, "last_warmup_ms": None}
+        # Warmup reads until brightness is stable for warmup_stable_frames frames, capped
+        self.warmup_max_frames = warmup_max_frames
+        self.warmup_max_seconds = warmup_max_seconds
+        self.warmup_stable_frames = warmup_stable_frames
+        self.warmup_tolerance = warmup_tolerance
+        self._warm_frame = None
+        # Capture timestamps, sequence numbers and drops of every frame read (warmup included)
+        self.frame_clock = FrameClock()
+        self.last_quality: FrameQuality | None = None
+        # Frozen feed: identical frames (by hash + thumbnail CRC) for frozen_after seconds
+        self.frozen_detector = FrozenFeedDetector(max_static_seconds=frozen_after)
+        # Status is kept in memory and written atomically on change (or every status_heartbeat
+        # seconds); every check result is appended to a SQLite history
+        self.status = StatusStore(
+            os.path.join(self.log_dir, status_file),
+            volatile_keys=("timestamp", "capture_session", "feed", "frame_feed", "quality", "latency_ms",
+                           "next_check", "process", "frame_timing"),
+            heartbeat=status_heartbeat,
+        )
+        self.history = CheckHistory(os.path.join(self.log_dir, history_file), keep_days=history_keep_days)
+        # Process resource samples (RSS, CPU, threads, handles), polled after each check
+        self.telemetry = telemetry
+        self.last_check_ms: float | None = None
+        self.last_failure: str | None = None
+        # Discovery cache: last working (backend, index), persisted so cold starts skip the probe
+        self.discovery_cache_path = os.path.join(self.log_dir, discovery_cache_file)
+        self._discovery_cache = self._load_discovery_cache()
+        self.probe_backoff_min = probe_backoff_min
+        self.probe_backoff_max = probe_backoff_max
+        # With several cameras attached, falling back to another index would check the wrong device
+        self.probe_fallback_indices = probe_fallback_indices
+        self._probe_backoff = 0.0
+        self._probe_not_before = 0.0
+        # Device presence: cached so the OS query (a PowerShell spawn on Windows) runs rarely
+        if presence_provider is None:
+            self.presence = default_presence_provider(ttl=presence_ttl)
+        elif isinstance(presence_provider, CachedPresenceProvider):
+            self.presence = presence_provider
+        else:
+            self.presence = CachedPresenceProvider(presence_provider, ttl=presence_ttl)
 
-        # PTZ cycle effects: (effect_name, effect_func, effect_args)
+        # PTZ cycle effects: (effect_name, digital PTZ steps); each renders in one resample
+        # (a resize of the crop for these single steps, warpAffine only for composed ones)
+        self.digital = DigitalPTZ()
         self.ptz_effects = [
-            ("original", None, {}),
-            ("pan_left", self.digital_pan, {"pan_offset": -1.0}),
-            ("pan_right", self.digital_pan, {"pan_offset": 1.0}),
-            ("tilt_up", self.digital_tilt, {"tilt_offset": -1.0}),
-            ("tilt_down", self.digital_tilt, {"tilt_offset": 1.0}),
-            ("zoom_2x", self.digital_zoom, {"zoom_factor": 2.0}),
-            ("zoom_3x", self.digital_zoom, {"zoom_factor": 3.0}),
-            ("zoom_out", self.digital_zoom, {"zoom_factor": 0.5}),
+            ("original", ()),
+            ("pan_left", (("pan", -1.0),)),
+            ("pan_right", (("pan", 1.0),)),
+            ("tilt_up", (("tilt", -1.0),)),
+            ("tilt_down", (("tilt", 1.0),)),
+            ("zoom_2x", (("zoom", 2.0),)),
+            ("zoom_3x", (("zoom", 3.0),)),
+            ("zoom_out", (("zoom", 0.5),)),
         ]
 
         os.makedirs(self.save_dir, exist_ok=True)
+        # Verification frames are encoded once on a background thread; near-duplicates of the
+        # last frame saved for the same effect are skipped
+        self.frame_saver = FrameSaver(fmt=frame_format, quality=frame_quality, dedup_distance=frame_dedup_distance)
 
     def log(self, msg):
-        ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        line = f"[{ts}] {msg}"
-        print(line)
-        with open(self.log_file, "a") as f:
-            f.write(line + "\n")
+        """Queue a log line; printing and file I/O happen on the listener thread."""
+        if msg.startswith(("ERROR", "FATAL")):
+            level = logging.ERROR
+        elif msg.startswith("WARN"):
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        self._logger.log(level, msg)
+
+    def close(self) -> None:
+        """Release the capture session, finish pending frame saves and stop the background logger."""
+        self.close_session()
+        self.frame_saver.close()
+        self.history.close()
+        self._log_listener.stop()
 
     def apply_ptz_effect(self, frame) -> tuple[np.ndarray, str]:
         """Apply current PTZ effect from the cycle without advancing.
 
+        The transformed frame lives in a buffer reused for the next render of the same
+        effect, and "original" returns `frame` itself.
+
         Returns:
             (transformed_frame, effect_name) tuple
         """
         if not self.enable_ptz_cycling or frame is None:
             return frame, "none"
 
-        effect_name, effect_func, effect_args = self.ptz_effects[self.ptz_cycle_index]
-
-        if effect_func is None:
-            transformed = frame.copy()
-        else:
-            transformed = effect_func(frame, **effect_args)
+        effect_name, steps = self.ptz_effects[self.ptz_cycle_index]
+        transformed = self.digital.render(frame, effect_name, steps)
 
         # Do NOT advance here; advancement happens only after a successful save
         return transformed, effect_name
 
+    def render_ptz_effects(self, frame) -> dict:
+        """Render every PTZ cycle effect of one frame in a batch.
+
+        Returns:
+            Dict of effect_name -> frame (buffers are reused by the next call).
+        """
+        if frame is None:
+            return {}
+        return self.digital.render_all(frame, self.ptz_effects)
+
     def write_status(self, ok: bool, last_frame_path: str | None = None, backend: str | None = None) -> None:
-        # Load existing status (preserve last_frame_path if caller doesn't provide one)
+        """Update the in-memory status; status.json is rewritten only when something changed.
+
+        backend and last_frame_path keep their previous values unless provided.
+        """
         try:
-            import json
-            status_path = os.path.join(self.log_dir, "status.json")
-            status = {}
-            if os.path.exists(status_path):
-                try:
-                    with open(status_path, "r", encoding="utf-8") as fp:
-                        status = json.load(fp)
-                except Exception:
-                    status = {}
-
-            # Update fields
-            status["timestamp"] = datetime.datetime.now().isoformat(timespec="seconds")
-            status["ok"] = bool(ok)
-            status["camera_index"] = self.camera_index
-            status["resolution"] = {"width": self.width, "height": self.height}
-            # Only overwrite backend if provided; else preserve existing or set default
+            fields = {
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "ok": bool(ok),
+                "camera_index": self.camera_index,
+                "resolution": {"width": self.width, "height": self.height},
+                "capture_session": {"persistent": self.persistent_session, **self.session_stats},
+                "feed": {
+                    "frozen": self.frozen_detector.is_frozen,
+                    "static_seconds": round(self.frozen_detector.static_seconds, 1),
+                    "hash": f"{self.frozen_detector.last_hash:016x}" if self.frozen_detector.last_hash is not None else None,
+                },
+            }
             if backend is not None:
-                status["backend"] = backend
-            else:
-                status.setdefault("backend", "DSHOW/MSMF")
-
-            # Preserve last_frame_path unless a non-None value is explicitly provided
+                fields["backend"] = backend
+            if self.use_feed:
+                fields["frame_feed"] = self.feed_info
             if last_frame_path is not None:
-                status["last_frame_path"] = last_frame_path
-            else:
-                status.setdefault("last_frame_path", "")
-
-            with open(status_path, "w", encoding="utf-8") as fp:
-                json.dump(status, fp, indent=2)
+                fields["last_frame_path"] = last_frame_path
+            if self.last_quality is not None:
+                fields["quality"] = {k: round(v, 3) if isinstance(v, float) else v
+                                     for k, v in self.last_quality._asdict().items()}
+            if self.last_check_ms is not None:
+                fields["latency_ms"] = round(self.last_check_ms, 1)
+            if self.frame_clock.frames:
+                fields["frame_timing"] = self.frame_clock.metrics()
+            self.status.update(fields, defaults={"backend": "DSHOW/MSMF", "last_frame_path": ""})
         except Exception:
             # Don't let status write failures crash monitoring
             pass
-    
+
     def usb_camera_connected(self) -> bool:
-        """Return True if Windows reports any imaging device attached.
+        """Return True if the OS reports a camera attached.
 
-        Uses PowerShell CIM (reliable on Windows 11) and falls back to WMIC if needed.
+        Delegates to the (TTL-cached) presence provider, so the OS is only queried every
+        presence_ttl seconds or, if the provider can report absence, after a failed
+        capture. Fails open when the OS cannot be
+        queried; the capture attempt will confirm.
         """
-        ps_cmd = (
-            "Get-CimInstance Win32_PnPEntity | "
-            "Where-Object { $_.PNPClass -eq 'Image' -or $_.Name -match 'Camera|USB' } | "
-            "Select-Object -ExpandProperty Name"
-        )
-        try:
-            output = subprocess.check_output(
-                ["powershell", "-NoProfile", "-Command", ps_cmd],
-                stderr=subprocess.DEVNULL,
-            ).decode(errors="ignore")
-            if any(len(line.strip()) > 0 for line in output.splitlines()):
-                return True
-        except Exception:
-            # Fallback to WMIC for older environments
-            try:
-                output = subprocess.check_output(
-                    "wmic path Win32_PnPEntity get Name", shell=True, stderr=subprocess.DEVNULL
-                ).decode(errors="ignore")
-                for line in output.splitlines():
-                    if "Camera" in line or "USB" in line:
-                        return True
-            except Exception:
-                pass
-        # Fail-open so monitoring continues; capture attempt will confirm
-        return True
-    
+        present = self.presence.camera_present()
+        return True if present is None else bool(present)
+
     def is_black_frame(self, frame, *, mean_thresh=12.0, pct_dark_thresh=0.98, std_thresh=3.0, edge_thresh=20):
         """Return (is_black, reasons) where reasons explains which checks failed.
 
-        Heuristics used (combination improves robustness):
+        Thin wrapper over frame_quality.analyze_frame(), which grades a downsampled
+        thumbnail and stops at the first failing heuristic:
         - mean pixel intensity below mean_thresh
-        - fraction of pixels with value <= mean_thresh is above pct_dark_thresh
         - standard deviation across pixels below std_thresh (nearly constant image)
-        - edge pixel count (Canny) below edge_thresh
+        - fraction of pixels with value <= mean_thresh is above pct_dark_thresh
+        - edge pixel count (Canny) below edge_thresh (scaled to the thumbnail)
         """
-        reasons = {}
-        if frame is None:
-            reasons['none'] = True
-            return True, reasons
+        quality = analyze_frame(frame, mean_thresh=mean_thresh, pct_dark_thresh=pct_dark_thresh,
+                                std_thresh=std_thresh, edge_thresh=edge_thresh)
+        return (not quality.ok), quality._asdict()
 
-        # Ensure numpy array
+    def _load_discovery_cache(self) -> dict | None:
         try:
-            arr = np.asarray(frame)
+            import json
+            with open(self.discovery_cache_path, "r", encoding="utf-8") as fp:
+                cache = json.load(fp)
+            if cache.get("backend") in self.BACKEND_APIS and isinstance(cache.get("index"), int):
+                return cache
         except Exception:
-            reasons['not_array'] = True
-            return True, reasons
-
-        if arr.size == 0:
-            reasons['empty'] = True
-            return True, reasons
-
-        # Compute mean on grayscale equivalent
-        if arr.ndim == 3 and arr.shape[2] == 3:
-            gray = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = arr if arr.ndim == 2 else cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
-
-        mean = float(np.mean(gray))
-        reasons['mean'] = mean
+            pass
+        return None
+
+    def _save_discovery_cache(self, backend: str, index: int, open_ms: float) -> None:
+        self._discovery_cache = {
+            "backend": backend,
+            "index": index,
+            "open_ms": round(open_ms, 1),
+            "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            write_json_atomic(self.discovery_cache_path, self._discovery_cache)
+        except Exception:
+            pass
 
-        pct_dark = float(np.count_nonzero(gray <= mean_thresh)) / gray.size
-        reasons['pct_dark'] = pct_dark
+    def _open_capture(self):
+        """Open the camera, trying the cached (backend, index) pair before a full probe.
 
-        std = float(np.std(gray))
-        reasons['std'] = std
+        A full probe runs only when the cached pair fails, and after a failed probe further
+        probes are delayed with exponential backoff (probe_backoff_min..probe_backoff_max).
 
-        # Edge-based check: if very few edges, likely black/blank
-        try:
-            edges = cv2.Canny(gray, 50, 150)
-            edge_count = int(np.count_nonzero(edges))
-        except Exception:
-            edge_count = 9999
-        reasons['edge_count'] = edge_count
-
-        is_black = (
-            mean < mean_thresh
-            or pct_dark >= pct_dark_thresh
-            or std < std_thresh
-            or edge_count <= edge_thresh
-        )
+        Returns:
+            (cap, backend_name, working_index); cap is None if nothing could be opened.
+        """
+        cached = self._discovery_cache
+        if cached is not None:
+            api = getattr(cv2, self.BACKEND_APIS[cached["backend"]], None)
+            # Prefer the configured index when the cache points at a fallback index
+            candidates = [self.camera_index, cached["index"]] if cached["index"] != self.camera_index else [cached["index"]]
+            for idx in candidates:
+                if api is None:
+                    break
+                t0 = time.perf_counter()
+                cap = self.capture.open(idx, api)
+                if cap.isOpened():
+                    open_ms = (time.perf_counter() - t0) * 1000.0
+                    if idx != cached["index"] or abs(open_ms - (cached.get("open_ms") or 0)) > 100:
+                        self._save_discovery_cache(cached["backend"], idx, open_ms)
+                    return cap, cached["backend"], idx
+                cap.release()
+            self.log(f"WARN: Cached camera {cached['backend']} index {cached['index']} failed to open")
 
-        return bool(is_black), reasons
+        now = time.time()
+        if now < self._probe_not_before:
+            self.log(f"WARN: Skipping full camera probe for {self._probe_not_before - now:.0f}s (backoff)")
+            return None, "UNKNOWN", self.camera_index
+
+        t0 = time.perf_counter()
+        cap, used_backend, working_index = self._probe_capture()
+        if cap is None:
+            self._probe_backoff = min(self.probe_backoff_max, max(self.probe_backoff_min, self._probe_backoff * 2))
+            self._probe_not_before = time.time() + self._probe_backoff
+            self.log(f"WARN: Full camera probe failed; next probe in {self._probe_backoff:.0f}s")
+        else:
+            self._probe_backoff = 0.0
+            self._probe_not_before = 0.0
+            self._save_discovery_cache(used_backend, working_index, (time.perf_counter() - t0) * 1000.0)
+        return cap, used_backend, working_index
 
-    def check_camera(self):
-        # Check if USB device is present (Windows)
-        if not self.usb_camera_connected():
-            self.log("ERROR: USB camera not detected by OS")
-            return False
+    def _probe_capture(self):
+        """Open the camera DShow-first, then MSMF, probing indices 0-5 on failure (if enabled).
 
-        # DShow-first strategy, then MSMF, with index probing
+        Returns:
+            (cap, backend_name, working_index); cap is None if nothing could be opened.
+        """
         # Use a local working_index to avoid permanently switching on transient failures
         cap = None
         opened = False
@@ -216,15 +379,15 @@ class CameraMonitor:
         dshow = getattr(cv2, "CAP_DSHOW", None)
         if dshow is not None:
             self.log(f"INFO: Trying DirectShow (CAP_DSHOW) on index {working_index}")
-            cap = cv2.VideoCapture(working_index, dshow)
-            if not cap.isOpened():
+            cap = self.capture.open(working_index, dshow)
+            if not cap.isOpened() and self.probe_fallback_indices:
                 self.log(f"WARN: DShow failed on index {working_index}; probing indices 0-5 with DShow")
                 probe_idx = None
                 for idx in range(0, 6):
                     # Skip the original index since we just tried it
                     if idx == self.camera_index:
                         continue
-                    probe = cv2.VideoCapture(idx, dshow)
+                    probe = self.capture.open(idx, dshow)
                     if probe.isOpened():
                         self.log(f"INFO: DShow found camera at index {idx} (but preferring configured index {self.camera_index})")
                         probe_idx = idx
@@ -235,7 +398,7 @@ class CameraMonitor:
                 if probe_idx is not None:
                     self.log(f"WARN: Using fallback index {probe_idx} since configured index {self.camera_index} unavailable")
                     working_index = probe_idx
-                    cap = cv2.VideoCapture(working_index, dshow)
+                    cap = self.capture.open(working_index, dshow)
             if cap.isOpened():
                 opened = True
                 used_backend = "DSHOW"
@@ -244,15 +407,15 @@ class CameraMonitor:
             msmf = getattr(cv2, "CAP_MSMF", None)
             if msmf is not None:
                 self.log(f"INFO: Trying Media Foundation (CAP_MSMF) on index {working_index}")
-                cap = cv2.VideoCapture(working_index, msmf)
-                if not cap.isOpened():
+                cap = self.capture.open(working_index, msmf)
+                if not cap.isOpened() and self.probe_fallback_indices:
                     self.log(f"WARN: MSMF failed on index {working_index}; probing indices 0-5 with MSMF")
                     probe_idx = None
                     for idx in range(0, 6):
                         # Skip the original index since we just tried it
                         if idx == self.camera_index:
                             continue
-                        probe = cv2.VideoCapture(idx, msmf)
+                        probe = self.capture.open(idx, msmf)
                         if probe.isOpened():
                             self.log(f"INFO: MSMF found camera at index {idx} (but preferring configured index {self.camera_index})")
                             probe_idx = idx
@@ -263,197 +426,376 @@ class CameraMonitor:
                     if probe_idx is not None:
                         self.log(f"WARN: Using fallback index {probe_idx} since configured index {self.camera_index} unavailable")
                         working_index = probe_idx
-                        cap = cv2.VideoCapture(working_index, msmf)
+                        cap = self.capture.open(working_index, msmf)
                 if cap.isOpened():
                     opened = True
                     used_backend = "MSMF"
 
-        if not opened or cap is None:
-            self.log("ERROR: Could not open camera via DShow or MSMF")
-            return False
+        if not opened:
+            if cap is not None:
+                cap.release()
+            return None, used_backend, working_index
+        return cap, used_backend, working_index
 
-        # Set properties to avoid bad auto-negotiation
+    def _configure_capture(self, cap) -> None:
+        """Set resolution/format to avoid bad auto-negotiation."""
         try:
             cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
             cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
             if self.use_mjpg:
                 fourcc = cv2.VideoWriter_fourcc(*"MJPG")
                 cap.set(cv2.CAP_PROP_FOURCC, fourcc)
+            if self.persistent_session:
+                # Keep the driver queue short so a reused handle doesn't serve stale frames
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         except Exception:
             pass
 
-        # Warmup and read loop: allow camera auto-exposure to settle and avoid black frames
+    def _read(self, cap):
+        """cap.read(), stamping each frame delivered on the frame clock."""
+        ret, frame = cap.read()
+        if ret and frame is not None:
+            self.frame_clock.stamp(cap)
+        return ret, frame
+
+    def _warmup(self, cap):
+        """Read until auto-exposure has settled, or the frame/time cap is reached.
+
+        Returns:
+            The last warmup frame (usable as the first check frame), or None.
+        """
+        convergence = ExposureConvergence(self.warmup_stable_frames, self.warmup_tolerance)
         frame = None
-        ret = False
-        # short warmup reads
+        frames = 0
+        failed_reads = 0
+        converged = False
+        t0 = time.perf_counter()
+        try:
+            while frames < self.warmup_max_frames and time.perf_counter() - t0 < self.warmup_max_seconds:
+                ret, img = self._read(cap)
+                frames += 1
+                if not ret or img is None:
+                    failed_reads += 1
+                    if failed_reads >= 5:
+                        # Not delivering frames at all; leave it to the check's retries
+                        break
+                    time.sleep(0.01)
+                    continue
+                failed_reads = 0
+                frame = img
+                if convergence.update(frame):
+                    converged = True
+                    break
+        except Exception:
+            pass
+        warmup_ms = (time.perf_counter() - t0) * 1000.0
+        self.session_stats["last_warmup_frames"] = frames
+        self.session_stats["last_warmup_ms"] = round(warmup_ms, 1)
+        level = f"{convergence.level:.1f}" if convergence.level is not None else "n/a"
+        if converged:
+            self.log(f"INFO: Warmup converged after {frames} frames in {warmup_ms:.0f} ms (brightness {level})")
+        else:
+            self.log(f"WARN: Warmup stopped at cap after {frames} frames in {warmup_ms:.0f} ms (brightness {level})")
+        return frame
+
+    def close_session(self) -> None:
+        """Release the persistent capture handle, if any."""
+        if self._session is not None:
+            cap, _, _ = self._session
+            try:
+                cap.release()
+            except Exception:
+                pass
+            self._session = None
+
+    def _acquire_capture(self):
+        """Return (cap, backend, working_index), reusing the persistent session when enabled."""
+        if self.persistent_session and self._session is not None:
+            cap, used_backend, working_index = self._session
+            self.session_stats["reuses"] += 1
+            # Nothing was read since the last check; that pause is not a drop
+            self.frame_clock.reset(self.frame_clock.nominal_fps)
+            # Drop frames that queued up since the last check
+            try:
+                for _ in range(2):
+                    cap.grab()
+            except Exception:
+                pass
+            return cap, used_backend, working_index
+
+        t0 = time.perf_counter()
+        if self.use_feed:
+            # The recorder owns the device and its exposure has long settled: no probe, no warmup
+            cap = self.capture.open(self.camera_index)
+            if not cap.isOpened():
+                return None, "FEED", self.camera_index
+            self.frame_clock.reset()
+            self.session_stats["opens"] += 1
+            self.session_stats["last_open_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+            if self.persistent_session:
+                self._session = (cap, "FEED", self.camera_index)
+            return cap, "FEED", self.camera_index
+        cap, used_backend, working_index = self._open_capture()
+        if cap is None:
+            return None, used_backend, working_index
+        self._configure_capture(cap)
+        try:
+            self.frame_clock.reset(cap.get(cv2.CAP_PROP_FPS))
+        except Exception:
+            self.frame_clock.reset()
+        self._warm_frame = self._warmup(cap)
+        open_ms = (time.perf_counter() - t0) * 1000.0
+        self.session_stats["opens"] += 1
+        self.session_stats["last_open_ms"] = round(open_ms, 1)
+        if self.persistent_session:
+            self._session = (cap, used_backend, working_index)
+            self.log(f"INFO: Capture session opened via {used_backend} on index {working_index} in {open_ms:.0f} ms")
+        return cap, used_backend, working_index
+
+    def _end_check(self, cap, ok: bool) -> None:
+        """Release a one-shot capture, or track failures of the persistent session."""
+        if not self.persistent_session:
+            cap.release()
+            return
+        if ok:
+            self.session_stats["consecutive_failures"] = 0
+            return
+        self.session_stats["consecutive_failures"] += 1
+        if self.session_stats["consecutive_failures"] >= self.session_max_failures:
+            self.log(f"WARN: {self.session_stats['consecutive_failures']} consecutive failed reads; reopening capture session")
+            self.close_session()
+            self.session_stats["consecutive_failures"] = 0
+
+    def check_camera(self) -> bool:
+        """Run one health check and append its result to the check history."""
+        self.last_failure = None
+        t0 = time.perf_counter()
+        ok = self._check_camera()
+        self.last_check_ms = (time.perf_counter() - t0) * 1000.0
         try:
-            for _ in range(15):
-                cap.read()
-                time.sleep(0.01)
+            self.history.record(ok, self.camera_index, self.status.status.get("backend"), self.last_check_ms,
+                                None if ok else (self.last_failure or "unknown"))
         except Exception:
             pass
 
+        previous_mode = self.scheduler.mode
+        delay = self.scheduler.record(ok)
+        if self.scheduler.mode != previous_mode:
+            if previous_mode != "healthy" and ok:
+                self.log(f"INFO: Camera recovered after {self.scheduler.last_downtime:.0f}s; "
+                         f"checking every {self.scheduler.interval:.0f}s")
+            else:
+                self.log(f"INFO: Check schedule {previous_mode} -> {self.scheduler.mode} "
+                         f"(every {self.scheduler.interval:.1f}s)")
+        next_check = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+        self.status.update({"schedule": self.scheduler.snapshot(),
+                            "next_check": next_check.isoformat(timespec="seconds")})
+        self.poll_telemetry()
+        return ok
+
+    def poll_telemetry(self) -> None:
+        """Sample process telemetry if due, publish it in the status and log a pending restart."""
+        if self.telemetry is None or self.telemetry.poll() is None:
+            return
+        self.log(f"INFO: Process {self.telemetry.summary()}")
+        fields = {"process": self.telemetry.snapshot()}
+        if self.telemetry.restart_reason:
+            self.log(f"WARN: Resource limit crossed ({self.telemetry.restart_reason}); restart requested")
+            # Not volatile, so the status file records why the monitor went away
+            fields["restart_requested"] = self.telemetry.restart_reason
+        self.status.update(fields)
+
+    def _check_camera(self):
+        # Check if USB device is present (Windows)
+        if not self.usb_camera_connected():
+            self.log("ERROR: USB camera not detected by OS")
+            self.last_failure = "not_detected"
+            self.close_session()
+            # Don't trust the cached "absent" for a whole TTL; a re-plugged camera shows up next check
+            self.presence.invalidate()
+            return False
+
+        cap, used_backend, working_index = self._acquire_capture()
+        if cap is None:
+            if self.use_feed:
+                self.log("ERROR: No fresh frames on the recorder's frame feed (is the recorder running "
+                         "with --publish-feed?)")
+                self.last_failure = "feed_unavailable"
+                self.feed_info = None
+                return False
+            self.log("ERROR: Could not open camera via DShow or MSMF")
+            self.last_failure = "open_failed"
+            # Ask the OS again next time rather than trusting a cached "present"
+            self.presence.invalidate()
+            return False
+
+        frame = None
+        ret = False
         # Try multiple attempts and verify frame is not black using several heuristics
+        warm_frame, self._warm_frame = self._warm_frame, None
         for attempt in range(6):
-            ret, frame = cap.read()
+            if attempt == 0 and warm_frame is not None:
+                # The last warmup frame is already settled; don't pay for another read
+                ret, frame = True, warm_frame
+            else:
+                ret, frame = self._read(cap)
             if not ret or frame is None:
                 time.sleep(0.2)
                 continue
             try:
-                is_black, reasons = self.is_black_frame(frame)
+                quality = analyze_frame(frame)
             except Exception:
-                is_black, reasons = False, {'error': 'is_black_check_failed'}
-            if is_black:
-                # Too dark/blank; let camera adjust and retry
-                self.log(f"WARN: Captured frame considered black; reasons={reasons}; retrying ({attempt+1}/6)")
-                time.sleep(0.3)
+                quality = FrameQuality(True, "quality_check_failed")
+            self.last_quality = quality
+            if not quality.ok:
+                # Too dark/blank; let camera adjust and retry (warmup already waited for exposure)
+                self.log(f"WARN: Captured frame considered black; quality={quality.summary()}; retrying ({attempt+1}/6)")
+                time.sleep(0.1)
                 continue
             # good frame
             break
 
-        cap.release()
+        if self.use_feed:
+            self.feed_info = cap.info()
+        self._end_check(cap, bool(ret and frame is not None))
 
         if not ret or frame is None:
+            self.presence.invalidate()
             self.log("ERROR: Failed to read frame")
+            self.last_failure = "read_failed"
             # preserve backend info in status; report configured index (self.camera_index)
             self.write_status(False, None, backend=used_backend)
             return False
 
-        self.log(f"OK: Frame captured from index {working_index}")
+        if self.frozen_detector.update(frame):
+            self.log(f"ERROR: Camera feed frozen: identical frames for {self.frozen_detector.static_seconds:.0f}s "
+                     f"(hash {self.frozen_detector.last_hash:016x})")
+            self.last_failure = "frozen"
+            self.presence.invalidate()
+            # A persistent handle may be the thing that is stuck; reopen it next time
+            self.close_session()
+            self.write_status(False, None, backend=used_backend)
+            return False
 
-        # Note: PTZ effect will be applied only when saving, and cycle advances only on successful save
-        effect_name = "none"
+        self.log(f"OK: Frame captured from index {working_index}")
+        if self.last_quality is not None and (self.last_quality.blurry or self.last_quality.overexposed):
+            self.log(f"WARN: Frame quality degraded: {self.last_quality.summary()}")
 
-        # Hourly verification frame (or configured interval)
+        # Hourly verification frame (or configured interval), encoded in the background
         now = time.time()
-        if now - self.last_saved >= self.frame_save_interval:
-            filename = os.path.join(
-                self.save_dir,
-                datetime.datetime.now().strftime("%Y%m%d_%H%M%S.jpg")
-            )
-            try:
-                # Apply PTZ effect before saving, and advance index only on successful save
+        with self._save_lock:
+            if now - self.last_saved >= self.frame_save_interval:
+                path_base = os.path.join(self.save_dir, datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+                # Apply PTZ effect before saving; the cycle advances once the saver has handled it
                 if self.enable_ptz_cycling:
                     frame_to_save, effect_name = self.apply_ptz_effect(frame)
                 else:
                     frame_to_save, effect_name = frame, "none"
-                cv2.imwrite(filename, frame)
-                # Save the transformed frame if cycling is enabled; otherwise save original
-                if self.enable_ptz_cycling:
-                    cv2.imwrite(filename, frame_to_save)
+                previous_saved = self.last_saved
+                if self.frame_saver.submit(
+                    frame_to_save, path_base, key=effect_name,
+                    callback=lambda result: self._on_frame_saved(result, working_index, used_backend, previous_saved),
+                ):
+                    # Don't queue another frame while this one is pending
+                    self.last_saved = now
                 else:
-                    cv2.imwrite(filename, frame_to_save)
-                self.log(f"Saved verification frame (effect={effect_name}) from index {working_index}: {filename}")
-                self.last_saved = now
-                self.write_status(True, filename, backend=used_backend)
-                # Advance cycle only after a successful save
-                if self.enable_ptz_cycling:
-                    self.ptz_cycle_index = (self.ptz_cycle_index + 1) % len(self.ptz_effects)
-            except Exception:
-                self.log("WARN: Failed to save verification frame")
-                # write status but keep prior saved frame path
-                self.write_status(True, None, backend=used_backend)
-        else:
-            # don't overwrite last_frame_path with empty value; preserve prior
-            self.write_status(True, None, backend=used_backend)
+                    self.log("WARN: Frame saver busy; skipping verification frame")
+        # don't overwrite last_frame_path here; the saver updates it once the file exists
+        self.write_status(True, None, backend=used_backend)
 
         return True
 
+    def _on_frame_saved(self, result, working_index: int, backend: str, previous_saved: float) -> None:
+        """FrameSaver callback (encoder thread): log, publish the path and advance the PTZ cycle.
+
+        Only touches state shared with the check thread under `_save_lock` or through the
+        (locked) StatusStore.
+        """
+        if result.status == "failed":
+            self.log(f"WARN: Failed to save verification frame {result.path}: {result.error}")
+            # Retry on the next check, as if nothing had been saved
+            with self._save_lock:
+                self.last_saved = previous_saved
+            return
+        if result.status == "duplicate":
+            self.log(f"INFO: Skipped near-duplicate verification frame (effect={result.key}, "
+                     f"distance={result.distance})")
+        else:
+            self.log(f"Saved verification frame (effect={result.key}) from index {working_index}: {result.path} "
+                     f"({result.bytes // 1024} KB, encoded in {result.encode_ms:.0f} ms)")
+            # Not write_status(): that reads check-thread state (frame clock, quality) mid-update
+            self.status.update({"last_frame_path": result.path, "backend": backend})
+        # Advance cycle only after the frame was handled
+        if self.enable_ptz_cycling:
+            with self._save_lock:
+                self.ptz_cycle_index = (self.ptz_cycle_index + 1) % len(self.ptz_effects)
+
+    def ptz_session(self) -> PTZSession:
+        """Return a PTZSession for batching hardware PTZ commands on one handle.
+
+        Borrows the persistent capture session when one is open; otherwise the
+        PTZSession opens (and on close releases) its own handle.
+        """
+        cap = self._session[0] if self._session is not None else None
+        return PTZSession(self.camera_index, log=self.log, cap=cap, backend=self.capture)
+
+    def _set_ptz_axis(self, axis: str, value: int) -> bool:
+        try:
+            with self.ptz_session() as ptz:
+                if not ptz.is_open:
+                    self.log(f"WARN: Could not open camera to set {axis}")
+                    return False
+                getattr(ptz, f"queue_{axis}")(value)
+                result = ptz.apply()[axis]
+
+            if result["accepted"] or result["actual"] != -1:
+                self.log(f"{axis.capitalize()} set to {value} (actual: {result['actual']}, {ptz.last_latency_ms:.0f} ms)")
+                return True
+            else:
+                self.log(f"WARN: Could not set {axis} to {value} (camera may not support PTZ)")
+                return False
+        except Exception as e:
+            self.log(f"ERROR: Failed to set {axis}: {e}")
+            return False
+
     def set_pan(self, value: int) -> bool:
         """Set pan position (-180 to 180 degrees, camera-dependent).
 
+        Opens a device handle for this one command; use ptz_session() to batch several.
+
         Args:
             value: Pan angle in degrees (camera-specific range may vary)
 
         Returns:
             True if property was set successfully, False otherwise.
         """
-        try:
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_MSMF)
-
-            if not cap.isOpened():
-                self.log("WARN: Could not open camera to set pan")
-                return False
-
-            result = cap.set(cv2.CAP_PROP_PAN, float(value))
-            actual = cap.get(cv2.CAP_PROP_PAN)
-            cap.release()
-
-            if result or actual != -1:
-                self.log(f"Pan set to {value} (actual: {actual})")
-                return True
-            else:
-                self.log(f"WARN: Could not set pan to {value} (camera may not support PTZ)")
-                return False
-        except Exception as e:
-            self.log(f"ERROR: Failed to set pan: {e}")
-            return False
+        return self._set_ptz_axis("pan", value)
 
     def set_tilt(self, value: int) -> bool:
         """Set tilt position (-180 to 180 degrees, camera-dependent).
 
+        Opens a device handle for this one command; use ptz_session() to batch several.
+
         Args:
             value: Tilt angle in degrees (camera-specific range may vary)
 
         Returns:
             True if property was set successfully, False otherwise.
         """
-        try:
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_MSMF)
-
-            if not cap.isOpened():
-                self.log("WARN: Could not open camera to set tilt")
-                return False
-
-            result = cap.set(cv2.CAP_PROP_TILT, float(value))
-            actual = cap.get(cv2.CAP_PROP_TILT)
-            cap.release()
-
-            if result or actual != -1:
-                self.log(f"Tilt set to {value} (actual: {actual})")
-                return True
-            else:
-                self.log(f"WARN: Could not set tilt to {value} (camera may not support PTZ)")
-                return False
-        except Exception as e:
-            self.log(f"ERROR: Failed to set tilt: {e}")
-            return False
+        return self._set_ptz_axis("tilt", value)
 
     def set_zoom(self, value: int) -> bool:
         """Set zoom level (typically 0-10 or 100-400, camera-dependent).
 
+        Opens a device handle for this one command; use ptz_session() to batch several.
+
         Args:
             value: Zoom value (camera-specific range may vary)
 
         Returns:
             True if property was set successfully, False otherwise.
         """
-        try:
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_MSMF)
-
-            if not cap.isOpened():
-                self.log("WARN: Could not open camera to set zoom")
-                return False
-
-            result = cap.set(cv2.CAP_PROP_ZOOM, float(value))
-            actual = cap.get(cv2.CAP_PROP_ZOOM)
-            cap.release()
-
-            if result or actual != -1:
-                self.log(f"Zoom set to {value} (actual: {actual})")
-                return True
-            else:
-                self.log(f"WARN: Could not set zoom to {value} (camera may not support PTZ)")
-                return False
-        except Exception as e:
-            self.log(f"ERROR: Failed to set zoom: {e}")
-            return False
+        return self._set_ptz_axis("zoom", value)
 
     def get_ptz_position(self) -> dict:
         """Get current PTZ position if supported by camera.
@@ -463,19 +805,10 @@ class CameraMonitor:
             or 'error' key if camera cannot be opened.
         """
         try:
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_MSMF)
-
-            if not cap.isOpened():
-                return {"error": "Could not open camera"}
-
-            position = {
-                "pan": float(cap.get(cv2.CAP_PROP_PAN)),
-                "tilt": float(cap.get(cv2.CAP_PROP_TILT)),
-                "zoom": float(cap.get(cv2.CAP_PROP_ZOOM)),
-            }
-            cap.release()
+            with self.ptz_session() as ptz:
+                position = ptz.get_position()
+            if "error" in position:
+                return position
 
             self.log(f"PTZ Position: pan={position['pan']}, tilt={position['tilt']}, zoom={position['zoom']}")
             return position
@@ -490,20 +823,11 @@ class CameraMonitor:
             True if reset was successful, False otherwise.
         """
         try:
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_MSMF)
-
-            if not cap.isOpened():
-                self.log("WARN: Could not open camera to reset PTZ")
-                return False
-
-            success = True
-            success &= bool(cap.set(cv2.CAP_PROP_PAN, 0.0))
-            success &= bool(cap.set(cv2.CAP_PROP_TILT, 0.0))
-            success &= bool(cap.set(cv2.CAP_PROP_ZOOM, 0.0))
-
-            cap.release()
+            with self.ptz_session() as ptz:
+                if not ptz.is_open:
+                    self.log("WARN: Could not open camera to reset PTZ")
+                    return False
+                success = ptz.reset()
 
             if success:
                 self.log("PTZ reset to home position (0, 0, 0)")
@@ -527,23 +851,7 @@ class CameraMonitor:
         """
         if frame is None:
             return frame
-
-        h, w = frame.shape[:2]
-        crop_ratio = 0.8  # Use 80% of frame
-        crop_w = int(w * crop_ratio)
-        crop_h = int(h * crop_ratio)
-
-        # Calculate pan offset (-1 to 1 maps to left to right)
-        center_x = int(w * (0.5 + pan_offset * 0.25))
-        center_y = h // 2
-
-        x1 = max(0, center_x - crop_w // 2)
-        x2 = min(w, x1 + crop_w)
-        y1 = max(0, center_y - crop_h // 2)
-        y2 = min(h, y1 + crop_h)
-
-        cropped = frame[y1:y2, x1:x2]
-        return cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
+        return self.digital.apply(frame, (("pan", pan_offset),))
 
     def digital_tilt(self, frame, tilt_offset: float = 0.5) -> np.ndarray:
         """Simulate tilt by cropping and centering frame on region.
@@ -557,23 +865,7 @@ class CameraMonitor:
         """
         if frame is None:
             return frame
-
-        h, w = frame.shape[:2]
-        crop_ratio = 0.8  # Use 80% of frame
-        crop_w = int(w * crop_ratio)
-        crop_h = int(h * crop_ratio)
-
-        # Calculate tilt offset (-1 to 1 maps to top to bottom)
-        center_x = w // 2
-        center_y = int(h * (0.5 + tilt_offset * 0.25))
-
-        x1 = max(0, center_x - crop_w // 2)
-        x2 = min(w, x1 + crop_w)
-        y1 = max(0, center_y - crop_h // 2)
-        y2 = min(h, y1 + crop_h)
-
-        cropped = frame[y1:y2, x1:x2]
-        return cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
+        return self.digital.apply(frame, (("tilt", tilt_offset),))
 
     def digital_zoom(self, frame, zoom_factor: float = 1.5) -> np.ndarray:
         """Simulate zoom by cropping center and resizing.
@@ -587,39 +879,56 @@ class CameraMonitor:
         """
         if frame is None or zoom_factor <= 0:
             return frame
+        return self.digital.apply(frame, (("zoom", zoom_factor),))
 
-        h, w = frame.shape[:2]
-
-        # Clamp zoom to reasonable range
-        zoom_factor = max(0.5, min(3.0, zoom_factor))
-
-        # Calculate crop box from center
-        crop_w = int(w / zoom_factor)
-        crop_h = int(h / zoom_factor)
-
-        # Ensure crop box doesn't exceed frame bounds
-        crop_w = min(crop_w, w)
-        crop_h = min(crop_h, h)
+    def digital_ptz(self, frame, pan_offset: float | None = None, tilt_offset: float | None = None,
+                    zoom_factor: float | None = None) -> np.ndarray:
+        """Combine digital pan, tilt and zoom (in that order) with a single resample.
 
-        x1 = (w - crop_w) // 2
-        y1 = (h - crop_h) // 2
-        x2 = x1 + crop_w
-        y2 = y1 + crop_h
+        Args:
+            frame: Input frame
+            pan_offset: As for digital_pan, or None to skip
+            tilt_offset: As for digital_tilt, or None to skip
+            zoom_factor: As for digital_zoom, or None to skip
 
-        cropped = frame[y1:y2, x1:x2]
-        return cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
+        Returns:
+            Frame equivalent to chaining the individual digital_* calls.
+        """
+        if frame is None:
+            return frame
+        steps = [(kind, value) for kind, value in
+                 (("pan", pan_offset), ("tilt", tilt_offset), ("zoom", zoom_factor)) if value is not None]
+        return self.digital.apply(frame, steps)
 
 if __name__ == "__main__":
-    monitor = CameraMonitor()
+    import argparse
+
+    p = argparse.ArgumentParser(description="Monitor a USB camera and log its health")
+    p.add_argument("--camera", type=int, default=0, help="Camera index (default 0)")
+    p.add_argument("--feed", nargs="?", const=True, default=None, metavar="NAME",
+                   help="Check frames from motion_recording.py --publish-feed instead of opening "
+                        "the camera (default name: the recorder's for --camera)")
+    add_telemetry_args(p)
+    args = p.parse_args()
+
+    telemetry = telemetry_from_args(args)
+    monitor = CameraMonitor(camera_index=args.camera, frame_feed=args.feed, telemetry=telemetry)
     monitor.log("=== Windows Camera Monitor Started ===")
     try:
         while True:
             ok = monitor.check_camera()
             if not ok:
                 monitor.write_status(False, None)
-                monitor.log("WARN: Check failed; will retry after interval")
-            time.sleep(monitor.check_interval)
+                monitor.log(f"WARN: Check failed; retrying in {monitor.scheduler.next_delay():.0f}s")
+            if telemetry is not None and telemetry.restart_reason:
+                monitor.log("=== Windows Camera Monitor Restarting ===")
+                break
+            time.sleep(monitor.scheduler.next_delay())
     except KeyboardInterrupt:
         monitor.log("=== Windows Camera Monitor Stopped ===")
     except Exception as e:
         monitor.log(f"FATAL ERROR: {e}")
+    finally:
+        monitor.close()
+    if telemetry is not None and telemetry.restart_reason:
+        restart_process()
@@ -0,0 +1,125 @@
+import time
+
+import cv2
+
+try:
+    from .capture_backend import OpenCVBackend
+except ImportError:  # run as a script from this folder
+    from capture_backend import OpenCVBackend
+
+
+class PTZSession:
+    """Hold one camera handle for a series of hardware PTZ commands.
+
+    Commands are queued with `queue_pan`/`queue_tilt`/`queue_zoom` (the last value per
+    axis wins) and sent together by `apply()`, so a sweep costs one device open instead
+    of one per step. Use as a context manager, or call `open()`/`close()` explicitly.
+    """
+
+    AXES = {
+        "pan": cv2.CAP_PROP_PAN,
+        "tilt": cv2.CAP_PROP_TILT,
+        "zoom": cv2.CAP_PROP_ZOOM,
+    }
+
+    def __init__(self, camera_index: int = 0, log=print, cap=None, backend=None) -> None:
+        """
+        Args:
+            camera_index: Camera to open (DShow first, then MSMF)
+            log: Callable used for log lines (e.g. CameraMonitor.log)
+            cap: Already open capture to borrow; it is not released by close()
+            backend: CaptureBackend used to open the camera (default OpenCVBackend)
+        """
+        self.camera_index = camera_index
+        self.backend = backend if backend is not None else OpenCVBackend()
+        self.log = log
+        self.cap = cap
+        self._owns_cap = cap is None
+        self._pending = {}
+        self.open_ms = None
+        self.last_latency_ms = None
+        self.commands_sent = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def open(self) -> bool:
+        """Open the camera if no handle is held. Returns True if a usable handle exists."""
+        if self.is_open:
+            return True
+        t0 = time.perf_counter()
+        cap = self.backend.open(self.camera_index, cv2.CAP_DSHOW)
+        if not cap.isOpened():
+            cap.release()
+            cap = self.backend.open(self.camera_index, cv2.CAP_MSMF)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        self.open_ms = (time.perf_counter() - t0) * 1000.0
+        self.cap = cap
+        self._owns_cap = True
+        return True
+
+    def close(self) -> None:
+        if self.cap is not None and self._owns_cap:
+            self.cap.release()
+        self.cap = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def queue_pan(self, value: float):
+        self._pending["pan"] = float(value)
+        return self
+
+    def queue_tilt(self, value: float):
+        self._pending["tilt"] = float(value)
+        return self
+
+    def queue_zoom(self, value: float):
+        self._pending["zoom"] = float(value)
+        return self
+
+    def apply(self) -> dict:
+        """Send all queued commands on the held handle.
+
+        Returns:
+            Dictionary of axis -> {"requested", "accepted", "actual"} for each queued axis,
+            or {"error": ...} if the camera could not be opened.
+        """
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return {}
+        if not self.open():
+            return {"error": "Could not open camera"}
+
+        t0 = time.perf_counter()
+        results = {}
+        for axis, value in pending.items():
+            accepted = bool(self.cap.set(self.AXES[axis], value))
+            results[axis] = {"requested": value, "accepted": accepted}
+        # Read back after the whole batch so the camera has processed every command
+        for axis in pending:
+            results[axis]["actual"] = float(self.cap.get(self.AXES[axis]))
+        self.last_latency_ms = (time.perf_counter() - t0) * 1000.0
+        self.commands_sent += len(pending)
+        return results
+
+    def get_position(self) -> dict:
+        """Return {'pan', 'tilt', 'zoom'} from the held handle, or {'error': ...}."""
+        if not self.open():
+            return {"error": "Could not open camera"}
+        return {axis: float(self.cap.get(prop)) for axis, prop in self.AXES.items()}
+
+    def reset(self) -> bool:
+        """Send pan/tilt/zoom = 0 as one batch. Returns True if every command was accepted."""
+        results = self.queue_pan(0).queue_tilt(0).queue_zoom(0).apply()
+        if "error" in results:
+            return False
+        return all(r["accepted"] for r in results.values())
@@ -0,0 +1,112 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import weakref
+
+LINE_FORMAT = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+# Listeners still running at interpreter exit are stopped (and flushed) by one atexit hook
+_listeners = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_listeners() -> None:
+    for listener in list(_listeners):
+        listener.stop()
+
+
+class BufferedHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes when the oldest buffered record is `flush_interval` old."""
+
+    def __init__(self, capacity: int, target: logging.Handler, flush_interval: float = 5.0,
+                 flush_level: int = logging.WARNING) -> None:
+        super().__init__(capacity, flushLevel=flush_level, target=target)
+        self.flush_interval = flush_interval
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        if super().shouldFlush(record):
+            return True
+        return bool(self.buffer) and record.created - self.buffer[0].created >= self.flush_interval
+
+    def flush_if_stale(self, now: float | None = None) -> None:
+        """Flush if the oldest buffered record is `flush_interval` old (called while no records arrive)."""
+        now = time.time() if now is None else now
+        if self.buffer and now - self.buffer[0].created >= self.flush_interval:
+            self.flush()
+
+    def close(self) -> None:
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes stale buffers while idle; stop() also flushes and closes its handlers."""
+
+    def __init__(self, log_queue, *handlers, flush_interval: float = 5.0) -> None:
+        super().__init__(log_queue, *handlers)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool):
+        if not block:
+            return self.queue.get(block)
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # No record for a while: write out what a quiet period left in the buffer
+                for handler in self.handlers:
+                    if isinstance(handler, BufferedHandler):
+                        handler.flush_if_stale()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+            handler.close()
+
+
+def start_queued_logger(name: str, path: str, *, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                        rotate_when: str | None = None, flush_interval: float = 5.0, console: bool = True):
+    """Create a logger whose console and file output run on a background thread.
+
+    Records go through a queue to a QueueListener thread. File output is buffered
+    and written out every 32 records, on WARNING and above, or once the oldest buffered
+    line is `flush_interval` seconds old (the listener thread checks while idle, so a
+    quiet log still reaches the file). Files rotate by size (`max_bytes`, 0 disables) or,
+    if `rotate_when` is set (e.g. "midnight"), by time.
+
+    Returns:
+        (logger, listener); call listener.stop() to flush and stop the thread. Listeners
+        not stopped by then are stopped at interpreter exit.
+    """
+    if rotate_when:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=rotate_when, backupCount=backup_count, encoding="utf-8")
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(LINE_FORMAT)
+    handlers = [BufferedHandler(32, file_handler, flush_interval=flush_interval)]
+    if console:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(LINE_FORMAT)
+        handlers.insert(0, stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, *handlers, flush_interval=flush_interval)
+    listener.start()
+    _listeners.add(listener)
+    return logger, listener
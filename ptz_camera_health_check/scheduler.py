@@ -0,0 +1,100 @@
+import datetime
+import random
+import time
+
+
+class AdaptiveScheduler:
+    """Pick the delay before the next camera check from recent results.
+
+    Modes:
+      - "healthy": starts at `base_interval`; every `grow_after` consecutive passing
+        checks the interval is multiplied by `growth`, up to `max_interval`.
+      - "recheck": after a failure, the next `fast_checks` checks run every
+        `fast_interval` seconds to pin down a short glitch or the moment of recovery.
+      - "backoff": still failing after the fast rechecks, so the device is treated as
+        hard-down and the interval doubles from `base_interval` up to `backoff_max`.
+
+    A passing check in any mode returns to "healthy" at `base_interval`. Every delay gets
+    +/- `jitter` (a fraction) so several monitors don't stay in lockstep.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 5.0,
+        max_interval: float = 60.0,
+        growth: float = 1.5,
+        grow_after: int = 3,
+        fast_interval: float = 1.0,
+        fast_checks: int = 3,
+        backoff_max: float = 300.0,
+        jitter: float = 0.1,
+        clock=time.time,
+    ) -> None:
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.growth = growth
+        self.grow_after = grow_after
+        self.fast_interval = fast_interval
+        self.fast_checks = fast_checks
+        self.backoff_max = max(backoff_max, base_interval)
+        self.jitter = jitter
+        self.clock = clock
+        self.mode = "healthy"
+        self.interval = base_interval
+        self.consecutive_ok = 0
+        self.consecutive_failures = 0
+        self.down_since: float | None = None
+        self.last_recovery: float | None = None
+        self.last_downtime: float | None = None
+        self.next_check: float | None = None
+
+    def record(self, ok: bool) -> float:
+        """Record a check result and return the delay (seconds, jittered) before the next check."""
+        now = self.clock()
+        if ok:
+            if self.down_since is not None:
+                self.last_recovery = now
+                self.last_downtime = now - self.down_since
+                self.down_since = None
+            if self.mode != "healthy":
+                self.mode = "healthy"
+                self.interval = self.base_interval
+                self.consecutive_ok = 0
+            self.consecutive_failures = 0
+            self.consecutive_ok += 1
+            if self.consecutive_ok % self.grow_after == 0:
+                self.interval = min(self.max_interval, self.interval * self.growth)
+        else:
+            if self.down_since is None:
+                self.down_since = now
+            self.consecutive_ok = 0
+            self.consecutive_failures += 1
+            if self.consecutive_failures <= self.fast_checks:
+                self.mode = "recheck"
+                self.interval = self.fast_interval
+            else:
+                self.mode = "backoff"
+                doublings = self.consecutive_failures - self.fast_checks - 1
+                self.interval = min(self.backoff_max, self.base_interval * 2 ** min(doublings, 32))
+
+        delay = max(0.0, self.interval * (1.0 + random.uniform(-self.jitter, self.jitter)))
+        self.next_check = now + delay
+        return delay
+
+    def next_delay(self) -> float:
+        """Seconds until the scheduled next check (the base interval before the first result)."""
+        if self.next_check is None:
+            return self.base_interval
+        return max(0.0, self.next_check - self.clock())
+
+    def snapshot(self) -> dict:
+        def iso(ts):
+            return datetime.datetime.fromtimestamp(ts).isoformat(timespec="seconds") if ts is not None else None
+
+        return {
+            "mode": self.mode,
+            "interval_s": round(self.interval, 2),
+            "down_since": iso(self.down_since),
+            "last_recovery": iso(self.last_recovery),
+            "last_downtime_s": round(self.last_downtime, 1) if self.last_downtime is not None else None,
+        }
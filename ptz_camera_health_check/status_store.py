@@ -0,0 +1,169 @@
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Write JSON via a temp file + rename so readers never see a half-written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+class StatusStore:
+    """Status dict kept in memory and written to disk only when it matters.
+
+    The file is rewritten (atomically) when a non-volatile field changes, or at least
+    every `heartbeat` seconds so its timestamp still shows the monitor is alive.
+    Volatile fields (timestamp, per-check metrics) are updated in memory on every check
+    and ride along with the next write.
+    """
+
+    def __init__(self, path: str, volatile_keys=("timestamp",), heartbeat: float = 60.0) -> None:
+        self.path = path
+        self.volatile_keys = set(volatile_keys)
+        self.heartbeat = heartbeat
+        self.writes = 0
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        # Start from the previous run's file so fields like last_frame_path survive restarts
+        self.status = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fp:
+                self.status = json.load(fp)
+        except Exception:
+            self.status = {}
+
+    def update(self, fields: dict, defaults: dict | None = None) -> bool:
+        """Merge `fields` (and `defaults` for missing keys); write if needed. Returns True if written."""
+        with self._lock:
+            changed = False
+            for key, value in fields.items():
+                if self.status.get(key) != value:
+                    self.status[key] = value
+                    changed = changed or key not in self.volatile_keys
+            for key, value in (defaults or {}).items():
+                if key not in self.status:
+                    self.status[key] = value
+                    changed = True
+            now = time.monotonic()
+            if changed or now - self._last_write >= self.heartbeat:
+                try:
+                    write_json_atomic(self.path, self.status)
+                except OSError:
+                    return False
+                self._last_write = now
+                self.writes += 1
+                return True
+            return False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self.status))
+
+
+class CheckHistory:
+    """SQLite log of check results for uptime/latency queries.
+
+    Retention runs on open and every `prune_every` records: rows older than `keep_days`
+    are deleted and, with `max_rows`, the oldest rows beyond that count. Each pass ends
+    with a WAL checkpoint so the -wal file doesn't grow while the monitor runs for months.
+    """
+
+    def __init__(self, path: str, keep_days: float | None = 90.0, max_rows: int | None = None,
+                 prune_every: int = 500) -> None:
+        self.path = path
+        self.keep_days = keep_days
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._since_prune = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checks ("
+            " ts REAL NOT NULL, camera_index INTEGER, ok INTEGER NOT NULL,"
+            " backend TEXT, latency_ms REAL, reason TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS checks_ts ON checks (ts)")
+        self._db.commit()
+        self.prune()
+
+    def prune(self) -> int:
+        """Apply keep_days / max_rows and checkpoint the WAL. Returns the number of rows deleted."""
+        with self._lock:
+            deleted = 0
+            if self.keep_days:
+                deleted += self._db.execute("DELETE FROM checks WHERE ts < ?",
+                                            (time.time() - self.keep_days * 86400,)).rowcount
+            if self.max_rows:
+                deleted += self._db.execute(
+                    "DELETE FROM checks WHERE rowid IN (SELECT rowid FROM checks ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,)).rowcount
+            self._db.commit()
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._since_prune = 0
+            return deleted
+
+    def record(self, ok: bool, camera_index: int, backend: str | None, latency_ms: float,
+               reason: str | None = None, ts: float | None = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO checks (ts, camera_index, ok, backend, latency_ms, reason) VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time() if ts is None else ts, camera_index, int(bool(ok)), backend, latency_ms, reason),
+            )
+            self._db.commit()
+            self._since_prune += 1
+            due = self._since_prune >= self.prune_every
+        if due:
+            self.prune()
+
+    def summary(self, since: float, camera_index: int | None = None) -> dict:
+        """Return check count, uptime fraction and latency stats (ms) since `since` (unix time)."""
+        where = "ts >= ?"
+        params = [since]
+        if camera_index is not None:
+            where += " AND camera_index = ?"
+            params.append(camera_index)
+        with self._lock:
+            count, ok_count, avg_ms, max_ms = self._db.execute(
+                f"SELECT COUNT(*), SUM(ok), AVG(latency_ms), MAX(latency_ms) FROM checks WHERE {where}", params
+            ).fetchone()
+            latencies = [row[0] for row in self._db.execute(
+                f"SELECT latency_ms FROM checks WHERE {where} AND latency_ms IS NOT NULL ORDER BY latency_ms", params)]
+            reasons = dict(self._db.execute(
+                f"SELECT reason, COUNT(*) FROM checks WHERE {where} AND ok = 0 GROUP BY reason", params).fetchall())
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        return {
+            "checks": count,
+            "uptime": (ok_count or 0) / count if count else None,
+            "latency_ms": {"avg": avg_ms, "p95": p95, "max": max_ms},
+            "failures": reasons,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Summarize camera check history")
+    p.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "history.sqlite3"))
+    p.add_argument("--hours", type=float, default=24.0, help="Look-back window in hours (default 24)")
+    p.add_argument("--camera", type=int, default=None, help="Only this camera index")
+    args = p.parse_args()
+
+    history = CheckHistory(args.db)
+    since = time.time() - args.hours * 3600
+    result = history.summary(since, camera_index=args.camera)
+    result["since"] = datetime.datetime.fromtimestamp(since).isoformat(timespec="seconds")
+    print(json.dumps(result, indent=2))
+    history.close()
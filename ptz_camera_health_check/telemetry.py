@@ -0,0 +1,154 @@
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+# Carried across restart_process() so status shows how often the process restarted itself
+RESTARTS_ENV = "CAMERA_MONITOR_RESTARTS"
+
+
+class ProcessTelemetry:
+    """Sample this process's resource use at a low rate and decide when it should restart.
+
+    `poll()` is cheap and meant to be called from the main loop; every `interval`
+    seconds it records RSS, CPU % since the previous sample (can exceed 100 on several
+    cores), thread count and open handles (Windows) or file descriptors (elsewhere).
+
+    A limit (`max_rss_mb`, `max_handles`, `max_threads`) counts as crossed after
+    `breach_samples` consecutive samples above it, and never within `min_uptime`
+    seconds of start, so a spike or a limit set below the baseline can't cause a
+    restart loop. Once crossed, `restart_reason` is set; the entry point should clean
+    up as on a normal exit and call restart_process(). Without psutil (or with no
+    limits) nothing ever restarts.
+    """
+
+    def __init__(
+        self,
+        interval: float = 60.0,
+        max_rss_mb: float | None = None,
+        max_handles: int | None = None,
+        max_threads: int | None = None,
+        breach_samples: int = 3,
+        min_uptime: float = 600.0,
+        clock=time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.limits = {"rss_mb": max_rss_mb, "handles": max_handles, "threads": max_threads}
+        self.breach_samples = breach_samples
+        self.min_uptime = min_uptime
+        self.clock = clock
+        self.started = clock()
+        self.last: dict | None = None
+        self.peak_rss_mb = 0.0
+        self.restart_reason: str | None = None
+        self.restarts = int(os.environ.get(RESTARTS_ENV, "0") or 0)
+        self._breaches = {name: 0 for name in self.limits}
+        self._next_sample = self.started
+        try:
+            import psutil
+            self._process = psutil.Process()
+            self._process.cpu_percent(None)  # the first reading is always 0.0; prime it
+        except Exception:
+            self._process = None
+
+    @property
+    def available(self) -> bool:
+        return self._process is not None
+
+    def _handles(self) -> int | None:
+        try:
+            if sys.platform == "win32":
+                return self._process.num_handles()
+            return self._process.num_fds()
+        except Exception:
+            return None
+
+    def poll(self) -> dict | None:
+        """Take a sample if one is due. Returns the new sample, or None."""
+        now = self.clock()
+        if self._process is None or now < self._next_sample:
+            return None
+        self._next_sample = now + self.interval
+        try:
+            with self._process.oneshot():
+                rss_mb = self._process.memory_info().rss / (1024 * 1024)
+                cpu = self._process.cpu_percent(None)
+                threads = self._process.num_threads()
+        except Exception:
+            return None
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        self.last = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "uptime_s": round(now - self.started),
+            "rss_mb": round(rss_mb, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "cpu_percent": round(cpu, 1),
+            "threads": threads,
+            "handles": self._handles(),
+        }
+        self._check_limits(now)
+        return self.last
+
+    def _check_limits(self, now: float) -> None:
+        for name, limit in self.limits.items():
+            value = self.last.get(name)
+            if limit is None or value is None or value <= limit:
+                self._breaches[name] = 0
+                continue
+            self._breaches[name] += 1
+            if (self.restart_reason is None and self._breaches[name] >= self.breach_samples
+                    and now - self.started >= self.min_uptime):
+                self.restart_reason = f"{name} {value} > {limit} for {self._breaches[name]} samples"
+
+    def summary(self) -> str:
+        if self.last is None:
+            return "no sample"
+        s = self.last
+        return (f"rss={s['rss_mb']:.0f}MB (peak {s['peak_rss_mb']:.0f}MB) cpu={s['cpu_percent']:.0f}% "
+                f"threads={s['threads']} handles={s['handles']}")
+
+    def snapshot(self) -> dict:
+        """Latest sample plus limits, restart count and pending restart reason (for status output)."""
+        return {
+            **(self.last or {}),
+            "limits": {name: limit for name, limit in self.limits.items() if limit is not None},
+            "restarts": self.restarts,
+            "restart_reason": self.restart_reason,
+        }
+
+
+def add_telemetry_args(parser) -> None:
+    """Add the --telemetry-interval / --max-* watchdog flags shared by the entry points."""
+    parser.add_argument("--telemetry-interval", type=float, default=60.0,
+                        help="Seconds between process resource samples (default 60; 0 disables)")
+    parser.add_argument("--max-rss-mb", type=float, default=None,
+                        help="Restart the process when its RSS stays above this many MB")
+    parser.add_argument("--max-handles", type=int, default=None,
+                        help="Restart when open handles (Windows) / file descriptors stay above this")
+    parser.add_argument("--max-threads", type=int, default=None,
+                        help="Restart when the thread count stays above this")
+
+
+def telemetry_from_args(args) -> ProcessTelemetry | None:
+    if not args.telemetry_interval or args.telemetry_interval <= 0:
+        return None
+    return ProcessTelemetry(args.telemetry_interval, max_rss_mb=args.max_rss_mb,
+                            max_handles=args.max_handles, max_threads=args.max_threads)
+
+
+def restart_process() -> None:
+    """Replace this process with a fresh copy of itself (same interpreter and arguments).
+
+    Call it only after normal cleanup: exec skips atexit handlers and unflushed buffers.
+    """
+    os.environ[RESTARTS_ENV] = str(int(os.environ.get(RESTARTS_ENV, "0") or 0) + 1)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # orig_argv keeps "-m package.module" invocations intact
+    args = [sys.executable] + list((getattr(sys, "orig_argv", None) or [sys.executable] + sys.argv)[1:])
+    if sys.platform == "win32":
+        # Windows has no real exec (os.execv doesn't quote arguments with spaces); start a copy and exit
+        subprocess.Popen(args)
+        os._exit(0)
+    os.execv(sys.executable, args)
@@ -2,6 +2,7 @@
 """Test script for digital pan-tilt-zoom (software-based controls for non-PTZ cameras)."""
 
 import sys
+import time
 import cv2
 import numpy as np
 from main import CameraMonitor
@@ -84,6 +85,16 @@ def test_digital_ptz():
     zoom_3x = monitor.digital_zoom(frame, zoom_factor=3.0)
     print(f"  ✅ 3x zoom result: {zoom_3x.shape}")
     
+    # Test combined and batched rendering
+    print("\n[TEST 4] Testing Combined Pan+Tilt+Zoom (single resample)...")
+    combined = monitor.digital_ptz(frame, pan_offset=1.0, tilt_offset=-1.0, zoom_factor=2.0)
+    print(f"  ✅ Combined result: {combined.shape}")
+
+    print("  Rendering all cycle effects in a batch...")
+    start = time.perf_counter()
+    views = monitor.render_ptz_effects(frame)
+    print(f"  ✅ {len(views)} effects rendered in {(time.perf_counter() - start) * 1000:.1f} ms")
+
     # Save sample outputs
     print("\n[STEP 2] Saving sample outputs to monitor_frames/...")
     try:
@@ -96,6 +107,7 @@ def test_digital_ptz():
         cv2.imwrite("monitor_frames/digital_zoom_1x.jpg", zoom_1x)
         cv2.imwrite("monitor_frames/digital_zoom_2x.jpg", zoom_2x)
         cv2.imwrite("monitor_frames/digital_zoom_3x.jpg", zoom_3x)
+        cv2.imwrite("monitor_frames/digital_combined.jpg", combined)
         print("✅ Sample images saved")
     except Exception as e:
         print(f"⚠️  Could not save images: {e}")
@@ -6,97 +6,93 @@ import time
 from main import CameraMonitor
 
 
+def report_axis(result, axis):
+    """Print the outcome of one axis from PTZSession.apply(); return True if accepted."""
+    r = result.get(axis)
+    if r is None:
+        print(f"  ❌ {axis.capitalize()} command failed: {result.get('error', 'no result')}")
+        return False
+    if r["accepted"] or r["actual"] != -1:
+        print(f"  ✅ {axis.capitalize()} command accepted (actual: {r['actual']})")
+        return True
+    print(f"  ❌ {axis.capitalize()} command rejected or unsupported")
+    return False
+
+
 def test_ptz_support():
-    """Test if camera supports PTZ controls."""
+    """Test if camera supports PTZ controls (one device handle for the whole run)."""
     print("\n" + "="*60)
     print("PTZ CAMERA CONTROL TEST")
     print("="*60 + "\n")
 
     monitor = CameraMonitor()
 
-    # Test 1: Get current PTZ position
-    print("[TEST 1] Getting current PTZ position...")
-    position = monitor.get_ptz_position()
-    print(f"Result: {position}\n")
-
-    if "error" in position:
-        print("⚠️  Camera could not be opened. Skipping remaining PTZ tests.")
-        return False
-
-    pan = position.get("pan", -1)
-    tilt = position.get("tilt", -1)
-    zoom = position.get("zoom", -1)
-
-    # Check if any value is not -1 (indicates potential PTZ support)
-    has_ptz = (pan != -1) or (tilt != -1) or (zoom != -1)
-
-    if has_ptz:
-        print(f"✅ Camera reports PTZ values: pan={pan}, tilt={tilt}, zoom={zoom}")
-    else:
-        print("ℹ️  Camera returned all -1 values (typical for non-PTZ cameras)")
-        print("   Testing setters to confirm...")
-
-    # Test 2: Try to set pan
-    print("\n[TEST 2] Testing Pan control...")
-    print("  Attempting to set pan to 45 degrees...")
-    pan_result = monitor.set_pan(45)
-    if pan_result:
-        print("  ✅ Pan command accepted")
-    else:
-        print("  ❌ Pan command rejected or unsupported")
-
-    # Check new position
-    time.sleep(0.5)
-    new_position = monitor.get_ptz_position()
-    if "error" not in new_position:
-        new_pan = new_position.get("pan", -1)
-        print(f"  New pan value: {new_pan}\n")
-
-    # Test 3: Try to set tilt
-    print("[TEST 3] Testing Tilt control...")
-    print("  Attempting to set tilt to 30 degrees...")
-    tilt_result = monitor.set_tilt(30)
-    if tilt_result:
-        print("  ✅ Tilt command accepted")
-    else:
-        print("  ❌ Tilt command rejected or unsupported")
-
-    # Check new position
-    time.sleep(0.5)
-    new_position = monitor.get_ptz_position()
-    if "error" not in new_position:
-        new_tilt = new_position.get("tilt", -1)
-        print(f"  New tilt value: {new_tilt}\n")
-
-    # Test 4: Try to set zoom
-    print("[TEST 4] Testing Zoom control...")
-    print("  Attempting to set zoom to 5...")
-    zoom_result = monitor.set_zoom(5)
-    if zoom_result:
-        print("  ✅ Zoom command accepted")
-    else:
-        print("  ❌ Zoom command rejected or unsupported")
-
-    # Check new position
-    time.sleep(0.5)
-    new_position = monitor.get_ptz_position()
-    if "error" not in new_position:
-        new_zoom = new_position.get("zoom", -1)
-        print(f"  New zoom value: {new_zoom}\n")
-
-    # Test 5: Reset PTZ to home position
-    print("[TEST 5] Resetting PTZ to home position (0, 0, 0)...")
-    reset_result = monitor.reset_ptz()
-    if reset_result:
-        print("  ✅ PTZ reset command accepted")
-    else:
-        print("  ❌ PTZ reset command rejected or unsupported")
-
-    # Check final position
-    time.sleep(0.5)
-    final_position = monitor.get_ptz_position()
-    if "error" not in final_position:
+    with monitor.ptz_session() as ptz:
+        if not ptz.is_open:
+            print("⚠️  Camera could not be opened. Skipping PTZ tests.")
+            return False
+        print(f"Camera opened once in {ptz.open_ms:.0f} ms\n")
+
+        # Test 1: Get current PTZ position
+        print("[TEST 1] Getting current PTZ position...")
+        position = ptz.get_position()
+        print(f"Result: {position}\n")
+
+        pan = position.get("pan", -1)
+        tilt = position.get("tilt", -1)
+        zoom = position.get("zoom", -1)
+
+        # Check if any value is not -1 (indicates potential PTZ support)
+        has_ptz = (pan != -1) or (tilt != -1) or (zoom != -1)
+
+        if has_ptz:
+            print(f"✅ Camera reports PTZ values: pan={pan}, tilt={tilt}, zoom={zoom}")
+        else:
+            print("ℹ️  Camera returned all -1 values (typical for non-PTZ cameras)")
+            print("   Testing setters to confirm...")
+
+        # Tests 2-4: one axis per batch to measure single-command latency
+        print("\n[TEST 2] Testing Pan control...")
+        print("  Attempting to set pan to 45 degrees...")
+        pan_result = report_axis(ptz.queue_pan(45).apply(), "pan")
+        print(f"  Command latency: {ptz.last_latency_ms:.1f} ms")
+        time.sleep(0.5)
+        print(f"  New pan value: {ptz.get_position().get('pan', -1)}\n")
+
+        print("[TEST 3] Testing Tilt control...")
+        print("  Attempting to set tilt to 30 degrees...")
+        tilt_result = report_axis(ptz.queue_tilt(30).apply(), "tilt")
+        print(f"  Command latency: {ptz.last_latency_ms:.1f} ms")
+        time.sleep(0.5)
+        print(f"  New tilt value: {ptz.get_position().get('tilt', -1)}\n")
+
+        print("[TEST 4] Testing Zoom control...")
+        print("  Attempting to set zoom to 5...")
+        zoom_result = report_axis(ptz.queue_zoom(5).apply(), "zoom")
+        print(f"  Command latency: {ptz.last_latency_ms:.1f} ms")
+        time.sleep(0.5)
+        print(f"  New zoom value: {ptz.get_position().get('zoom', -1)}\n")
+
+        # Test 5: batched move
+        print("[TEST 5] Sending pan=-45, tilt=-30, zoom=2 as one batch...")
+        batch = ptz.queue_pan(-45).queue_tilt(-30).queue_zoom(2).apply()
+        for axis in ("pan", "tilt", "zoom"):
+            report_axis(batch, axis)
+        print(f"  Batch latency: {ptz.last_latency_ms:.1f} ms for 3 commands\n")
+
+        # Test 6: Reset PTZ to home position
+        print("[TEST 6] Resetting PTZ to home position (0, 0, 0)...")
+        reset_result = ptz.reset()
+        if reset_result:
+            print("  ✅ PTZ reset command accepted")
+        else:
+            print("  ❌ PTZ reset command rejected or unsupported")
+
+        # Check final position
+        time.sleep(0.5)
+        final_position = ptz.get_position()
         print(f"  Final position: pan={final_position.get('pan')}, tilt={final_position.get('tilt')}, zoom={final_position.get('zoom')}\n")
+        print(f"Commands sent on one handle: {ptz.commands_sent}")
 
     # Summary
     print("="*60)
@@ -107,11 +103,12 @@ def test_ptz_support():
         print("✅ Camera supports at least one PTZ control (Pan, Tilt, or Zoom)")
         print("\nTo use PTZ controls:")
         print("  monitor = CameraMonitor()")
-        print("  monitor.set_pan(45)        # Pan to 45 degrees")
-        print("  monitor.set_tilt(-15)      # Tilt to -15 degrees")
-        print("  monitor.set_zoom(5)        # Zoom to level 5")
-        print("  position = monitor.get_ptz_position()  # Get current position")
-        print("  monitor.reset_ptz()        # Reset to home (0, 0, 0)")
+        print("  with monitor.ptz_session() as ptz:")
+        print("      ptz.queue_pan(45).queue_tilt(-15).queue_zoom(5).apply()  # One batch")
+        print("      position = ptz.get_position()  # Get current position")
+        print("      ptz.reset()                    # Reset to home (0, 0, 0)")
+        print("      print(ptz.last_latency_ms)     # Measured batch latency")
+        print("  monitor.set_pan(45)  # Single command (opens the camera for this call)")
         return True
     else:
         print("ℹ️  Camera does not appear to support hardware PTZ controls.")
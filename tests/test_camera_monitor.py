@@ -0,0 +1,142 @@
+"""CameraMonitor.check_camera against scripted fake cameras (see capture_backend.FakeCamera)."""
+
+import json
+import os
+
+import pytest
+
+from ptz_camera_health_check.capture_backend import FakeBackend, FakeCamera
+from ptz_camera_health_check.device_presence import FakePresenceProvider
+from ptz_camera_health_check.main import CameraMonitor
+
+
+@pytest.fixture
+def make_monitor(tmp_path):
+    monitors = []
+
+    def make(camera, **options):
+        backend = FakeBackend({0: camera})
+        monitor = CameraMonitor(
+            capture_backend=backend,
+            presence_provider=options.pop("presence_provider", FakePresenceProvider()),
+            log_file=str(tmp_path / "monitor.log"),
+            save_dir=str(tmp_path / "frames"),
+            status_file=str(tmp_path / "status.json"),
+            history_file=str(tmp_path / "history.sqlite3"),
+            discovery_cache_file=str(tmp_path / "discovery_cache.json"),
+            probe_backoff_min=0.0,
+            log_console=False,
+            **{"enable_ptz_cycling": False, "frame_save_interval": float("inf"), **options},
+        )
+        monitors.append(monitor)
+        return monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.close()
+
+
+def read_status(monitor):
+    with open(monitor.status.path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def test_live_camera_passes(make_monitor):
+    camera = FakeCamera()
+    monitor = make_monitor(camera)
+    assert monitor.check_camera()
+    assert monitor.last_failure is None
+    status = read_status(monitor)
+    assert status["ok"] is True
+    assert status["backend"] == "DSHOW"
+    assert status["quality"]["ok"] is True
+    assert status["schedule"]["mode"] == "healthy"
+    assert monitor.history.summary(0)["uptime"] == 1.0
+
+
+def test_frozen_feed_fails_on_repeat(make_monitor):
+    camera = FakeCamera(mode="frozen")
+    monitor = make_monitor(camera, frozen_after=0.0)
+    assert monitor.check_camera()  # the first frame has nothing to match yet
+    assert not monitor.check_camera()
+    assert monitor.last_failure == "frozen"
+    status = read_status(monitor)
+    assert status["ok"] is False
+    assert status["feed"]["frozen"] is True
+    assert status["schedule"]["mode"] == "recheck"
+    assert monitor.history.summary(0)["failures"] == {"frozen": 1}
+
+
+def test_first_open_fails_then_recovers(make_monitor):
+    camera = FakeCamera(open_failures=2)  # DSHOW and MSMF both fail on the first check
+    monitor = make_monitor(camera)
+    assert not monitor.check_camera()
+    assert monitor.last_failure == "open_failed"
+    assert read_status(monitor)["schedule"]["mode"] == "recheck"
+
+    assert monitor.check_camera()
+    assert monitor.last_failure is None
+    status = read_status(monitor)
+    assert status["ok"] is True
+    assert status["schedule"]["mode"] == "healthy"
+    with open(monitor.discovery_cache_path, "r", encoding="utf-8") as fp:
+        assert json.load(fp)["backend"] == "DSHOW"
+
+
+def test_dead_reads_fail(make_monitor):
+    camera = FakeCamera(mode="dead")
+    monitor = make_monitor(camera, warmup_max_seconds=0.1)
+    assert not monitor.check_camera()
+    assert monitor.last_failure == "read_failed"
+    status = read_status(monitor)
+    assert status["ok"] is False
+    assert status["backend"] == "DSHOW"
+    assert monitor.history.summary(0)["failures"] == {"read_failed": 1}
+
+
+def test_camera_not_detected(make_monitor):
+    presence = FakePresenceProvider(present=False)
+    monitor = make_monitor(FakeCamera(), presence_provider=presence)
+    assert not monitor.check_camera()
+    assert monitor.last_failure == "not_detected"
+    # A negative answer is not cached, so a re-plugged camera is seen on the next check
+    presence.present = True
+    assert monitor.check_camera()
+    assert presence.calls == 2
+
+
+def test_persistent_session_reuses_handle(make_monitor):
+    camera = FakeCamera()
+    monitor = make_monitor(camera, persistent_session=True)
+    for _ in range(3):
+        assert monitor.check_camera()
+    assert camera.opens == 1
+    status = read_status(monitor)
+    assert status["capture_session"]["persistent"] is True
+    assert status["capture_session"]["opens"] == 1
+    assert status["capture_session"]["reuses"] == 2
+
+
+def test_persistent_session_reopens_after_failed_reads(make_monitor):
+    camera = FakeCamera()
+    monitor = make_monitor(camera, persistent_session=True, session_max_failures=2)
+    assert monitor.check_camera()
+    camera.mode = "dead"
+    assert not monitor.check_camera()
+    assert not monitor.check_camera()
+    assert monitor.last_failure == "read_failed"
+    assert monitor._session is None  # dropped after session_max_failures failed checks
+    camera.mode = "live"
+    assert monitor.check_camera()
+    assert camera.opens == 2
+
+
+def test_verification_frames_cycle_ptz_effects(make_monitor, tmp_path):
+    monitor = make_monitor(FakeCamera(width=320, height=240), enable_ptz_cycling=True, frame_save_interval=0,
+                           frame_dedup_distance=None)
+    for _ in range(3):
+        assert monitor.check_camera()
+        monitor.frame_saver.drain()  # the callback runs on the encoder thread
+    assert monitor.ptz_cycle_index == 3
+    saved = read_status(monitor)["last_frame_path"]
+    assert os.path.exists(saved) and saved.startswith(str(tmp_path / "frames"))
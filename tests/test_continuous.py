@@ -0,0 +1,65 @@
+import os
+import time
+
+import numpy as np
+
+from motion_recorder.continuous import ContinuousRecorder
+from motion_recorder.segments import SegmentCloser
+
+
+def old_segment(folder, name, size, days_old):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    with open(path, "wb") as fp:
+        fp.write(b"\0" * size)
+    then = time.time() - days_old * 86400
+    os.utime(path, (then, then))
+    return path
+
+
+def make_recorder(tmp_path, **options):
+    recorder = ContinuousRecorder(str(tmp_path), fps=1000.0, width=64, closer=SegmentCloser(),
+                                  check_interval=float("inf"), **options)
+    proc = np.zeros((60, 80), np.uint8)
+    assert recorder.offer(proc)
+    assert recorder.frame_size == (64, 48)
+    return recorder
+
+
+def test_keep_days_deletes_old_segments_but_not_the_active_one(tmp_path):
+    recorder = make_recorder(tmp_path, keep_days=1.0, max_mb=None)
+    try:
+        stale_day = os.path.join(str(tmp_path), "01_01_2020")
+        old_segment(stale_day, "08-00-00_000.mp4", 100, days_old=3)
+        open(os.path.join(stale_day, "08-00-00.json"), "w").close()
+        kept = old_segment(os.path.join(str(tmp_path), "02_01_2020"), "08-00-00_000.mp4", 100, days_old=0.5)
+        active = recorder._active_segment()
+        os.utime(active, (time.time() - 5 * 86400,) * 2)  # old, but still being written
+
+        recorder.enforce_limits()
+        assert recorder.deleted == 1
+        assert not os.path.exists(stale_day)  # manifests of a fully deleted day go too
+        assert os.path.exists(kept) and os.path.exists(active)
+    finally:
+        recorder.release()
+        recorder.closer.drain()
+
+
+def test_max_mb_deletes_oldest_first_and_skips_active(tmp_path):
+    recorder = make_recorder(tmp_path, keep_days=None, max_mb=1)
+    try:
+        day = os.path.join(str(tmp_path), "01_01_2020")
+        oldest = old_segment(day, "08-00-00_000.mp4", 600 * 1024, days_old=3)
+        older = old_segment(day, "08-00-00_001.mp4", 600 * 1024, days_old=2)
+        active = recorder._active_segment()
+        os.utime(active, (time.time() - 4 * 86400,) * 2)
+
+        recorder.enforce_limits()
+        assert not os.path.exists(oldest)
+        assert os.path.exists(older) and os.path.exists(active)
+        assert recorder.deleted == 1
+        assert recorder.bytes_on_disk <= 1024 * 1024
+    finally:
+        recorder.release()
+        recorder.closer.drain()
+    assert recorder.stats()["frames"] == 1
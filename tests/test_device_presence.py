@@ -0,0 +1,50 @@
+from ptz_camera_health_check.device_presence import (
+    CachedPresenceProvider,
+    FakePresenceProvider,
+    WindowsPresenceProvider,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class ConfirmOnlyProvider(FakePresenceProvider):
+    """Answers like the Windows PnP query: True or None, never False."""
+
+    reports_absence = False
+
+
+def test_cache_expires_after_ttl():
+    clock = FakeClock()
+    fake = FakePresenceProvider()
+    cached = CachedPresenceProvider(fake, ttl=300.0, clock=clock)
+    assert cached.camera_present() and cached.camera_present()
+    assert fake.calls == 1
+    clock.now += 300
+    assert cached.camera_present()
+    assert fake.calls == 2
+
+
+def test_invalidate_requeries_providers_that_report_absence():
+    fake = FakePresenceProvider()
+    cached = CachedPresenceProvider(fake, ttl=300.0, clock=FakeClock())
+    cached.camera_present()
+    fake.present = False
+    cached.invalidate()
+    assert cached.camera_present() is False
+    assert fake.calls == 2
+
+
+def test_invalidate_keeps_cache_for_confirm_only_providers():
+    assert WindowsPresenceProvider.reports_absence is False
+    provider = ConfirmOnlyProvider(present=None)
+    cached = CachedPresenceProvider(provider, ttl=300.0, clock=FakeClock())
+    for _ in range(5):  # e.g. a failed check every second during fast rechecks
+        assert cached.camera_present() is None
+        cached.invalidate()
+    assert provider.calls == 1
@@ -0,0 +1,56 @@
+import cv2
+import numpy as np
+import pytest
+
+from ptz_camera_health_check.digital_ptz import DigitalPTZ, crop_window
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (360, 640, 3), dtype=np.uint8)
+
+
+def reference(frame, steps):
+    """Crop and resize once per step, as the effects were originally rendered."""
+    h, w = frame.shape[:2]
+    out = frame
+    for kind, value in steps:
+        x1, y1, cw, ch = crop_window(kind, value, w, h)
+        out = cv2.resize(out[y1:y1 + ch, x1:x1 + cw], (w, h))
+    return out
+
+
+def test_crop_window_stays_inside():
+    for kind, value in (("pan", -1.0), ("pan", 1.0), ("tilt", -1.0), ("tilt", 1.0), ("zoom", 3.0), ("zoom", 9.0)):
+        x1, y1, cw, ch = crop_window(kind, value, 640, 360)
+        assert 0 <= x1 and 0 <= y1 and x1 + cw <= 640 and y1 + ch <= 360
+    assert crop_window("zoom", 0.1, 640, 360) == (0, 0, 640, 360)
+    with pytest.raises(ValueError):
+        crop_window("roll", 1.0, 640, 360)
+
+
+@pytest.mark.parametrize("steps", [(("pan", -1.0),), (("tilt", 1.0),), (("zoom", 2.0),)])
+def test_single_step_is_a_crop_matching_resize(frame, steps):
+    ptz = DigitalPTZ()
+    assert ptz.plan(640, 360, steps)[0] == "crop"
+    assert np.array_equal(ptz.apply(frame, steps), reference(frame, steps))
+
+
+def test_composed_steps_resample_once(frame):
+    ptz = DigitalPTZ()
+    steps = (("pan", 1.0), ("zoom", 1.7))
+    assert ptz.plan(640, 360, steps)[0] == "warp"
+    diff = np.abs(ptz.apply(frame, steps).astype(int) - reference(frame, steps).astype(int))
+    # One resample instead of two: close to, not identical with, the chained result
+    assert diff[20:-20, 20:-20].mean() < 40
+
+
+def test_render_reuses_buffers_and_skips_identity(frame):
+    ptz = DigitalPTZ()
+    assert ptz.render(frame, "zoom_out", (("zoom", 0.5),)) is frame
+    first = ptz.render(frame, "zoom_2x", (("zoom", 2.0),))
+    second = ptz.render(frame, "zoom_2x", (("zoom", 2.0),))
+    assert first is second
+    views = ptz.render_all(frame, [("original", ()), ("pan_left", (("pan", -1.0),))])
+    assert views["original"] is frame and views["pan_left"].shape == frame.shape
@@ -0,0 +1,95 @@
+import json
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from ptz_camera_health_check.capture_backend import FakeBackend, FakeCamera
+from ptz_camera_health_check.device_presence import FakePresenceProvider
+from ptz_camera_health_check.fleet import FleetMonitor
+from ptz_camera_health_check.main import CameraMonitor
+
+
+class RaisingMonitor(CameraMonitor):
+    def check_camera(self):
+        raise RuntimeError("driver exploded")
+
+
+@pytest.fixture
+def make_fleet(tmp_path):
+    fleets = []
+
+    def make(fakes, **options):
+        backend = FakeBackend(fakes)
+
+        def factory(camera_index, **monitor_options):
+            cls = RaisingMonitor if camera_index not in fakes else CameraMonitor
+            for key in ("log_file", "save_dir", "status_file", "discovery_cache_file"):
+                monitor_options[key] = str(tmp_path / monitor_options[key])
+            return cls(camera_index=camera_index, capture_backend=backend, presence_provider=FakePresenceProvider(),
+                       history_file=str(tmp_path / "history.sqlite3"), frame_save_interval=float("inf"),
+                       enable_ptz_cycling=False, warmup_max_seconds=0.2, **monitor_options)
+
+        fleet = FleetMonitor(monitor_factory=factory, fleet_status_file=str(tmp_path / "fleet_status.json"), **options)
+        fleets.append(fleet)
+        return fleet
+
+    yield make
+    for fleet in fleets:
+        fleet.close()
+
+
+def own_status(fleet, index):
+    with open(fleet.monitors[index].status.path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def test_failed_and_raising_checks_mark_camera_status(make_fleet):
+    cameras = {0: FakeCamera(width=320, height=240), 1: FakeCamera(width=320, height=240, mode="dead")}
+    fleet = make_fleet(cameras, cameras=[0, 1, 2], interval=0.3)  # camera 2's check raises
+    fleet.run(duration=1.0)
+
+    with open(fleet.fleet_status_path, "r", encoding="utf-8") as fp:
+        results = json.load(fp)["cameras"]
+    assert [results[str(i)]["state"] for i in range(3)] == ["ok", "failed", "failed"]
+    assert [own_status(fleet, i)["ok"] for i in range(3)] == [True, False, False]
+
+
+def test_check_returning_after_timeout_counts_as_failed(make_fleet):
+    fleet = make_fleet({0: FakeCamera(width=320, height=240)}, cameras=[0], check_timeout=0.1)
+    monitor = fleet.monitors[0]
+    assert monitor.check_camera()
+    assert own_status(fleet, 0)["ok"] is True
+
+    future = Future()
+    started = time.time()
+    running = {future: (0, started, time.monotonic() + 0.1)}
+    timed_out, due = set(), {0: float("inf")}
+    future.set_running_or_notify_cancel()
+    assert fleet._collect(running, timed_out, due, time.monotonic() + 1.0)
+    assert fleet.results[0]["state"] == "timeout" and future in timed_out
+
+    future.set_result(True)  # the stuck check finally returns, reporting success
+    assert fleet._collect(running, timed_out, due, time.monotonic())
+    assert fleet.results[0]["state"] == "failed"
+    assert fleet.results[0]["consecutive_failures"] == 2
+    assert not running and not timed_out and due[0] < float("inf")
+    assert own_status(fleet, 0)["ok"] is False
+    assert fleet.monitors[0].scheduler.mode == "recheck"
+
+
+def test_raising_check_is_not_resubmitted_at_once(make_fleet):
+    fleet = make_fleet({}, cameras=[0], check_timeout=5.0)
+    scheduler = fleet.monitors[0].scheduler
+    scheduler.record(True)
+    scheduler.next_check -= 3600  # the previous check's slot is long past
+    future = Future()
+    future.set_running_or_notify_cancel()
+    future.set_exception(RuntimeError("driver exploded"))
+    running = {future: (0, time.time(), time.monotonic() + 5.0)}
+    due = {0: float("inf")}
+    now = time.monotonic()
+    assert fleet._collect(running, set(), due, now)
+    assert fleet.results[0]["state"] == "failed"
+    assert scheduler.mode == "recheck" and scheduler.consecutive_failures == 1
+    assert due[0] - now >= scheduler.fast_interval * (1.0 - scheduler.jitter) - 0.1
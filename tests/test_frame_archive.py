@@ -0,0 +1,66 @@
+import json
+import os
+import zipfile
+
+import cv2
+import numpy as np
+
+from ptz_camera_health_check.frame_archive import compact, read_archived_frame
+
+
+def save_frames(folder, names):
+    for i, name in enumerate(names):
+        frame = np.full((48, 64, 3), 40 + i * 10, np.uint8)
+        cv2.imwrite(os.path.join(folder, name), frame)
+
+
+def zip_names(path):
+    with zipfile.ZipFile(path, "r") as archive:
+        return sorted(archive.namelist())
+
+
+def test_packs_finished_days_incrementally(tmp_path):
+    folder = str(tmp_path)
+    save_frames(folder, ["20200101_080000.jpg", "20200101_090000.jpg", "20200102_080000.jpg",
+                         "20200103_080000.jpg"])
+    summary = compact(folder, today="20200103", keep_days=None, log=lambda msg: None)
+    archive_dir = os.path.join(folder, "archive")
+    assert summary["archived"] == 3 and summary["days_packed"] == ["20200101", "20200102"]
+    assert zip_names(os.path.join(archive_dir, "20200101.zip")) == ["20200101_080000.jpg", "20200101_090000.jpg"]
+    assert not os.path.exists(os.path.join(archive_dir, "20200103.zip"))  # today is still being written
+    assert summary["deleted"] == 0
+
+    # A second run only packs what is new
+    assert compact(folder, today="20200103", keep_days=None, log=lambda msg: None)["archived"] == 0
+    save_frames(folder, ["20200102_180000.jpg"])
+    summary = compact(folder, today="20200103", keep_days=None, log=lambda msg: None)
+    assert summary["archived"] == 1 and summary["days_packed"] == ["20200102"]
+    with open(os.path.join(archive_dir, "state.json"), "r", encoding="utf-8") as fp:
+        assert json.load(fp)["days"]["20200102"]["count"] == 2
+
+    with open(os.path.join(folder, "20200101_090000.jpg"), "rb") as fp:
+        assert read_archived_frame(archive_dir, "20200101_090000.jpg") == fp.read()
+    assert read_archived_frame(archive_dir, "20200105_000000.jpg") is None
+
+
+def test_timelapse_and_retention_delete_only_archived(tmp_path):
+    folder = str(tmp_path)
+    save_frames(folder, ["20200101_080000.jpg", "20200101_090000.jpg", "20200102_080000.jpg"])
+    summary = compact(folder, today="20200102", timelapse=True, keep_days=0, log=lambda msg: None)
+    assert summary["timelapses"] == ["20200101"]
+    cap = cv2.VideoCapture(os.path.join(folder, "archive", "20200101.mp4"))
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 2
+    cap.release()
+    assert summary["deleted"] == 2
+    assert sorted(n for n in os.listdir(folder) if n.endswith(".jpg")) == ["20200102_080000.jpg"]
+
+
+def test_max_mb_deletes_oldest_archived_first(tmp_path):
+    folder = str(tmp_path)
+    save_frames(folder, ["20200101_080000.jpg", "20200101_090000.jpg", "20200102_080000.jpg"])
+    size = os.path.getsize(os.path.join(folder, "20200102_080000.jpg"))
+    summary = compact(folder, today="20200102", keep_days=None, max_mb=2.5 * size / (1024 * 1024),
+                      log=lambda msg: None)
+    assert summary["deleted"] == 1
+    assert not os.path.exists(os.path.join(folder, "20200101_080000.jpg"))
+    assert os.path.exists(os.path.join(folder, "20200101_090000.jpg"))
@@ -0,0 +1,78 @@
+import pytest
+
+from ptz_camera_health_check.frame_clock import FrameClock
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run(clock, frame_clock, intervals):
+    for interval in intervals:
+        clock.now += interval
+        frame_clock.stamp()
+
+
+def test_steady_stream_has_no_drops():
+    clock = FakeClock()
+    frame_clock = FrameClock(30.0, clock=clock)
+    run(clock, frame_clock, [1 / 30] * 100)
+    m = frame_clock.metrics()
+    assert m["dropped"] == 0
+    assert m["fps"] == pytest.approx(30.0, abs=0.01)
+    assert m["timestamp_source"] == "host"
+
+
+def test_measured_rate_wins_over_nominal():
+    # Claims 30 fps but delivers 15: no frame is dropped, and fps says 15
+    clock = FakeClock()
+    frame_clock = FrameClock(30.0, clock=clock)
+    run(clock, frame_clock, [1 / 15] * 300)
+    m = frame_clock.metrics()
+    assert m["dropped"] == 0
+    assert m["drop_rate"] == 0.0
+    assert m["fps"] == pytest.approx(15.0, abs=0.01)
+    assert m["nominal_fps"] == 30.0
+
+
+def test_gaps_count_missing_frames():
+    clock = FakeClock()
+    frame_clock = FrameClock(clock=clock)
+    run(clock, frame_clock, [0.1] * 20)
+    clock.now += 0.4  # three frames missing
+    stamp = frame_clock.stamp()
+    assert stamp.dropped == 3
+    run(clock, frame_clock, [0.1] * 10)
+    m = frame_clock.metrics()
+    assert m["dropped"] == 3
+    assert frame_clock.seq == frame_clock.frames + 3
+    assert m["fps"] == pytest.approx(10.0, abs=0.01)
+    assert m["max_interval_ms"] == pytest.approx(400.0)
+
+
+def test_jitter_below_the_gap_is_not_a_drop():
+    clock = FakeClock()
+    frame_clock = FrameClock(clock=clock)
+    run(clock, frame_clock, [0.1, 0.12, 0.08, 0.17, 0.1, 0.09, 0.11] * 10)
+    assert frame_clock.dropped == 0
+    assert frame_clock.metrics()["jitter_ms"] > 0
+
+
+def test_reset_skips_the_pause():
+    clock = FakeClock()
+    frame_clock = FrameClock(clock=clock)
+    run(clock, frame_clock, [0.1] * 10)
+    clock.now += 60.0  # reads paused between health checks
+    frame_clock.reset()
+    run(clock, frame_clock, [0.1] * 10)
+    assert frame_clock.dropped == 0
+    assert frame_clock.frames == 20
+
+
+def test_nonsense_nominal_fps_is_ignored():
+    assert FrameClock(1000.0).nominal_fps is None
+    assert FrameClock(-1.0).nominal_fps is None
@@ -0,0 +1,98 @@
+import struct
+import uuid
+
+import numpy as np
+import pytest
+
+from motion_recorder.frame_feed import SEQ_OFFSET, FrameFeedReader, FramePublisher
+from ptz_camera_health_check.capture_backend import FeedBackend
+
+
+@pytest.fixture
+def publisher():
+    publisher = FramePublisher(f"test_feed_{uuid.uuid4().hex[:12]}")
+    yield publisher
+    publisher.close()
+
+
+def frame(value, shape=(24, 32, 3)):
+    return np.full(shape, value, np.uint8)
+
+
+def test_publish_and_read_newest(publisher):
+    reader = FrameFeedReader(publisher.name)
+    assert not reader.attach()  # nothing published yet
+    assert publisher.publish(frame(10), {"fps": 15.0})
+    assert publisher.publish(frame(20), {"fps": 15.0})
+    assert reader.attach()
+    try:
+        got = reader.read(timeout=0.1)
+        assert got.number == 2 and got.pid > 0
+        assert got.stats == {"fps": 15.0}
+        assert np.array_equal(got.frame, frame(20))
+        assert reader.read(after_seq=got.seq, timeout=0.05) is None  # nothing newer
+        assert reader.header()["width"] == 32
+    finally:
+        reader.close()
+
+
+def test_reader_skips_frame_being_written(publisher):
+    publisher.publish(frame(10))
+    reader = FrameFeedReader(publisher.name)
+    assert reader.attach()
+    try:
+        # An odd sequence means the writer is mid-update; the reader must not return that frame
+        struct.pack_into("<Q", publisher._shm.buf, SEQ_OFFSET, 3)
+        assert reader.read(timeout=0.05) is None
+        struct.pack_into("<Q", publisher._shm.buf, SEQ_OFFSET, 4)
+        assert reader.read(timeout=0.05).seq == 4
+    finally:
+        reader.close()
+
+
+def test_gray_frames_and_growing_block(publisher):
+    publisher.publish(frame(10, (12, 16)))
+    publisher.publish(frame(30))  # larger than the first block: recreated
+    reader = FrameFeedReader(publisher.name)
+    assert reader.attach()
+    try:
+        assert reader.read(timeout=0.1).frame.shape == (24, 32, 3)
+    finally:
+        reader.close()
+
+
+def test_feed_capture_reads_and_rejects_stale_feed(publisher):
+    publisher.publish(frame(10))
+    cap = FeedBackend(publisher.name, read_timeout=0.05).open(0)
+    try:
+        assert cap.isOpened()
+        ok, image = cap.read()
+        assert ok and image[0, 0, 0] == 10
+        ok, _ = cap.read()
+        assert not ok  # recorder stopped publishing: fails like an unplugged camera
+        publisher.publish(frame(40))
+        ok, image = cap.read()
+        assert ok and image[0, 0, 0] == 40
+        assert cap.info()["frame"] == 2
+    finally:
+        cap.release()
+
+    stale = FeedBackend(publisher.name, stale_after=0.0).open(0)
+    assert not stale.isOpened()
+    assert FeedBackend("test_feed_missing_" + uuid.uuid4().hex[:8]).open(0).isOpened() is False
+
+
+def test_feed_capture_grab_skips_to_newest_frame(publisher):
+    publisher.publish(frame(10))
+    cap = FeedBackend(publisher.name, read_timeout=0.05).open(0)
+    try:
+        assert cap.read()[0]
+        for value in (20, 30, 40):
+            publisher.publish(frame(value))
+        assert cap.grab()
+        ok, image = cap.read()  # the newest frame, at once
+        assert ok and image[0, 0, 0] == 40
+        assert cap.grab()
+        assert not cap.read()[0]  # nothing newer was published
+    finally:
+        cap.release()
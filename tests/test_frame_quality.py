@@ -0,0 +1,103 @@
+import cv2
+import numpy as np
+
+from ptz_camera_health_check.frame_quality import (
+    ExposureConvergence,
+    FrozenFeedDetector,
+    analyze_frame,
+    average_hash,
+    hamming,
+)
+
+
+def live_frame(seed=0, noise_seed=0):
+    """Textured mid-grey scene with some structure and sensor noise, like a real camera frame."""
+    rng = np.random.default_rng(seed)
+    frame = np.full((360, 640, 3), 110, np.uint8)
+    for _ in range(12):
+        x, y = rng.integers(0, 560), rng.integers(0, 300)
+        cv2.rectangle(frame, (int(x), int(y)), (int(x) + 80, int(y) + 60), [int(c) for c in rng.integers(20, 230, 3)], -1)
+    noise = np.random.default_rng(1000 + noise_seed).integers(-6, 7, frame.shape)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_live_frame_is_ok():
+    quality = analyze_frame(live_frame())
+    assert quality.ok and quality.reason == ""
+    assert quality.edges > 0 and quality.blur > 0
+
+
+def test_unusable_frames():
+    assert analyze_frame(None).reason == "none"
+    assert analyze_frame(np.zeros((0, 0, 3), np.uint8)).reason == "empty"
+    assert analyze_frame(np.zeros((360, 640, 3), np.uint8)).reason == "black"
+    assert analyze_frame(np.full((360, 640, 3), 128, np.uint8)).reason == "flat"
+    white = analyze_frame(np.full((360, 640, 3), 255, np.uint8))
+    assert white.reason == "overexposed" and white.overexposed and not white.ok
+
+
+def test_blur_is_flagged_not_failed():
+    quality = analyze_frame(cv2.GaussianBlur(live_frame(), (31, 31), 0), blur_thresh=1e6)
+    assert quality.ok and quality.blurry
+
+
+def test_exposure_convergence():
+    conv = ExposureConvergence(stable_frames=3, tolerance=2.0)
+    dark = np.full((64, 64), 3, np.uint8)
+    assert not any(conv.update(dark) for _ in range(5))  # stable but black keeps waiting
+    assert not conv.update(np.full((64, 64), 80, np.uint8))
+    assert not conv.update(np.full((64, 64), 81, np.uint8))
+    assert conv.update(np.full((64, 64), 80, np.uint8))
+    assert conv.level == 80
+
+def test_average_hash_tolerates_noise():
+    frame = live_frame()
+    noisy = frame.copy()
+    noisy[..., 0] ^= 1
+    assert hamming(average_hash(frame[..., 1]), average_hash(noisy[..., 1])) <= 2
+
+
+def test_frozen_after_static_seconds():
+    clock = FakeClock()
+    detector = FrozenFeedDetector(max_static_seconds=30.0, clock=clock)
+    frame = live_frame()
+    assert not detector.update(frame)
+    clock.now += 20
+    assert not detector.update(frame)
+    assert detector.static_seconds == 20
+    clock.now += 15
+    assert detector.update(frame)
+    assert detector.is_frozen
+
+    # A different frame ends the static run
+    clock.now += 1
+    assert not detector.update(live_frame(5))
+    assert detector.static_seconds == 0.0
+
+
+def test_noisy_static_scene_is_not_frozen():
+    clock = FakeClock()
+    detector = FrozenFeedDetector(max_static_seconds=0.0, max_distance=64, clock=clock)
+    for i in range(5):
+        clock.now += 10
+        assert not detector.update(live_frame(noise_seed=i))  # exact=True: sensor noise means not frozen
+
+
+def test_reset_and_history_ring():
+    clock = FakeClock()
+    detector = FrozenFeedDetector(max_static_seconds=0.0, history=4, clock=clock)
+    frame = live_frame()
+    for _ in range(10):
+        clock.now += 1
+        detector.update(frame)
+    assert detector.count == 10 and detector.is_frozen
+    detector.reset()
+    assert detector.last_hash is None and not detector.is_frozen
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import cv2
+
+from ptz_camera_health_check.capture_backend import FakeBackend, FakeCamera
+from ptz_camera_health_check.health_check import probe
+
+
+class TrackingBackend(FakeBackend):
+    """FakeBackend recording the most opens of one index in flight at once."""
+
+    def __init__(self, cameras):
+        super().__init__(cameras)
+        self.active = {}
+        self.max_active = {}
+        self._lock = threading.Lock()
+
+    def open(self, index, api=None):
+        with self._lock:
+            self.active[index] = self.active.get(index, 0) + 1
+            self.max_active[index] = max(self.max_active.get(index, 0), self.active[index])
+        try:
+            return super().open(index, api)
+        finally:
+            with self._lock:
+                self.active[index] -= 1
+
+
+def test_backends_of_one_index_run_in_turn():
+    cameras = {i: FakeCamera(width=64, height=48, open_delay=0.2) for i in (0, 1)}
+    backend = TrackingBackend(cameras)
+    started = time.perf_counter()
+    report = probe([0, 1], ["dshow", "msmf"], timeout=2.0, capture_backend=backend)
+    assert backend.max_active == {0: 1, 1: 1}
+    # Indices still overlap: two indices x two backends take about two opens, not four
+    assert time.perf_counter() - started < 0.7
+    assert [(c["index"], c["backends"]) for c in report["cameras"]] == [(0, ["DSHOW", "MSMF"]), (1, ["DSHOW", "MSMF"])]
+    assert not any(r["timeout"] for r in report["results"])
+
+
+def test_hung_backend_times_out_its_index_only():
+    cameras = {0: FakeCamera(width=64, height=48, open_delay=5.0), 1: FakeCamera(width=64, height=48)}
+    report = probe([0, 1], ["dshow", "msmf"], timeout=0.1, capture_backend=FakeBackend(cameras))
+    timed_out = {(r["index"], r["backend"]) for r in report["results"] if r["timeout"]}
+    assert timed_out == {(0, "DSHOW"), (0, "MSMF")}
+    assert [c["index"] for c in report["cameras"]] == [1]
+    assert report["elapsed_ms"] < 1000
+
+
+def test_failing_api_is_reported_not_opened():
+    camera = FakeCamera(width=64, height=48, failing_apis={cv2.CAP_DSHOW})
+    report = probe([0], ["dshow", "msmf"], capture_backend=FakeBackend({0: camera}))
+    assert report["cameras"] == [{"index": 0, "backends": ["MSMF"], "fastest": "MSMF"}]
+
+
+class SlowOpenBackend(FakeBackend):
+    """FakeBackend whose opens take `delays[api]` seconds, but do return."""
+
+    def __init__(self, cameras, delays):
+        super().__init__(cameras)
+        self.delays = delays
+
+    def open(self, index, api=None):
+        time.sleep(self.delays.get(api, 0.0))
+        return super().open(index, api)
+
+
+def test_pair_slower_than_timeout_is_marked_timed_out():
+    delays = {cv2.CAP_DSHOW: 0.45, cv2.CAP_MSMF: 0.1}
+    backend = SlowOpenBackend({0: FakeCamera(width=64, height=48)}, delays)
+    report = probe([0], ["dshow", "msmf"], timeout=0.25, capture_backend=backend)
+    dshow, msmf = report["results"]
+    assert dshow["opened"] and dshow["timeout"]  # returned, but over its own timeout
+    # MSMF starts 0.45 s in and still gets its full timeout, past timeout x backends
+    assert msmf["opened"] and not msmf["timeout"]
+    assert report["cameras"] == [{"index": 0, "backends": ["MSMF"], "fastest": "MSMF"}]
@@ -0,0 +1,37 @@
+import json
+import logging
+import os
+
+import pytest
+
+from motion_recorder.live_config import ConfigWatcher, validate
+
+
+def test_validate_converts_and_drops_unknown_keys():
+    values = validate({"thresh": "20", "min-area": 800, "width": 0, "segment_seconds": 15, "colour": "red"})
+    assert values == {"thresh": 20, "min_area": 800, "width": None, "segment_seconds": 15.0}
+
+
+@pytest.mark.parametrize("raw", [{"min_frames": 0}, {"segment_seconds": 0}, {"thresh": -1}, {"min_area": "big"},
+                                 {"width": 1}, {"width": 15}])
+def test_validate_rejects_bad_values(raw):
+    with pytest.raises(ValueError):
+        validate(raw)
+
+
+def test_watcher_keeps_settings_when_reload_is_invalid(tmp_path, caplog):
+    path = tmp_path / "motion.json"
+    path.write_text(json.dumps({"min_frames": 3, "segment_seconds": 30}))
+    watcher = ConfigWatcher(str(path), poll_interval=0.0)
+    assert watcher.poll() == {"min_frames": 3, "segment_seconds": 30.0}
+
+    path.write_text(json.dumps({"min_frames": 0, "segment_seconds": 30}))
+    os.utime(path, ns=(1, 1))  # make sure the change is seen even within one mtime tick
+    with caplog.at_level(logging.WARNING, logger="motion_recorder.live_config"):
+        assert watcher.poll() is None
+    assert "min_frames must be positive" in caplog.text
+    assert watcher.current == {"min_frames": 3, "segment_seconds": 30.0}
+
+
+def test_validate_accepts_minimum_width():
+    assert validate({"width": 16}) == {"width": 16}
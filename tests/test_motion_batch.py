@@ -0,0 +1,42 @@
+import signal
+
+import cv2
+import numpy as np
+
+# motion_recording installs SIGINT/SIGTERM handlers at import; keep pytest's
+_handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+from motion_recorder.motion_recording import detect_motion, detect_motion_batch  # noqa: E402
+for _sig, _handler in _handlers.items():
+    signal.signal(_sig, _handler)
+
+
+def make_frames(n=8, h=120, w=160, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = np.empty((n, h, w), dtype=np.uint8)
+    for i in range(n):
+        frames[i] = rng.integers(60, 66, (h, w), dtype=np.uint8)  # noise below the threshold
+        if i % 3:
+            x = 10 + 12 * i
+            frames[i, 20:70, x:x + 30] = 200  # a moving block
+    # Motion touching the bottom edge, so padding between stacked frames matters
+    if n > 5:
+        frames[5, h - 25:, 40:100] = 220
+    return frames
+
+
+def test_batch_matches_pairwise():
+    frames = make_frames()
+    flags, changed, boxes = detect_motion_batch(frames, thresh_val=15, min_area=500)
+    assert not flags[0] and boxes[0] == []
+    for i in range(1, len(frames)):
+        motion, diff, _, contours = detect_motion(frames[i - 1], frames[i], thresh_val=15, min_area=500)
+        assert flags[i] == motion
+        assert changed[i] == np.count_nonzero(diff > 15)
+        expected = sorted(tuple(int(v) for v in cv2.boundingRect(c)) for c in contours)
+        assert sorted(boxes[i]) == expected
+    assert flags.any()
+
+
+def test_batch_short_stack():
+    flags, changed, boxes = detect_motion_batch(make_frames(n=1))
+    assert flags.tolist() == [False] and changed.tolist() == [0] and boxes == [[]]
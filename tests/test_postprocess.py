@@ -0,0 +1,66 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from motion_recorder.postprocess import PostProcessor, contact_sheet, process_clip
+from motion_recorder.segments import SegmentCloser, SegmentedRecorder
+
+
+def record_event(folder, frames=20, **options):
+    closer = SegmentCloser()
+    recorder = SegmentedRecorder(str(folder), "event", cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (160, 120),
+                                 closer=closer, max_peaks=3, **options)
+    for i in range(frames):
+        img = np.full((120, 160, 3), 40, dtype=np.uint8)
+        img[:, (i * 7) % 150:(i * 7) % 150 + 10] = 250
+        recorder.write(img, score=i % 7)  # peaks: scores 6, 6, 5
+    recorder.release()
+    closer.drain()
+    return recorder
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def test_contact_sheet_tiles_row_major():
+    images = [np.full((10, 20, 3), v, np.uint8) for v in (10, 20, 30, 40)]
+    sheet = contact_sheet(images, columns=3)
+    assert sheet.shape == (20, 60, 3)
+    assert sheet[0, 0, 0] == 10 and sheet[0, 45, 0] == 30 and sheet[15, 5, 0] == 40 and sheet[15, 45, 0] == 0
+    assert contact_sheet([]) is None
+
+
+def test_process_clip_writes_thumbnails_sheet_and_recompressed_copy(tmp_path):
+    recorder = record_event(tmp_path)
+    manifest = load(recorder.manifest_path)
+    assert [p["score"] for p in manifest["peaks"]] == [6, 6, 5]
+
+    result = process_clip(recorder.manifest_path, thumb_width=80, recompress_fourcc="mp4v", recompress_scale=0.5)
+    assert result["thumbnails"] == ["event_peak0.jpg", "event_peak1.jpg", "event_peak2.jpg"]
+    assert cv2.imread(str(tmp_path / "event_peak0.jpg")).shape == (60, 80, 3)
+    assert cv2.imread(str(tmp_path / result["contact_sheet"])).shape == (60, 240, 3)
+    small = cv2.VideoCapture(str(tmp_path / "event_small.mp4"))
+    assert int(small.get(cv2.CAP_PROP_FRAME_COUNT)) == 20 and small.get(cv2.CAP_PROP_FRAME_WIDTH) == 80
+    small.release()
+    assert load(recorder.manifest_path)["postprocess"] == result
+
+
+def test_pool_processes_completed_events(tmp_path):
+    processor = PostProcessor(max_workers=1, thumb_width=80)
+    try:
+        recorder = record_event(tmp_path, on_complete=processor.submit)
+    finally:
+        processor.shutdown(wait=True)
+    result = load(recorder.manifest_path)["postprocess"]
+    assert len(result["thumbnails"]) == 3 and result["recompressed"] is None
+    assert os.path.exists(tmp_path / result["contact_sheet"])
+
+
+def test_full_queue_skips_clip(tmp_path):
+    processor = PostProcessor(max_pending=0)
+    assert not processor.submit(str(tmp_path / "event.json"))
+    processor.shutdown()
@@ -0,0 +1,58 @@
+import cv2
+
+from ptz_camera_health_check.ptz_session import PTZSession
+
+
+class StubCapture:
+    """Capture handle that records every property write."""
+
+    def __init__(self, reject=()):
+        self.props = {}
+        self.sets = []
+        self.reject = set(reject)
+        self.released = False
+
+    def isOpened(self):
+        return not self.released
+
+    def set(self, prop, value):
+        self.sets.append((prop, value))
+        if prop in self.reject:
+            return False
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def release(self):
+        self.released = True
+
+
+def test_apply_sends_last_value_per_axis_as_one_batch():
+    cap = StubCapture()
+    session = PTZSession(cap=cap, log=lambda msg: None)
+    session.queue_pan(10).queue_pan(20).queue_zoom(150)
+    results = session.apply()
+
+    assert cap.sets == [(cv2.CAP_PROP_PAN, 20.0), (cv2.CAP_PROP_ZOOM, 150.0)]
+    assert results["pan"] == {"requested": 20.0, "accepted": True, "actual": 20.0}
+    assert results["zoom"]["actual"] == 150.0
+    assert session.commands_sent == 2
+    assert session.last_latency_ms is not None
+    assert session.apply() == {}  # queue is drained
+
+
+def test_reset_reports_rejected_axis():
+    cap = StubCapture(reject={cv2.CAP_PROP_TILT})
+    session = PTZSession(cap=cap, log=lambda msg: None)
+    assert session.reset() is False
+    assert len(cap.sets) == 3
+
+
+def test_borrowed_capture_is_not_released():
+    cap = StubCapture()
+    with PTZSession(cap=cap, log=lambda msg: None) as session:
+        session.queue_tilt(5).apply()
+        assert session.get_position()["tilt"] == 5.0
+    assert not cap.released
@@ -0,0 +1,44 @@
+import time
+
+from ptz_camera_health_check import queued_log
+from ptz_camera_health_check.queued_log import start_queued_logger
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def test_quiet_log_is_flushed_without_new_records(tmp_path):
+    path = tmp_path / "monitor.log"
+    logger, listener = start_queued_logger("test_queued_log.quiet", str(path), flush_interval=0.1, console=False)
+    try:
+        logger.info("OK: Frame captured from index 0")
+        # Below WARNING and far from 32 records: only the idle flush can write it
+        assert wait_for(lambda: path.exists() and "Frame captured" in path.read_text())
+    finally:
+        listener.stop()
+
+
+def test_warning_flushes_at_once_and_stop_writes_the_rest(tmp_path):
+    path = tmp_path / "monitor.log"
+    logger, listener = start_queued_logger("test_queued_log.levels", str(path), flush_interval=60.0, console=False)
+    logger.info("first")
+    logger.warning("WARN: second")
+    assert wait_for(lambda: path.exists() and "second" in path.read_text())
+    logger.info("third")
+    listener.stop()
+    lines = path.read_text().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["first", "WARN: second", "third"]
+
+
+def test_listeners_share_one_exit_hook(tmp_path):
+    listeners = [start_queued_logger(f"test_queued_log.exit{i}", str(tmp_path / f"{i}.log"), console=False)[1]
+                 for i in range(3)]
+    assert all(listener in queued_log._listeners for listener in listeners)
+    queued_log._stop_listeners()
+    assert all(listener._thread is None for listener in listeners)
@@ -0,0 +1,58 @@
+from ptz_camera_health_check.scheduler import AdaptiveScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make(clock, **options):
+    options.setdefault("jitter", 0.0)
+    return AdaptiveScheduler(5.0, max_interval=20.0, growth=2.0, grow_after=2, fast_interval=1.0,
+                             fast_checks=2, backoff_max=40.0, clock=clock, **options)
+
+
+def test_healthy_interval_grows_to_max():
+    scheduler = make(FakeClock())
+    assert scheduler.next_delay() == 5.0
+    delays = [scheduler.record(True) for _ in range(6)]
+    assert delays == [5.0, 10.0, 10.0, 20.0, 20.0, 20.0]
+    assert scheduler.mode == "healthy"
+
+
+def test_failures_recheck_then_back_off():
+    scheduler = make(FakeClock())
+    delays = [scheduler.record(False) for _ in range(6)]
+    assert delays == [1.0, 1.0, 5.0, 10.0, 20.0, 40.0]
+    assert scheduler.mode == "backoff"
+    assert scheduler.record(False) == 40.0
+
+
+def test_recovery_resets_and_reports_downtime():
+    clock = FakeClock()
+    scheduler = make(clock)
+    scheduler.record(True)
+    scheduler.record(True)
+    scheduler.record(False)
+    down = clock.now
+    clock.now += 1.0
+    scheduler.record(False)
+    clock.now += 42.0
+    assert scheduler.record(True) == 5.0
+    assert scheduler.mode == "healthy"
+    assert scheduler.last_downtime == clock.now - down
+    snapshot = scheduler.snapshot()
+    assert snapshot["down_since"] is None and snapshot["last_downtime_s"] == 43.0
+
+
+def test_jitter_bounds_and_next_delay():
+    clock = FakeClock()
+    scheduler = make(clock, jitter=0.1)
+    for _ in range(50):
+        delay = scheduler.record(True)
+        assert 0.9 * scheduler.interval <= delay <= 1.1 * scheduler.interval
+    clock.now += 3.0
+    assert abs(scheduler.next_delay() - max(0.0, delay - 3.0)) < 1e-6
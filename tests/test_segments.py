@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from motion_recorder.segments import SegmentCloser, SegmentedRecorder
+
+
+def frame(i, size=(160, 120)):
+    img = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    img[:, (i * 8) % size[0]:(i * 8) % size[0] + 8] = 255
+    return img
+
+
+def read_manifest(recorder):
+    with open(recorder.manifest_path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def test_segments_roll_and_manifest_is_finalized(tmp_path):
+    closer = SegmentCloser()
+    recorder = SegmentedRecorder(str(tmp_path), "event", cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (160, 120),
+                                 segment_seconds=0.2, closer=closer)
+    for i in range(3):
+        recorder.write(frame(i))
+    manifest = read_manifest(recorder)
+    assert [s["file"] for s in manifest["segments"]] == ["event_000.mp4"]
+    assert not manifest["complete"]
+
+    time.sleep(0.25)
+    for i in range(3, 5):
+        recorder.write(frame(i))
+    recorder.release()
+    closer.drain()
+
+    manifest = read_manifest(recorder)
+    assert manifest["complete"] and "ended" in manifest
+    assert [(s["file"], s["frames"], s["finalized"]) for s in manifest["segments"]] == [
+        ("event_000.mp4", 3, True), ("event_001.mp4", 2, True)]
+    for segment in manifest["segments"]:
+        cap = cv2.VideoCapture(os.path.join(str(tmp_path), segment["file"]))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == segment["frames"]
+        cap.release()
+    assert not os.path.exists(recorder.manifest_path + ".tmp")
+
+
+def test_writes_after_release_are_ignored(tmp_path):
+    closer = SegmentCloser()
+    recorder = SegmentedRecorder(str(tmp_path), "event", cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (160, 120),
+                                 closer=closer)
+    recorder.write(frame(0))
+    recorder.release()
+    recorder.release()
+    recorder.write(frame(1))
+    closer.drain()
+    assert [s["frames"] for s in read_manifest(recorder)["segments"]] == [1]
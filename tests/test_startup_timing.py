@@ -0,0 +1,34 @@
+import json
+import time
+
+import psutil
+
+from motion_recorder import startup_timing
+from motion_recorder.startup_timing import StartupTimer
+
+
+def test_marks_count_from_process_creation():
+    timer = StartupTimer()
+    timer.mark("imports")
+    timer.mark("imports")  # only the first hit counts
+    age = time.time() - psutil.Process().create_time()
+    assert timer.origin == "process"
+    assert abs(timer.marks["imports"] - age) < 0.1
+    assert "since" not in timer.summary()
+
+
+def test_falls_back_to_timer_start_without_psutil(monkeypatch):
+    monkeypatch.setattr(startup_timing, "process_start", lambda: None)
+    timer = StartupTimer()
+    timer.mark("first_frame")
+    assert timer.origin == "timer"
+    assert 0 <= timer.marks["first_frame"] < 0.1
+    assert timer.summary().endswith("(since timer start)")
+
+
+def test_write_json(tmp_path):
+    timer = StartupTimer(start=time.perf_counter() - 1.0)
+    timer.mark("camera_open")
+    timer.write_json(tmp_path / "startup.json")
+    report = json.loads((tmp_path / "startup.json").read_text())
+    assert list(report) == ["camera_open"] and 1.0 <= report["camera_open"] < 1.1
@@ -0,0 +1,70 @@
+import json
+import time
+
+from ptz_camera_health_check.status_store import CheckHistory, StatusStore
+
+
+def test_writes_only_on_change(tmp_path):
+    path = tmp_path / "status.json"
+    store = StatusStore(str(path), volatile_keys=("timestamp", "latency_ms"), heartbeat=3600)
+    assert store.update({"ok": True, "timestamp": "t1"}, defaults={"backend": "DSHOW/MSMF"})
+    assert not store.update({"ok": True, "timestamp": "t2", "latency_ms": 12.0})
+    assert json.loads(path.read_text())["timestamp"] == "t1"  # volatile changes ride along later
+    assert store.update({"ok": False, "timestamp": "t3"})
+    saved = json.loads(path.read_text())
+    assert saved == {"ok": False, "timestamp": "t3", "latency_ms": 12.0, "backend": "DSHOW/MSMF"}
+    assert store.writes == 2
+
+
+def test_heartbeat_rewrites(tmp_path):
+    store = StatusStore(str(tmp_path / "status.json"), heartbeat=0.0)
+    store.update({"ok": True})
+    assert store.update({"timestamp": "later"})
+
+
+def test_reloads_previous_file(tmp_path):
+    path = tmp_path / "status.json"
+    StatusStore(str(path)).update({"last_frame_path": "frame.jpg"})
+    assert StatusStore(str(path)).snapshot() == {"last_frame_path": "frame.jpg"}
+
+
+def test_history_summary(tmp_path):
+    history = CheckHistory(str(tmp_path / "history.sqlite3"))
+    try:
+        for i in range(10):
+            history.record(i != 3, 0, "DSHOW", float(i * 10), None if i != 3 else "open_failed", ts=1000.0 + i)
+        history.record(False, 1, "MSMF", 5.0, "read_failed", ts=1005.0)
+        history.record(True, 0, "DSHOW", 1.0, ts=10.0)  # before the window
+
+        summary = history.summary(1000.0, camera_index=0)
+        assert summary["checks"] == 10
+        assert summary["uptime"] == 0.9
+        assert summary["latency_ms"]["max"] == 90.0
+        assert summary["latency_ms"]["p95"] == 90.0
+        assert summary["failures"] == {"open_failed": 1}
+        assert history.summary(1000.0)["failures"] == {"open_failed": 1, "read_failed": 1}
+        assert history.summary(2000.0)["uptime"] is None
+    finally:
+        history.close()
+
+
+def test_history_retention_by_age_and_count(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    now = time.time()
+    history = CheckHistory(str(path), keep_days=None)
+    for days in (200, 100, 10, 1):
+        history.record(True, 0, "DSHOW", 1.0, ts=now - days * 86400)
+    history.close()
+
+    history = CheckHistory(str(path), keep_days=30, max_rows=None, prune_every=3)  # prunes on open
+    try:
+        assert history.summary(0)["checks"] == 2
+        history.max_rows = 3
+        for _ in range(3):  # the third record triggers a prune
+            history.record(True, 0, "DSHOW", 1.0)
+        assert history.summary(0)["checks"] == 3
+        assert history.summary(now - 2 * 86400)["checks"] == 3  # the newest rows were kept
+        wal = tmp_path / "history.sqlite3-wal"
+        assert not wal.exists() or wal.stat().st_size == 0
+    finally:
+        history.close()
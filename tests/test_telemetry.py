@@ -0,0 +1,64 @@
+import argparse
+
+from ptz_camera_health_check.telemetry import ProcessTelemetry, add_telemetry_args, telemetry_from_args
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_samples_at_interval():
+    clock = FakeClock()
+    telemetry = ProcessTelemetry(interval=60.0, clock=clock)
+    assert telemetry.available
+    sample = telemetry.poll()
+    assert sample["rss_mb"] > 0 and sample["threads"] >= 1
+    assert telemetry.poll() is None  # not due yet
+    clock.now += 60
+    assert telemetry.poll()["uptime_s"] == 60
+    assert "rss=" in telemetry.summary()
+    assert telemetry.restart_reason is None  # no limits set
+
+
+def test_restart_after_consecutive_breaches_and_min_uptime():
+    clock = FakeClock()
+    telemetry = ProcessTelemetry(interval=10.0, max_rss_mb=1, breach_samples=3, min_uptime=45.0, clock=clock)
+    for _ in range(4):  # breached 4 times, but still inside min_uptime
+        telemetry.poll()
+        clock.now += 10
+    assert telemetry.restart_reason is None
+    telemetry.poll()  # uptime 40
+    assert telemetry.restart_reason is None
+    clock.now += 10
+    telemetry.poll()  # uptime 50
+    assert telemetry.restart_reason.startswith("rss_mb ")
+    assert telemetry.snapshot()["limits"] == {"rss_mb": 1}
+
+
+def test_breach_count_resets_below_limit():
+    clock = FakeClock()
+    telemetry = ProcessTelemetry(interval=10.0, max_threads=10_000, breach_samples=2, min_uptime=0.0, clock=clock)
+    telemetry.limits["threads"] = 0
+    telemetry.poll()
+    clock.now += 10
+    telemetry.limits["threads"] = 10_000  # one sample back under the limit
+    telemetry.poll()
+    clock.now += 10
+    telemetry.limits["threads"] = 0
+    telemetry.poll()
+    assert telemetry.restart_reason is None
+    clock.now += 10
+    telemetry.poll()
+    assert telemetry.restart_reason.startswith("threads ")
+
+
+def test_from_args():
+    parser = argparse.ArgumentParser()
+    add_telemetry_args(parser)
+    assert telemetry_from_args(parser.parse_args(["--telemetry-interval", "0"])) is None
+    telemetry = telemetry_from_args(parser.parse_args(["--max-handles", "500"]))
+    assert telemetry.interval == 60.0 and telemetry.limits["handles"] == 500